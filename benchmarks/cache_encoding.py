@@ -0,0 +1,132 @@
+"""Benchmark cache entry encodings: bytes per entry and load/store throughput.
+
+Compares the default JSON encoding with the compact codec (and its msgpack/zstd
+variants when those packages are installed) on every storage backend.
+
+Usage:
+    python benchmarks/cache_encoding.py [--entries 5000] [--results 10]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from multi_search_api import SearchResultCache
+from multi_search_api.cache import CompactCodec
+
+SOURCES = ("serper", "brave", "searxng", "duckduckgo")
+WORDS = (
+    "python asyncio cache search provider latency result ranking query index compact "
+    "storage memory throughput benchmark example snippet title link source network"
+).split()
+
+
+def make_results(rng: random.Random, count: int) -> list[dict]:
+    """Results shaped like provider output."""
+    source = rng.choice(SOURCES)
+    return [
+        {
+            "title": " ".join(rng.choices(WORDS, k=8)).capitalize(),
+            "snippet": " ".join(rng.choices(WORDS, k=30)).capitalize() + ".",
+            "link": f"https://example.com/{'/'.join(rng.choices(WORDS, k=3))}/{rng.random()}",
+            "source": source,
+        }
+        for _ in range(count)
+    ]
+
+
+def codecs() -> dict[str, object]:
+    """Encodings to compare; optional variants are skipped if not installed."""
+    variants = {"json": "json", "compact (json+zlib)": CompactCodec()}
+    for name, options in {
+        "compact (msgpack+zlib)": {"serializer": "msgpack"},
+        "compact (msgpack+zstd)": {"serializer": "msgpack", "compression": "zstd", "level": 3},
+    }.items():
+        try:
+            variants[name] = CompactCodec(**options)
+        except ImportError:
+            print(f"skipping {name}: optional package not installed")
+    return variants
+
+
+def run(suffix: str, codec_name: str, codec, queries: list[tuple[str, list[dict]]]) -> dict:
+    """Store all queries, then reopen the cache and read them back."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = str(Path(tmp) / f"cache{suffix}")
+
+        # A JSON file is rewritten on every write, so batch its writes into one flush
+        cache = SearchResultCache(
+            cache_file=cache_file,
+            codec=codec,
+            write_behind=suffix == ".json",
+            flush_interval=3600,
+            flush_threshold=len(queries) + 1,
+        )
+        start = time.perf_counter()
+        for query, results in queries:
+            cache.cache_results(query, "any", results)
+        cache.close()
+        store_seconds = time.perf_counter() - start
+        file_bytes = cache.storage.size_bytes()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        reopened = SearchResultCache(cache_file=cache_file, codec=codec)
+        load_seconds = time.perf_counter() - start
+        memory_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for query, _ in queries:
+            reopened.get_cached_results(query, "any")
+        read_seconds = time.perf_counter() - start
+        reopened.close()
+
+    count = len(queries)
+    return {
+        "backend": suffix,
+        "codec": codec_name,
+        "file B/entry": file_bytes / count,
+        "RAM B/entry": memory_bytes / count,
+        "store/s": count / store_seconds,
+        "load/s": count / load_seconds,
+        "hit/s": count / read_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000, help="number of cached queries")
+    parser.add_argument("--results", type=int, default=10, help="results per query")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    queries = [
+        (f"query {i} {' '.join(rng.choices(WORDS, k=3))}", make_results(rng, args.results))
+        for i in range(args.entries)
+    ]
+
+    variants = codecs()
+    rows = [
+        run(suffix, name, codec, queries)
+        for suffix in (".json", ".jsonl", ".db")
+        for name, codec in variants.items()
+    ]
+
+    columns = list(rows[0])
+    print(" | ".join(f"{column:>22}" for column in columns))
+    for row in rows:
+        print(
+            " | ".join(
+                f"{value:>22,.0f}" if isinstance(value, float) else f"{value:>22}"
+                for value in row.values()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,18 @@ A powerful search tool that automatically switches between multiple search provi
 (Serper, SearXNG, Brave, Google) with smart caching and rate limit handling.
 """
 
-from multi_search_api.cache import SearchResultCache
+from multi_search_api.batch import ProviderLimit
+from multi_search_api.cache import (
+    CacheStorage,
+    JSONFileStorage,
+    SearchResultCache,
+    SQLiteStorage,
+)
+from multi_search_api.circuit import CircuitBreakers
 from multi_search_api.core import SmartSearchTool, configure_logging
 from multi_search_api.exceptions import RateLimitError
+from multi_search_api.hedging import HedgingPolicy
+from multi_search_api.pacing import RateScheduler
 from multi_search_api.providers import (
     BraveProvider,
     GoogleScraperProvider,
@@ -16,6 +25,7 @@ from multi_search_api.providers import (
     SearXNGProvider,
     SerperProvider,
 )
+from multi_search_api.routing import AdaptiveRouter
 
 __version__ = "0.1.0"
 __author__ = "Joop Snijder"
@@ -23,7 +33,15 @@ __author__ = "Joop Snijder"
 __all__ = [
     "SmartSearchTool",
     "SearchResultCache",
+    "CacheStorage",
+    "JSONFileStorage",
+    "SQLiteStorage",
     "RateLimitError",
+    "HedgingPolicy",
+    "ProviderLimit",
+    "AdaptiveRouter",
+    "CircuitBreakers",
+    "RateScheduler",
     "SearchProvider",
     "SerperProvider",
     "SearXNGProvider",
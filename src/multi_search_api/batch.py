@@ -0,0 +1,168 @@
+"""Scheduling batches of searches across providers with per-provider limits."""
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from multi_search_api.providers import SearchProvider
+
+
+@dataclass(frozen=True)
+class ProviderLimit:
+    """How hard a batch may use one provider.
+
+    Attributes:
+        concurrency: Maximum number of requests in flight at once
+        rate: Maximum requests per second (default: no limit)
+    """
+
+    concurrency: int = 2
+    rate: float | None = None
+
+
+# Limits within the providers' free tiers; override per provider name with
+# SmartSearchTool.search_many(provider_limits=...)
+DEFAULT_PROVIDER_LIMITS = {
+    "SearXNGProvider": ProviderLimit(concurrency=4, rate=4.0),
+    "SerperProvider": ProviderLimit(concurrency=4, rate=5.0),
+    "BraveProvider": ProviderLimit(concurrency=1, rate=1.0),
+    "DuckDuckGoProvider": ProviderLimit(concurrency=1, rate=1 / 3),
+    "GoogleScraperProvider": ProviderLimit(concurrency=1, rate=0.2),
+}
+
+
+class ProviderBudget:
+    """Concurrency slots and request pacing for one provider. Thread-safe."""
+
+    def __init__(self, limit: ProviderLimit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._next_start = 0.0
+        self._previous_start = 0.0
+
+    def reserve(self) -> float:
+        """Take a slot for one request if the limits allow it now.
+
+        Returns:
+            0 if a slot was taken, otherwise seconds until the rate limit
+            allows the next request (infinite while all slots are in use)
+        """
+        with self._lock:
+            if self._in_flight >= self.limit.concurrency:
+                return math.inf
+            now = time.monotonic()
+            if now < self._next_start:
+                return self._next_start - now
+            self._in_flight += 1
+            self._previous_start = self._next_start
+            if self.limit.rate:
+                self._next_start = now + 1 / self.limit.rate
+            return 0.0
+
+    def release(self):
+        """Return the slot of a finished request."""
+        with self._lock:
+            self._in_flight -= 1
+
+    def cancel(self):
+        """Return the slot of the last reserve() without a request having been sent."""
+        with self._lock:
+            self._in_flight -= 1
+            self._next_start = self._previous_start
+
+
+@dataclass
+class BatchItem:
+    """One distinct query of a batch and the providers it can still try.
+
+    Attributes:
+        query: Query sent to the providers
+        inputs: Input queries it answers (spellings that normalize alike)
+        remaining: Providers not tried yet, in priority order
+        refresh: Only refresh stale cached results, nothing is yielded
+        tried: Number of providers tried
+        answered: Number of providers that answered without an error
+        error: Last provider error
+    """
+
+    query: str
+    inputs: list[str]
+    remaining: list[SearchProvider]
+    refresh: bool = False
+    tried: int = 0
+    answered: int = 0
+    error: Exception | None = None
+
+
+@dataclass
+class BatchSchedule:
+    """Outcome of one scheduling pass over the pending queries.
+
+    Attributes:
+        launches: (item, provider) pairs whose request can start now
+        exhausted: Items left without providers to try
+        retry_in: Seconds until a rate limit allows more launches, None if
+                  only a finishing request can free capacity
+    """
+
+    launches: list[tuple[BatchItem, SearchProvider]] = field(default_factory=list)
+    exhausted: list[BatchItem] = field(default_factory=list)
+    retry_in: float | None = None
+
+
+def schedule_batch(
+    pending: deque[BatchItem],
+    budgets: dict[str, ProviderBudget],
+    admit: Callable[[str], bool],
+) -> BatchSchedule:
+    """Assign pending queries to providers that have capacity now.
+
+    Each query goes to the first provider in its priority order that has a
+    free slot and whose rate limit allows a request, so once the preferred
+    providers are saturated the overflow spreads to the others and throughput
+    approaches the sum of the providers' rates. A provider that ``admit``
+    refuses when it has capacity (e.g. its circuit breaker is open) is dropped
+    for that query. Queries that cannot start stay at the front of
+    ``pending``, in order. The pass stops early once every provider is busy.
+
+    Args:
+        pending: Queries waiting for a provider; modified in place
+        budgets: Provider name -> its budget
+        admit: Called with a provider name right before a request is launched;
+               False skips the provider for the query
+
+    Returns:
+        The requests to start, the queries out of providers and when to retry
+    """
+    schedule = BatchSchedule()
+    waiting: list[BatchItem] = []
+    blocked: set[str] = set()
+    while pending and len(blocked) < len(budgets):
+        item = pending.popleft()
+        for provider in list(item.remaining):
+            provider_name = provider.__class__.__name__
+            if provider_name in blocked:
+                continue
+            wait = budgets[provider_name].reserve()
+            if wait == 0:
+                item.remaining.remove(provider)
+                if not admit(provider_name):
+                    budgets[provider_name].cancel()
+                    continue
+                item.tried += 1
+                schedule.launches.append((item, provider))
+                break
+            blocked.add(provider_name)
+            if wait != math.inf:
+                schedule.retry_in = min(schedule.retry_in or math.inf, wait)
+        else:
+            if item.remaining:
+                waiting.append(item)
+            else:
+                schedule.exhausted.append(item)
+    pending.extendleft(reversed(waiting))
+    return schedule
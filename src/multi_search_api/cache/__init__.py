@@ -0,0 +1,61 @@
+"""Search result caching with pluggable storage backends."""
+
+from multi_search_api.cache.backend import CacheBackend, CacheLookup
+from multi_search_api.cache.codec import CompactCodec, EntryCodec, JSONCodec
+from multi_search_api.cache.eviction import EvictionPolicy, LRUPolicy, TinyLFUPolicy
+from multi_search_api.cache.frozen import FrozenResult, FrozenResultList
+from multi_search_api.cache.normalize import (
+    DUTCH_STOPWORDS,
+    ENGLISH_STOPWORDS,
+    QueryNormalizer,
+    build_cache_key,
+)
+from multi_search_api.cache.policy import TTLPolicy, TTLRule
+from multi_search_api.cache.resp import RedisStorage, RESPClient, RESPError
+from multi_search_api.cache.resp_server import LocalRESPServer
+from multi_search_api.cache.search_cache import SearchResultCache
+from multi_search_api.cache.similarity import QuerySimilarityIndex
+from multi_search_api.cache.snapshot import read_snapshot, write_snapshot
+from multi_search_api.cache.storage import (
+    CacheStorage,
+    IndexedFileStorage,
+    JSONFileStorage,
+    SQLiteStorage,
+    WriteBehindStorage,
+    migrate_storage,
+    open_storage,
+)
+
+__all__ = [
+    "SearchResultCache",
+    "CacheBackend",
+    "CacheLookup",
+    "FrozenResult",
+    "FrozenResultList",
+    "CacheStorage",
+    "EntryCodec",
+    "JSONCodec",
+    "CompactCodec",
+    "IndexedFileStorage",
+    "JSONFileStorage",
+    "SQLiteStorage",
+    "WriteBehindStorage",
+    "RedisStorage",
+    "RESPClient",
+    "RESPError",
+    "LocalRESPServer",
+    "TTLPolicy",
+    "TTLRule",
+    "QueryNormalizer",
+    "QuerySimilarityIndex",
+    "build_cache_key",
+    "ENGLISH_STOPWORDS",
+    "DUTCH_STOPWORDS",
+    "EvictionPolicy",
+    "LRUPolicy",
+    "TinyLFUPolicy",
+    "migrate_storage",
+    "open_storage",
+    "read_snapshot",
+    "write_snapshot",
+]
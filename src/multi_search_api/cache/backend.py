@@ -0,0 +1,87 @@
+"""Protocol for search result caches used by SmartSearchTool."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class CacheLookup:
+    """Outcome of a cache hit.
+
+    Attributes:
+        results: Cached results (empty for a negative hit)
+        negative: True if the entry records that no provider returned results
+        stale: True if the results are past their TTL but still inside the
+            stale-while-revalidate window and should be refreshed
+        approximate: True if the results were cached for a similar, not the
+            same, query
+    """
+
+    results: list[dict[str, Any]]
+    negative: bool = False
+    stale: bool = False
+    approximate: bool = False
+
+
+class CacheBackend(ABC):
+    """Interface SmartSearchTool uses to read and write cached search results.
+
+    SearchResultCache is the standard implementation; pass any other
+    implementation as ``SmartSearchTool(cache=...)``.
+    """
+
+    @abstractmethod
+    def lookup(self, query: str, provider: str, **kwargs) -> CacheLookup | None:
+        """Look up a query, returning a CacheLookup on a hit or None on a miss."""
+
+    @abstractmethod
+    def cache_results(
+        self,
+        query: str,
+        provider: str,
+        results: list[dict[str, Any]],
+        origin: str | None = None,
+        fetch_seconds: float | None = None,
+        **kwargs,
+    ):
+        """Cache non-empty results for a query.
+
+        ``origin`` names the provider that returned the results and
+        ``fetch_seconds`` how long it took; both are for statistics only.
+        """
+
+    @abstractmethod
+    def cache_negative_result(self, query: str, provider: str, **kwargs):
+        """Remember that no provider returned results for a query."""
+
+    @abstractmethod
+    def clear_expired_entries(self):
+        """Remove expired entries."""
+
+    @abstractmethod
+    def get_cache_stats(self) -> dict:
+        """Cache statistics for SmartSearchTool.get_status()."""
+
+    def get_cached_results(
+        self, query: str, provider: str, **kwargs
+    ) -> list[dict[str, Any]] | None:
+        """Get cached results if available and not expired.
+
+        Returns:
+            Cached results, an empty list for a negative cache hit, or None on a miss
+        """
+        lookup = self.lookup(query, provider, **kwargs)
+        return lookup.results if lookup is not None else None
+
+    def lookup_many(self, queries: list[str], provider: str, **kwargs) -> list[CacheLookup | None]:
+        """Look up several queries with the same search arguments.
+
+        Returns:
+            One CacheLookup or None per query, in order
+        """
+        return [self.lookup(query, provider, **kwargs) for query in queries]
+
+    def close(self):  # noqa: B027 - optional hook, no-op by default
+        """Flush pending writes and release resources."""
+        pass
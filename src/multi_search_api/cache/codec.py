@@ -0,0 +1,224 @@
+"""Compact encodings for cached search results."""
+
+import json
+import sys
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any
+
+# Fields every provider returns, in the order they are packed into tuples
+RESULT_FIELDS = ("title", "snippet", "link", "source")
+
+# Entry fields stored positionally by CompactCodec; anything else goes into a trailing dict
+_ENTRY_FIELDS = ("created_at", "fresh_until", "expires_at", "query", "provider")
+# Derived from the results, so never stored
+_DERIVED_FIELDS = {"result_count"}
+
+# First byte of a CompactCodec payload; JSON payloads always start with "{"
+_COMPACT_MAGIC = b"C"
+_SERIALIZERS = {"json": b"j", "msgpack": b"m"}
+_COMPRESSIONS = {None: b"n", "zlib": b"z", "zstd": b"s"}
+
+
+def pack_result(result: dict[str, Any] | tuple | list) -> dict[str, Any] | tuple:
+    """Pack a result dict into a tuple ordered like RESULT_FIELDS.
+
+    The ``source`` string is interned, so all results from one provider share a
+    single string object. Results that do not have exactly the standard fields
+    are left as dicts. Packed results (tuples, or lists read back from JSON)
+    are returned as tuples.
+    """
+    if isinstance(result, tuple):
+        return result
+    if isinstance(result, list):
+        title, snippet, link, source = result
+    elif len(result) == len(RESULT_FIELDS) and all(field in result for field in RESULT_FIELDS):
+        title, snippet, link, source = (result[field] for field in RESULT_FIELDS)
+    else:
+        return result
+    return (title, snippet, link, sys.intern(source) if isinstance(source, str) else source)
+
+
+def unpack_result(result: dict[str, Any] | tuple | list) -> dict[str, Any]:
+    """Turn a packed result back into a dict. Dicts are returned unchanged."""
+    if isinstance(result, dict):
+        return result
+    return dict(zip(RESULT_FIELDS, result, strict=True))
+
+
+def pack_results(results) -> tuple:
+    """Pack a sequence of results, see pack_result()."""
+    return tuple(pack_result(result) for result in results)
+
+
+def unpack_results(results) -> list[dict[str, Any]]:
+    """Unpack a sequence of results, see unpack_result()."""
+    return [unpack_result(result) for result in results]
+
+
+class EntryCodec(ABC):
+    """Serialize cache entries to bytes for storage backends."""
+
+    # Name reported in cache statistics
+    name = "codec"
+    # Whether encoded payloads are binary rather than UTF-8 text
+    binary = True
+
+    @abstractmethod
+    def encode(self, entry: dict[str, Any]) -> bytes:
+        """Serialize an entry."""
+
+    def decode(self, data: bytes | str) -> dict[str, Any]:
+        """Deserialize a payload written by any codec."""
+        return decode_entry(data)
+
+
+class JSONCodec(EntryCodec):
+    """Plain JSON objects, readable and compatible with older versions."""
+
+    name = "json"
+    binary = False
+
+    def encode(self, entry: dict[str, Any]) -> bytes:
+        """Serialize an entry as a JSON object."""
+        return json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+
+class CompactCodec(EntryCodec):
+    """Positional arrays with block compression.
+
+    Entries become arrays instead of objects, results become
+    ``[title, snippet, link, source]`` rows and ``result_count`` is dropped, so
+    no field name is stored per entry. The array is serialized with JSON (or
+    msgpack) and compressed with zlib (or zstd). ``msgpack`` and ``zstd`` need
+    the ``msgpack`` and ``zstandard`` packages.
+
+    Payloads carry a 3-byte header naming the serializer and compression, so
+    any codec can decode records written with other settings.
+    """
+
+    name = "compact"
+
+    def __init__(self, compression: str | None = "zlib", serializer: str = "json", level: int = 6):
+        """Initialize the codec.
+
+        Args:
+            compression: "zlib", "zstd" or None (default: "zlib")
+            serializer: "json" or "msgpack" (default: "json")
+            level: Compression level (default: 6)
+
+        Raises:
+            ValueError: For unknown compression or serializer names
+            ImportError: If msgpack or zstd is requested but not installed
+        """
+        if compression not in _COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression!r}")
+        if serializer not in _SERIALIZERS:
+            raise ValueError(f"Unknown serializer: {serializer!r}")
+        # Fail early if the optional packages are missing
+        _serializer_module(serializer)
+        _compression_module(compression)
+        self.compression = compression
+        self.serializer = serializer
+        self.level = level
+        self._header = _COMPACT_MAGIC + _SERIALIZERS[serializer] + _COMPRESSIONS[compression]
+
+    def encode(self, entry: dict[str, Any]) -> bytes:
+        """Serialize an entry as a compressed positional array."""
+        extra = {
+            key: value
+            for key, value in entry.items()
+            if key not in _ENTRY_FIELDS and key not in _DERIVED_FIELDS and key != "results"
+        }
+        array = [entry.get(field) for field in _ENTRY_FIELDS]
+        array += [pack_results(entry["results"]), extra]
+
+        if self.serializer == "msgpack":
+            data = _serializer_module("msgpack").packb(array, use_bin_type=True)
+        else:
+            data = json.dumps(array, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        if self.compression == "zlib":
+            data = zlib.compress(data, self.level)
+        elif self.compression == "zstd":
+            data = _compression_module("zstd").ZstdCompressor(level=self.level).compress(data)
+        return self._header + data
+
+
+def decode_entry(data: bytes | str) -> dict[str, Any]:
+    """Decode a payload written by JSONCodec or CompactCodec.
+
+    Results of compact payloads are returned packed (see pack_result()).
+
+    Raises:
+        ValueError: If the payload is corrupt
+    """
+    if isinstance(data, str):
+        return json.loads(data)
+    data = bytes(data)
+    if not data.startswith(_COMPACT_MAGIC):
+        return json.loads(data)
+
+    serializer = _lookup(_SERIALIZERS, data[1:2])
+    compression = _lookup(_COMPRESSIONS, data[2:3])
+    body = data[3:]
+    try:
+        if compression == "zlib":
+            body = zlib.decompress(body)
+        elif compression == "zstd":
+            body = _compression_module("zstd").ZstdDecompressor().decompress(body)
+        if serializer == "msgpack":
+            array = _serializer_module("msgpack").unpackb(body, raw=False)
+        else:
+            array = json.loads(body)
+    except zlib.error as e:
+        raise ValueError(f"Corrupt compressed cache entry: {e}") from e
+
+    *fields, rows, extra = array
+    entry = {
+        field: value
+        for field, value in zip(_ENTRY_FIELDS, fields, strict=True)
+        if value is not None
+    }
+    entry["results"] = pack_results(rows)
+    entry["result_count"] = len(rows)
+    entry.update(extra)
+    return entry
+
+
+def create_codec(codec: str | EntryCodec) -> EntryCodec:
+    """Build an entry codec from a name ("json" or "compact") or return an instance as is."""
+    if isinstance(codec, EntryCodec):
+        return codec
+    if codec == "json":
+        return JSONCodec()
+    if codec == "compact":
+        return CompactCodec()
+    raise ValueError(f"Unknown cache codec: {codec!r}")
+
+
+def _lookup(table: dict, code: bytes):
+    for name, value in table.items():
+        if value == code:
+            return name
+    raise ValueError(f"Unknown cache entry format: {code!r}")
+
+
+def _serializer_module(serializer: str):
+    if serializer != "msgpack":
+        return json
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError("The msgpack serializer requires: pip install msgpack") from e
+    return msgpack
+
+
+def _compression_module(compression: str | None):
+    if compression != "zstd":
+        return zlib
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires: pip install zstandard") from e
+    return zstandard
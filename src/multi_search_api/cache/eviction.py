@@ -0,0 +1,125 @@
+"""Eviction policies for the bounded search result cache."""
+
+import hashlib
+from abc import ABC, abstractmethod
+from array import array
+
+
+class EvictionPolicy(ABC):
+    """Abstract base class for cache eviction policies.
+
+    SearchResultCache keeps entries in least-recently-used order and always
+    proposes the LRU entry as the victim. A policy observes accesses and decides
+    whether a newly inserted entry is worth keeping at the cost of that victim.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def record_access(self, key: str):
+        """Record a read or write of ``key``."""
+        pass
+
+    @abstractmethod
+    def admit(self, candidate: str, victim: str) -> bool:
+        """Decide whether ``candidate`` should replace ``victim``.
+
+        Returns:
+            True to evict the victim, False to drop the candidate instead
+        """
+        pass
+
+
+class LRUPolicy(EvictionPolicy):
+    """Plain least-recently-used eviction: new entries are always admitted."""
+
+    name = "lru"
+
+    def record_access(self, key: str):
+        """LRU order is tracked by the cache itself."""
+        return None
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        """Always evict the least recently used entry."""
+        return True
+
+
+class CountMinSketch:
+    """Approximate frequency counter with 4-bit counters and periodic aging.
+
+    Counters saturate at 15 and are halved every ``sample_size`` increments, so
+    frequencies reflect recent popularity rather than all-time counts.
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+
+    def __init__(self, width: int, sample_size: int | None = None):
+        # Round width up to a power of two so indexes can be masked
+        self.width = 1 << max(4, (width - 1).bit_length())
+        self.sample_size = sample_size or 10 * self.width
+        self.additions = 0
+        self._mask = self.width - 1
+        self._rows = [array("B", bytes(self.width)) for _ in range(self.DEPTH)]
+
+    def _indexes(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=4 * self.DEPTH).digest()
+        return [
+            int.from_bytes(digest[i * 4 : (i + 1) * 4], "little") & self._mask
+            for i in range(self.DEPTH)
+        ]
+
+    def increment(self, key: str):
+        """Count one occurrence of ``key``."""
+        for row, index in zip(self._rows, self._indexes(key), strict=True):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._age()
+
+    def estimate(self, key: str) -> int:
+        """Estimated recent frequency of ``key``."""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key), strict=True))
+
+    def _age(self):
+        """Halve all counters so old popularity fades out."""
+        for row in self._rows:
+            for i in range(self.width):
+                row[i] >>= 1
+        self.additions //= 2
+
+
+class TinyLFUPolicy(EvictionPolicy):
+    """TinyLFU admission on top of LRU eviction.
+
+    A new entry only displaces the LRU victim if it has been requested more
+    often recently, so a burst of one-off queries cannot flush out hot ones.
+    """
+
+    name = "tinylfu"
+
+    def __init__(self, capacity_hint: int = 10_000):
+        self.sketch = CountMinSketch(width=capacity_hint)
+
+    def record_access(self, key: str):
+        """Count the access in the frequency sketch."""
+        self.sketch.increment(key)
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        """Admit the candidate only if it is more popular than the victim."""
+        return self.sketch.estimate(candidate) > self.sketch.estimate(victim)
+
+
+def create_eviction_policy(
+    policy: str | EvictionPolicy, capacity_hint: int | None = None
+) -> EvictionPolicy:
+    """Create an eviction policy from its name ("lru" or "tinylfu")."""
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    if policy == "lru":
+        return LRUPolicy()
+    if policy == "tinylfu":
+        return TinyLFUPolicy(capacity_hint=capacity_hint or 10_000)
+    raise ValueError(f"Unknown eviction policy: {policy!r} (expected 'lru' or 'tinylfu')")
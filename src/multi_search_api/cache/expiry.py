@@ -0,0 +1,65 @@
+"""Expiry tracking for the search result cache."""
+
+import heapq
+
+
+class ExpiryIndex:
+    """Min-heap of entry expiry times with lazy deletion.
+
+    Finding and removing expired keys costs O(k log n) for k expired keys instead
+    of a scan over every entry. Removing or re-adding a key leaves a stale heap
+    item behind that is skipped when popped; the heap is rebuilt once stale items
+    outnumber live ones, which keeps the amortized cost per operation constant.
+
+    Any per-key time can be tracked this way; the cache also uses it for
+    creation times.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, str]] = []
+        self._expires_at: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    def add(self, key: str, expires_at: float):
+        """Track ``key`` as expiring at ``expires_at``, replacing any previous expiry."""
+        self._expires_at[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, key))
+        self._maybe_rebuild()
+
+    def discard(self, key: str):
+        """Stop tracking ``key``. Unknown keys are ignored."""
+        if self._expires_at.pop(key, None) is not None:
+            self._maybe_rebuild()
+
+    def next_expiry(self) -> float | None:
+        """Earliest expiry time of any tracked key."""
+        while self._heap and self._expires_at.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, now: float, limit: int | None = None) -> list[str]:
+        """Remove and return keys that expired before ``now``.
+
+        Args:
+            now: Current epoch time
+            limit: Maximum number of keys to return, for incremental sweeping
+
+        Returns:
+            Expired keys, earliest expiry first
+        """
+        expired = []
+        while self._heap and self._heap[0][0] < now:
+            if limit is not None and len(expired) >= limit:
+                break
+            expires_at, key = heapq.heappop(self._heap)
+            if self._expires_at.get(key) == expires_at:
+                del self._expires_at[key]
+                expired.append(key)
+        return expired
+
+    def _maybe_rebuild(self):
+        if len(self._heap) > 2 * len(self._expires_at) + 64:
+            self._heap = [(expires_at, key) for key, expires_at in self._expires_at.items()]
+            heapq.heapify(self._heap)
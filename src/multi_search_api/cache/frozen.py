@@ -0,0 +1,141 @@
+"""Read-only search results handed out by cache hits.
+
+Cached results are shared between entries, lookups and threads, so a caller
+mutating a result it got from the cache would corrupt it for everyone. Cache
+hits therefore return the cached objects themselves, frozen, instead of
+copies: FrozenResult is a dict and FrozenResultList a list, so comparisons,
+iteration and JSON serialization work as before, but every mutating method
+raises TypeError. Nested dicts and lists, such as the ``ranks`` of fused
+fan-out results, are frozen the same way. Call ``.copy()`` (or
+``copy.deepcopy()``) to get mutable plain dicts and lists.
+
+With the compact codec, results packed into tuples are turned back into
+(frozen) dicts on every hit, so only results kept as dicts are shared there.
+"""
+
+import copy
+from collections.abc import Iterable
+from typing import Any
+
+
+def _read_only(name: str):
+    """Replacement for a mutating method that raises TypeError."""
+
+    def method(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' is read-only; use .copy() to get a mutable copy")
+
+    method.__name__ = name
+    return method
+
+
+class FrozenResult(dict):
+    """Search result that cannot be modified. ``copy()`` returns a plain dict."""
+
+    __slots__ = ()
+
+    def copy(self) -> dict[str, Any]:
+        return thaw_result(self)
+
+    def __copy__(self) -> dict[str, Any]:
+        return thaw_result(self)
+
+    def __deepcopy__(self, memo: dict) -> dict[str, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return FrozenResult, (dict(self),)
+
+    def __repr__(self) -> str:
+        return f"FrozenResult({dict.__repr__(self)})"
+
+
+class FrozenResultList(list):
+    """List of results that cannot be modified.
+
+    Slicing returns another FrozenResultList; ``copy()`` returns a plain list
+    of plain result dicts.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, index):
+        item = list.__getitem__(self, index)
+        return FrozenResultList(item) if isinstance(index, slice) else item
+
+    def copy(self) -> list[dict[str, Any]]:
+        return [thaw_result(result) for result in self]
+
+    def __copy__(self) -> list[dict[str, Any]]:
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict) -> list[Any]:
+        return [copy.deepcopy(result, memo) for result in self]
+
+    def __reduce__(self):
+        return FrozenResultList, (list(self),)
+
+    def __repr__(self) -> str:
+        return f"FrozenResultList({list.__repr__(self)})"
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__ior__",
+    "clear",
+    "pop",
+    "popitem",
+    "setdefault",
+    "update",
+):
+    setattr(FrozenResult, _name, _read_only(_name))
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+    "sort",
+):
+    setattr(FrozenResultList, _name, _read_only(_name))
+
+
+def freeze_result(result: dict[str, Any]) -> FrozenResult:
+    """Frozen version of a result dict, nested dicts and lists included.
+
+    Frozen results are returned as is.
+    """
+    if isinstance(result, FrozenResult):
+        return result
+    return FrozenResult((key, _freeze_value(value)) for key, value in result.items())
+
+
+def _freeze_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return freeze_result(value)
+    if isinstance(value, list) and not isinstance(value, FrozenResultList):
+        return FrozenResultList(_freeze_value(item) for item in value)
+    return value
+
+
+def thaw_result(result: Any) -> Any:
+    """Mutable copy of a result dict or list, nested frozen containers included.
+
+    Anything else is returned as is.
+    """
+    if isinstance(result, dict):
+        return {key: thaw_result(value) for key, value in result.items()}
+    if isinstance(result, FrozenResultList):
+        return [thaw_result(item) for item in result]
+    return result
+
+
+def freeze_results(results: Iterable[dict[str, Any]]) -> FrozenResultList:
+    """Frozen list of frozen results."""
+    return FrozenResultList(freeze_result(result) for result in results)
@@ -0,0 +1,142 @@
+"""Query normalization and cache key schema."""
+
+import hashlib
+import json
+import unicodedata
+from collections.abc import Iterable
+from typing import Any
+
+# Version of the key layout; bump when the key schema or default normalization changes
+CACHE_KEY_VERSION = 3
+
+# Search kwargs that change which results providers return, with their defaults.
+# Every cache key covers all of them, so two searches share an entry only if they
+# would get the same results. num_results only changes how many results come back,
+# so it is left out: one entry serves every request for up to as many results as
+# it holds (see SearchResultCache.lookup).
+RESULT_AFFECTING_KWARGS: dict[str, Any] = {
+    "language": "nl",
+    "time_range": None,
+    "region": None,
+}
+
+# Number of results providers return when num_results is not given
+DEFAULT_NUM_RESULTS = 10
+
+# Punctuation that carries meaning in queries (c++, c#, at&t) and is kept when folding
+PRESERVED_PUNCTUATION = frozenset("#+&@%")
+
+ENGLISH_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or the to what when where which "
+    "who why with".split()
+)
+DUTCH_STOPWORDS = frozenset(
+    "de het een en van in is op te dat die voor met aan er niet om ook als bij of wat hoe "
+    "waar wie".split()
+)
+
+
+class QueryNormalizer:
+    """Configurable pipeline that maps equivalent queries to one canonical form.
+
+    Steps, in order: Unicode normalization (NFKC by default), case folding,
+    punctuation folding, stopword removal, token sorting and whitespace
+    collapsing. Token sorting and stopword removal change meaning for some
+    queries ("python to rust" vs "rust to python") and are off by default.
+    """
+
+    def __init__(
+        self,
+        unicode_form: str | None = "NFKC",
+        casefold: bool = True,
+        fold_punctuation: bool = True,
+        collapse_whitespace: bool = True,
+        sort_tokens: bool = False,
+        stopwords: Iterable[str] | None = None,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            unicode_form: Unicode normalization form, or None to skip (default: NFKC)
+            casefold: Case-fold the query (default: True)
+            fold_punctuation: Replace punctuation with spaces, keeping #+&@% (default: True)
+            collapse_whitespace: Collapse runs of whitespace and strip (default: True)
+            sort_tokens: Sort tokens so word order does not matter (default: False)
+            stopwords: Words to drop, e.g. ENGLISH_STOPWORDS (default: none)
+        """
+        self.unicode_form = unicode_form
+        self.casefold = casefold
+        self.fold_punctuation = fold_punctuation
+        self.collapse_whitespace = collapse_whitespace
+        self.sort_tokens = sort_tokens
+        self.stopwords = frozenset(stopwords or ())
+
+    def normalize(self, query: str) -> str:
+        """Return the canonical form of a query."""
+        if self.unicode_form:
+            query = unicodedata.normalize(self.unicode_form, query)
+        if self.casefold:
+            query = query.casefold()
+        if self.fold_punctuation:
+            query = "".join(
+                " "
+                if unicodedata.category(char).startswith("P") and char not in PRESERVED_PUNCTUATION
+                else char
+                for char in query
+            )
+
+        if not (self.stopwords or self.sort_tokens or self.collapse_whitespace):
+            return query.strip()
+
+        tokens = query.split()
+        if self.stopwords:
+            # Keep the query if it consists of stopwords only
+            tokens = [token for token in tokens if token not in self.stopwords] or tokens
+        if self.sort_tokens:
+            tokens.sort()
+        return " ".join(tokens)
+
+
+def _canonical_value(value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.strip().lower()
+    return str(value)
+
+
+def canonical_search_params(**kwargs) -> dict[str, str | None]:
+    """Result-affecting search kwargs with defaults filled in, in canonical form."""
+    return {
+        name: _canonical_value(kwargs.get(name, default))
+        for name, default in RESULT_AFFECTING_KWARGS.items()
+    }
+
+
+def build_cache_key(normalized_query: str, provider: str, **kwargs) -> str:
+    """Build a cache key from a normalized query, provider and search kwargs.
+
+    The key is a SHA-256 over a canonical JSON document that names every field
+    explicitly, so unrelated kwargs never fragment the cache and any change to
+    the key layout is visible in CACHE_KEY_VERSION.
+    """
+    document = {
+        "v": CACHE_KEY_VERSION,
+        "query": normalized_query,
+        "provider": provider,
+        **canonical_search_params(**kwargs),
+    }
+    key_string = json.dumps(document, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(key_string.encode("utf-8")).hexdigest()
+
+
+def search_scope(provider: str, **kwargs) -> str:
+    """Short hash of the provider and result-affecting search kwargs.
+
+    Two cached queries can only answer each other if they have the same scope;
+    the similarity index uses it to keep near-duplicate matching within one
+    language, time range and region.
+    """
+    document = {"provider": provider, **canonical_search_params(**kwargs)}
+    scope_string = json.dumps(document, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(scope_string.encode("utf-8"), digest_size=8).hexdigest()
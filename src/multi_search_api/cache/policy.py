@@ -0,0 +1,104 @@
+"""Time-to-live policies for cached search results."""
+
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+
+@dataclass(frozen=True)
+class TTLRule:
+    """TTL override for a class of queries.
+
+    A rule matches when every item in ``match`` equals the corresponding search
+    keyword argument and, if given, ``query_pattern`` matches the query
+    (case-insensitive regular expression search).
+
+    Attributes:
+        name: Query class name, reported in cache statistics
+        ttl: How long matching results stay fresh
+        match: Search kwargs that must match, e.g. ``{"time_range": "recent"}``
+        query_pattern: Optional regular expression the query must match
+        stale_while_revalidate: Stale window for matching results; None uses the
+            policy default
+    """
+
+    name: str
+    ttl: timedelta
+    match: dict[str, Any] = field(default_factory=dict)
+    query_pattern: str | None = None
+    stale_while_revalidate: timedelta | None = None
+
+    def matches(self, query: str, **kwargs) -> bool:
+        """Check whether this rule applies to a query."""
+        if any(kwargs.get(key) != value for key, value in self.match.items()):
+            return False
+        if self.query_pattern is not None:
+            return re.search(self.query_pattern, query, re.IGNORECASE) is not None
+        return True
+
+
+# Results for recent-content searches go out of date quickly
+DEFAULT_TTL_RULES = (
+    TTLRule(name="recent", ttl=timedelta(hours=1), match={"time_range": "recent"}),
+)
+
+
+class TTLPolicy:
+    """Decide how long cached results stay fresh, and how long they may be served stale.
+
+    Rules are checked in order and the first match wins; queries matching no
+    rule use ``default_ttl``. After the TTL passes, results may still be served
+    for the stale-while-revalidate window while they are refreshed in the
+    background.
+
+    Example:
+        TTLPolicy(
+            default_ttl=timedelta(days=1),
+            rules=[
+                TTLRule("recent", timedelta(hours=1), match={"time_range": "recent"}),
+                TTLRule("evergreen", timedelta(days=30), query_pattern=r"^(what is|define) "),
+            ],
+            stale_while_revalidate=timedelta(hours=6),
+        )
+    """
+
+    def __init__(
+        self,
+        default_ttl: timedelta = timedelta(days=1),
+        rules: Sequence[TTLRule] = DEFAULT_TTL_RULES,
+        stale_while_revalidate: timedelta = timedelta(0),
+    ):
+        """Initialize the policy.
+
+        Args:
+            default_ttl: TTL for queries that match no rule (default: 1 day)
+            rules: Ordered TTL rules (default: 1 hour for time_range="recent")
+            stale_while_revalidate: How long expired results may still be served
+                                    while a refresh runs (default: disabled)
+        """
+        self.default_ttl = default_ttl
+        self.rules = list(rules)
+        self.stale_while_revalidate = stale_while_revalidate
+
+    def rule_for(self, query: str, **kwargs) -> TTLRule | None:
+        """First rule matching the query, or None."""
+        return next((rule for rule in self.rules if rule.matches(query, **kwargs)), None)
+
+    def ttl_for(self, query: str, **kwargs) -> timedelta:
+        """How long results for this query stay fresh."""
+        rule = self.rule_for(query, **kwargs)
+        return rule.ttl if rule is not None else self.default_ttl
+
+    def stale_window_for(self, query: str, **kwargs) -> timedelta:
+        """How long results for this query may be served stale after their TTL."""
+        rule = self.rule_for(query, **kwargs)
+        if rule is not None and rule.stale_while_revalidate is not None:
+            return rule.stale_while_revalidate
+        return self.stale_while_revalidate
+
+    def query_class(self, query: str, **kwargs) -> str:
+        """Name of the query class, "default" if no rule matches."""
+        rule = self.rule_for(query, **kwargs)
+        return rule.name if rule is not None else "default"
@@ -0,0 +1,390 @@
+"""Shared cache storage over the Redis protocol (RESP)."""
+
+import logging
+import socket
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from multi_search_api.cache.codec import EntryCodec, JSONCodec, decode_entry
+from multi_search_api.cache.storage import CacheStorage
+
+logger = logging.getLogger(__name__)
+
+
+class RESPError(Exception):
+    """Error reply from a Redis protocol server."""
+
+
+class RESPClient:
+    """Minimal blocking client for the Redis serialization protocol.
+
+    Supports ``redis://[:password@]host[:port][/db]`` and
+    ``unix:///path/to/socket[?db=N]`` URLs, which covers Redis, Valkey,
+    KeyDB and the bundled LocalRESPServer. Thread-safe: commands from several
+    threads are serialized over one connection, which is reopened once if it
+    was dropped.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", timeout: float | None = 5.0):
+        """Initialize the client; the connection is opened on first use.
+
+        Args:
+            url: Server URL
+            timeout: Socket timeout in seconds, None to block indefinitely
+        """
+        self.url = url
+        self.timeout = timeout
+        parts = urlsplit(url)
+        if parts.scheme == "unix":
+            self._address: str | tuple[str, int] = parts.path
+            db = parse_qs(parts.query).get("db", ["0"])[0]
+        elif parts.scheme in ("redis", "tcp"):
+            self._address = (parts.hostname or "localhost", parts.port or 6379)
+            db = parts.path.lstrip("/") or "0"
+        else:
+            raise ValueError(f"Unsupported cache server URL: {url}")
+        self._db = int(db)
+        self._password = unquote(parts.password) if parts.password else None
+        self._lock = threading.Lock()
+        self._sock: socket.socket | None = None
+        self._reader = None
+
+    def execute(self, *args) -> Any:
+        """Send one command and return its reply.
+
+        Raises:
+            RESPError: If the server replied with an error
+            OSError: If the server cannot be reached
+        """
+        reply = self.pipeline([args])[0]
+        if isinstance(reply, RESPError):
+            raise reply
+        return reply
+
+    def pipeline(self, commands: Iterable[tuple]) -> list[Any]:
+        """Send several commands in one round trip.
+
+        Returns:
+            One reply per command; error replies are returned as RESPError instances
+        """
+        commands = list(commands)
+        if not commands:
+            return []
+        payload = b"".join(_encode_command(command) for command in commands)
+        with self._lock:
+            for attempt in (1, 2):
+                try:
+                    self._ensure_connected()
+                    self._sock.sendall(payload)
+                    return [self.read_reply() for _ in commands]
+                except OSError:
+                    self._disconnect()
+                    if attempt == 2:
+                        raise
+        return []
+
+    def read_reply(self) -> Any:
+        """Read one reply from the connection, e.g. a pub/sub message."""
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by cache server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            return RESPError(body.decode("utf-8"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) < length + 2:
+                raise ConnectionError("Connection closed by cache server")
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [self.read_reply() for _ in range(length)]
+        raise RESPError(f"Unexpected reply from cache server: {line!r}")
+
+    def close(self):
+        """Close the connection. A blocked read_reply() in another thread returns."""
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        with self._lock:
+            self._disconnect()
+
+    def _ensure_connected(self):
+        if self._sock is not None:
+            return
+        family = socket.AF_UNIX if isinstance(self._address, str) else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._address)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+        setup = []
+        if self._password:
+            setup.append(("AUTH", self._password))
+        if self._db:
+            setup.append(("SELECT", self._db))
+        if setup:
+            self._sock.sendall(b"".join(_encode_command(command) for command in setup))
+            for _ in setup:
+                reply = self.read_reply()
+                if isinstance(reply, RESPError):
+                    self._disconnect()
+                    raise reply
+
+    def _disconnect(self):
+        if self._reader is not None:
+            self._reader.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._reader = None
+
+
+def _encode_command(args: tuple) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif not isinstance(arg, bytes | bytearray):
+            arg = str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+class RedisStorage(CacheStorage):
+    """Store entries in a server speaking the Redis protocol, shared by many processes.
+
+    Each entry is a string key with a server-side expiry, so the server purges
+    expired entries itself. Every write or delete is announced on a pub/sub
+    channel; caches on other processes or hosts subscribe to it and drop their
+    in-memory copies of changed entries (see CacheStorage.subscribe()). The
+    message carries the version written, so a notice that arrives after the
+    subscriber already read that version (or a newer one) is ignored.
+
+    Use it as the shared second tier behind a bounded in-process
+    SearchResultCache::
+
+        cache = SearchResultCache(
+            storage=RedisStorage("redis://cache-host:6379/0"), preload=False, max_entries=1000
+        )
+
+    Connection problems are logged and treated as cache misses, so searches keep
+    working when the server is down.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        codec: EntryCodec | None = None,
+        namespace: str = "multi-search-api",
+        timeout: float = 5.0,
+    ):
+        """Initialize the storage.
+
+        Args:
+            url: Server URL, ``redis://host:port/db`` or ``unix:///path/to/socket``
+            codec: Entry encoding (default: JSON)
+            namespace: Prefix for keys and the invalidation channel, so several
+                       independent caches can share one server
+            timeout: Socket timeout in seconds
+        """
+        super().__init__(url)
+        self.url = url
+        self.codec = codec or JSONCodec()
+        self.key_prefix = f"{namespace}:entry:"
+        self.channel = f"{namespace}:invalidate"
+        # Identifies this process' own invalidation messages
+        self.client_id = uuid.uuid4().hex
+        self._client = RESPClient(url, timeout=timeout)
+        self._listeners: list[Callable[[list[str], float | None], None]] = []
+        self._subscriber: RESPClient | None = None
+        self._closed = threading.Event()
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Load all entries (scans the key space)."""
+        entries = {}
+        try:
+            keys = self._scan()
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                for key, payload in zip(chunk, self._client.execute("MGET", *chunk), strict=True):
+                    entry = self._decode(key, payload)
+                    if entry is not None:
+                        entries[key[len(self.key_prefix) :]] = entry
+        except (OSError, RESPError) as e:
+            logger.warning(f"Failed to load search cache from {self.url}: {e}")
+        return entries
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get a single entry."""
+        try:
+            payload = self._client.execute("GET", self.key_prefix + key)
+        except (OSError, RESPError) as e:
+            logger.warning(f"Failed to read search cache from {self.url}: {e}")
+            return None
+        return self._decode(key, payload)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Get several entries with one MGET per 500 keys."""
+        keys = list(keys)
+        entries = {}
+        try:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                payloads = self._client.execute("MGET", *(self.key_prefix + key for key in chunk))
+                for key, payload in zip(chunk, payloads, strict=True):
+                    entry = self._decode(key, payload)
+                    if entry is not None:
+                        entries[key] = entry
+        except (OSError, RESPError) as e:
+            logger.warning(f"Failed to read search cache from {self.url}: {e}")
+        return entries
+
+    def put_many(self, entries: Iterable[tuple[str, dict[str, Any]]]):
+        """Store entries with server-side expiry and announce them."""
+        now = time.time()
+        commands, keys = [], []
+        version = None
+        for key, entry in entries:
+            ttl_ms = int((entry.get("expires_at", 0) - now) * 1000)
+            if ttl_ms > 0:
+                payload = self.codec.encode(entry)
+                commands.append(("SET", self.key_prefix + key, payload, "PX", ttl_ms))
+                keys.append(key)
+                created_at = entry.get("created_at", now)
+                version = created_at if version is None else max(version, created_at)
+        self._send_with_invalidation(commands, keys, "save", version)
+
+    def delete(self, keys: Iterable[str]):
+        """Delete entries and announce them."""
+        keys = list(keys)
+        if keys:
+            commands = [("DEL", *(self.key_prefix + key for key in keys))]
+            self._send_with_invalidation(commands, keys, "delete", time.time())
+
+    def purge_expired(self, now: float) -> int:
+        """The server expires entries itself, so there is nothing to purge."""
+        return 0
+
+    def count(self) -> int:
+        """Number of entries in this namespace (scans the key space)."""
+        try:
+            return len(self._scan())
+        except (OSError, RESPError) as e:
+            logger.warning(f"Failed to count search cache entries on {self.url}: {e}")
+            return 0
+
+    def size_bytes(self) -> int:
+        """Not known for a server; always 0."""
+        return 0
+
+    def subscribe(self, callback: Callable[[list[str], float | None], None]):
+        """Call ``callback`` with keys that other clients wrote or deleted, and the version."""
+        self._listeners.append(callback)
+        if self._subscriber is None:
+            self._subscriber = RESPClient(self.url, timeout=None)
+            threading.Thread(
+                target=self._run_subscriber, name="search-cache-invalidation", daemon=True
+            ).start()
+
+    def close(self):
+        """Close the server connections."""
+        self._closed.set()
+        if self._subscriber is not None:
+            self._subscriber.close()
+        self._client.close()
+
+    def _send_with_invalidation(
+        self, commands: list[tuple], keys: list[str], action: str, version: float | None
+    ):
+        if not commands:
+            return
+        # "<client id> <version> <key> ...", the version being a write's created_at
+        message = " ".join([self.client_id, repr(version or time.time()), *keys])
+        try:
+            replies = self._client.pipeline([*commands, ("PUBLISH", self.channel, message)])
+        except OSError as e:
+            logger.error(f"Failed to {action} search cache on {self.url}: {e}")
+            return
+        errors = [reply for reply in replies if isinstance(reply, RESPError)]
+        if errors:
+            logger.error(f"Failed to {action} search cache on {self.url}: {errors[0]}")
+
+    def _scan(self) -> list[str]:
+        keys, cursor = [], "0"
+        while True:
+            cursor, batch = self._client.execute(
+                "SCAN", cursor, "MATCH", self.key_prefix + "*", "COUNT", 1000
+            )
+            keys.extend(key.decode("utf-8") for key in batch)
+            cursor = cursor.decode("utf-8") if isinstance(cursor, bytes) else str(cursor)
+            if cursor == "0":
+                return keys
+
+    def _decode(self, key: str, payload: bytes | None) -> dict[str, Any] | None:
+        if payload is None:
+            return None
+        try:
+            return decode_entry(payload)
+        except ValueError as e:
+            logger.warning(f"Skipping corrupt cache entry {key}: {e}")
+            return None
+
+    def _run_subscriber(self):
+        """Receive invalidation messages, reconnecting with backoff until closed."""
+        backoff = 0.5
+        while not self._closed.is_set():
+            try:
+                self._subscriber.execute("SUBSCRIBE", self.channel)
+                backoff = 0.5
+                while True:
+                    if self._closed.is_set():
+                        return
+                    message = self._subscriber.read_reply()
+                    if isinstance(message, list) and message[0] == b"message":
+                        self._notify(message[2].decode("utf-8").split())
+            except (OSError, RESPError, ValueError, AttributeError) as e:
+                # close() may clear the connection under a blocked read
+                if self._closed.is_set():
+                    return
+                if isinstance(e, AttributeError):
+                    raise
+                logger.warning(f"Lost cache invalidation channel on {self.url}: {e}")
+                self._subscriber.close()
+                self._closed.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _notify(self, message: list[str]):
+        if len(message) < 2 or message[0] == self.client_id:
+            return
+        try:
+            version = float(message[1])
+        except ValueError:
+            # Unknown version: drop the copies whatever their age
+            version = None
+        keys = message[2:]
+        for callback in self._listeners:
+            try:
+                callback(keys, version)
+            except Exception as e:
+                logger.warning(f"Cache invalidation callback failed: {e}")
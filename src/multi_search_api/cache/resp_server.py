@@ -0,0 +1,278 @@
+"""Local stand-in for a Redis server, for development and tests.
+
+Implements the subset of the Redis protocol RedisStorage uses (strings with
+expiry, key scans and pub/sub), in memory. Run it with::
+
+    python -m multi_search_api.cache.resp_server --port 6379
+
+or start it in-process with LocalRESPServer().start(). It is a stand-in for a
+real Redis deployment, not a replacement: data is not persisted.
+"""
+
+import argparse
+import fnmatch
+import logging
+import os
+import socketserver
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class _Store:
+    """Keys with optional expiry plus pub/sub subscriptions, shared by all connections."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.subscribers: dict[bytes, set[_RESPHandler]] = {}
+
+    def get(self, key: bytes) -> bytes | None:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return item[0]
+
+    def live_keys(self) -> list[bytes]:
+        return sorted(key for key in list(self.data) if self.get(key) is not None)
+
+
+class _RESPHandler(socketserver.StreamRequestHandler):
+    """One client connection."""
+
+    server: "_ThreadingServer"
+
+    def setup(self):
+        super().setup()
+        self.write_lock = threading.Lock()
+        self.channels: set[bytes] = set()
+
+    def handle(self):
+        store = self.server.store
+        try:
+            while True:
+                command = self._read_command()
+                if command is None:
+                    return
+                name = command[0].upper()
+                if name == b"QUIT":
+                    self._send("OK")
+                    return
+                try:
+                    reply = self._dispatch(store, name, command[1:])
+                except (ValueError, IndexError):
+                    reply = _Error(f"ERR wrong arguments for '{name.decode().lower()}' command")
+                if reply is not _NO_REPLY:
+                    self._send(reply)
+        except OSError:
+            pass
+        finally:
+            with store.lock:
+                for channel in self.channels:
+                    store.subscribers.get(channel, set()).discard(self)
+
+    def _dispatch(self, store: _Store, name: bytes, args: list[bytes]) -> Any:
+        with store.lock:
+            if name == b"PING":
+                return args[0] if args else "PONG"
+            if name == b"ECHO":
+                return args[0]
+            if name in (b"SELECT", b"AUTH", b"CLIENT"):
+                return "OK"
+            if name == b"GET":
+                return store.get(args[0])
+            if name == b"MGET":
+                return [store.get(key) for key in args]
+            if name == b"SET":
+                return self._set(store, args)
+            if name == b"DEL":
+                return sum(store.get(key) is not None and bool(store.data.pop(key)) for key in args)
+            if name == b"EXISTS":
+                return sum(store.get(key) is not None for key in args)
+            if name == b"DBSIZE":
+                return len(store.live_keys())
+            if name == b"FLUSHDB" or name == b"FLUSHALL":
+                store.data.clear()
+                return "OK"
+            if name == b"SCAN":
+                return self._scan(store, args)
+            if name == b"PUBLISH":
+                receivers = list(store.subscribers.get(args[0], ()))
+            elif name in (b"SUBSCRIBE", b"UNSUBSCRIBE"):
+                for channel in args:
+                    if name == b"SUBSCRIBE":
+                        store.subscribers.setdefault(channel, set()).add(self)
+                        self.channels.add(channel)
+                    else:
+                        store.subscribers.get(channel, set()).discard(self)
+                        self.channels.discard(channel)
+            else:
+                return _Error(f"ERR unknown command '{name.decode(errors='replace')}'")
+
+        # Pub/sub replies are written outside the store lock
+        if name == b"PUBLISH":
+            for receiver in receivers:
+                try:
+                    receiver._send([b"message", args[0], args[1]])
+                except (OSError, ValueError):
+                    # The receiver disconnected since it was looked up
+                    pass
+            return len(receivers)
+        for channel in args:
+            kind = b"subscribe" if name == b"SUBSCRIBE" else b"unsubscribe"
+            self._send([kind, channel, len(self.channels)])
+        return _NO_REPLY
+
+    @staticmethod
+    def _set(store: _Store, args: list[bytes]) -> Any:
+        key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+        expires_at = None
+        if b"EX" in options:
+            expires_at = time.monotonic() + float(args[2 + options.index(b"EX") + 1])
+        elif b"PX" in options:
+            expires_at = time.monotonic() + float(args[2 + options.index(b"PX") + 1]) / 1000
+        exists = store.get(key) is not None
+        if (b"NX" in options and exists) or (b"XX" in options and not exists):
+            return None
+        store.data[key] = (value, expires_at)
+        return "OK"
+
+    @staticmethod
+    def _scan(store: _Store, args: list[bytes]) -> list:
+        cursor = int(args[0])
+        options = {args[i].upper(): args[i + 1] for i in range(1, len(args) - 1, 2)}
+        pattern = options.get(b"MATCH", b"*").decode("utf-8")
+        count = int(options.get(b"COUNT", 10))
+        keys = store.live_keys()
+        batch = keys[cursor : cursor + count]
+        next_cursor = cursor + count if cursor + count < len(keys) else 0
+        matching = [key for key in batch if fnmatch.fnmatchcase(key.decode("utf-8"), pattern)]
+        return [str(next_cursor).encode(), matching]
+
+    def _read_command(self) -> list[bytes] | None:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command, as typed into telnet
+            return line.split() or None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _send(self, reply: Any):
+        with self.write_lock:
+            self.wfile.write(_encode_reply(reply))
+            self.wfile.flush()
+
+
+class _Error(str):
+    """Error reply."""
+
+
+_NO_REPLY = object()
+
+
+def _encode_reply(reply: Any) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, _Error):
+        return b"-%s\r\n" % reply.encode("utf-8")
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode("utf-8")
+    if isinstance(reply, bool | int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(_encode_reply(item) for item in reply)
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    store: _Store
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):  # Not available on Windows
+
+    class _ThreadingUnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        store: _Store
+
+
+class LocalRESPServer:
+    """In-memory server speaking enough of the Redis protocol for RedisStorage.
+
+    Example:
+        server = LocalRESPServer().start()
+        cache = SearchResultCache(storage=RedisStorage(server.url), preload=False)
+        ...
+        server.stop()
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, unix_socket: str | None = None):
+        """Initialize the server.
+
+        Args:
+            host: Interface to listen on (default: 127.0.0.1)
+            port: TCP port, 0 picks a free one (default: 0)
+            unix_socket: Listen on this Unix socket path instead of TCP
+        """
+        if unix_socket is not None:
+            if os.path.exists(unix_socket):
+                os.unlink(unix_socket)
+            self._server: socketserver.BaseServer = _ThreadingUnixServer(unix_socket, _RESPHandler)
+            self.url = f"unix://{unix_socket}"
+        else:
+            self._server = _ThreadingServer((host, port), _RESPHandler)
+            self.url = f"redis://{host}:{self._server.server_address[1]}/0"
+        self._server.store = _Store()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "LocalRESPServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="local-resp-server",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(f"Local cache server listening on {self.url}")
+        return self
+
+    def serve_forever(self):
+        """Serve in the current thread until interrupted."""
+        logger.info(f"Local cache server listening on {self.url}")
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for a Redis cache server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--unix-socket", help="listen on a Unix socket instead of TCP")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    server = LocalRESPServer(args.host, args.port, args.unix_socket)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Content-addressed storage of search results shared between cache entries."""
+
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from multi_search_api.cache.codec import unpack_result
+from multi_search_api.cache.frozen import FrozenResultList, freeze_result
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMETERS = frozenset(
+    {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "igshid"}
+)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """Canonical form of a result URL.
+
+    Lowercases the scheme and host, drops default ports, ``www.``, fragments,
+    tracking parameters (``utm_*``, ``gclid`` and the like) and trailing
+    slashes, and sorts the remaining query parameters. URLs that cannot be
+    parsed are returned stripped.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.hostname:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname.lower().removeprefix("www.")
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/")
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMETERS
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def result_key(result: dict[str, Any] | tuple) -> tuple[str, str]:
+    """Content address of a result: its canonical URL and a hash of all its fields."""
+    result = unpack_result(result)
+    content = json.dumps(result, sort_keys=True, ensure_ascii=False, default=str)
+    content_hash = hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+    return canonical_url(str(result.get("link", ""))), content_hash
+
+
+def estimate_result_size(result: dict[str, Any] | tuple) -> int:
+    """Approximate memory footprint of one result in bytes.
+
+    Packed results do not count their ``source``, which is an interned string
+    shared by all results from the same provider.
+    """
+    if isinstance(result, dict):
+        return 64 + sum(len(str(value)) for value in result.values())
+    return 24 + sum(len(str(value)) for value in result[:-1])
+
+
+class ResultStore:
+    """Reference-counted table of distinct results, keyed by canonical URL and content hash.
+
+    Cache entries keep references to the shared result objects in this table
+    instead of their own copies. A result is dropped once no entry refers to it.
+    Not thread-safe; SearchResultCache calls it with its lock held.
+    """
+
+    def __init__(self):
+        # content address -> [shared result, reference count, estimated size]
+        self._results: dict[tuple[str, str], list] = {}
+        # id() of a shared result -> its content address, for cheap release()
+        self._keys: dict[int, tuple[str, str]] = {}
+        # canonical URL -> number of distinct results with that URL
+        self._urls: dict[str, int] = {}
+        self.bytes = 0
+        self.references = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @property
+    def distinct_urls(self) -> int:
+        """Number of distinct canonical URLs among stored results."""
+        return len(self._urls)
+
+    def intern(self, results: Sequence) -> Sequence:
+        """Add references to results and return the shared copies.
+
+        Result dicts are stored frozen (see FrozenResult), so the shared copies
+        can be handed out by cache hits without copying. Returns a
+        FrozenResultList for list input and a tuple otherwise.
+        """
+        shared = []
+        for result in results:
+            key = result_key(result)
+            record = self._results.get(key)
+            if record is None:
+                if isinstance(result, dict):
+                    result = freeze_result(result)
+                record = [result, 0, estimate_result_size(result)]
+                self._results[key] = record
+                self._keys[id(result)] = key
+                self._urls[key[0]] = self._urls.get(key[0], 0) + 1
+                self.bytes += record[2]
+            record[1] += 1
+            self.references += 1
+            shared.append(record[0])
+        return FrozenResultList(shared) if isinstance(results, list) else tuple(shared)
+
+    def release(self, results: Sequence):
+        """Drop references to shared results returned by intern()."""
+        for result in results:
+            key = self._keys.get(id(result))
+            record = self._results.get(key) if key is not None else None
+            if record is None or record[0] is not result:
+                continue
+            record[1] -= 1
+            self.references -= 1
+            if record[1] == 0:
+                del self._results[key]
+                del self._keys[id(result)]
+                self.bytes -= record[2]
+                self._urls[key[0]] -= 1
+                if not self._urls[key[0]]:
+                    del self._urls[key[0]]
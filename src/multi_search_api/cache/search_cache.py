@@ -0,0 +1,883 @@
+"""Search result caching functionality."""
+
+import heapq
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from multi_search_api.cache.backend import CacheBackend, CacheLookup
+from multi_search_api.cache.codec import (
+    EntryCodec,
+    JSONCodec,
+    create_codec,
+    pack_results,
+    unpack_result,
+    unpack_results,
+)
+from multi_search_api.cache.eviction import EvictionPolicy, create_eviction_policy
+from multi_search_api.cache.expiry import ExpiryIndex
+from multi_search_api.cache.frozen import FrozenResultList, freeze_result
+from multi_search_api.cache.normalize import (
+    DEFAULT_NUM_RESULTS,
+    QueryNormalizer,
+    build_cache_key,
+    search_scope,
+)
+from multi_search_api.cache.policy import TTLPolicy
+from multi_search_api.cache.results import ResultStore
+from multi_search_api.cache.similarity import QuerySimilarityIndex
+from multi_search_api.cache.snapshot import read_snapshot, write_snapshot
+from multi_search_api.cache.storage import (
+    CacheStorage,
+    WriteBehindStorage,
+    open_storage,
+    upgrade_legacy_entry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _isoformat(timestamp: float | None) -> str | None:
+    """Format an epoch timestamp for display in statistics."""
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+
+def _estimate_entry_size(entry: dict[str, Any]) -> int:
+    """Approximate the memory footprint of a cache entry in bytes, excluding its results.
+
+    Results are shared between entries through the ResultStore, which accounts
+    for them separately. Counting characters plus a fixed per-object overhead is
+    far cheaper than serializing the entry and close enough for budgeting.
+    """
+    return 256 + len(entry.get("query", "")) + 8 * len(entry.get("results", ()))
+
+
+class SearchResultCache(CacheBackend):
+    """Cache search results for 1 day to reduce rate limits and improve performance.
+
+    Thread-safe implementation using threading.Lock for concurrent access.
+    Persistence is delegated to a CacheStorage backend: a JSON file by default,
+    SQLite when the cache file ends in ``.db``, ``.sqlite`` or ``.sqlite3``, or
+    an indexed append-only file for ``.jsonl``.
+
+    With ``preload=False`` nothing is read at startup; entries are loaded from
+    storage on first access. Combined with the indexed or SQLite backends this
+    keeps construction time flat as the cache grows.
+
+    The cache is unbounded unless ``max_entries`` or ``max_bytes`` is set. When
+    bounded, entries are evicted in least-recently-used order, optionally behind
+    a TinyLFU admission filter (``eviction_policy="tinylfu"``).
+
+    With ``write_behind=True`` writes are buffered and persisted by a background
+    thread instead of on the request path; call flush() or close() to force them
+    out (pending writes are also flushed at interpreter exit).
+
+    Expiry is tracked in a min-heap and swept incrementally on writes, and entry
+    count, byte size and oldest/newest entry are maintained as entries come and
+    go, so get_cache_stats() does not scan the cache.
+
+    Lookups for which no provider returned anything can be cached as negative
+    entries with their own, shorter ``negative_ttl``, so repeating such a query
+    does not walk the whole provider chain again.
+
+    How long results stay fresh is decided by a TTLPolicy, which can assign
+    different TTLs per class of query and allow expired results to be served
+    stale (flagged as such) for a while so callers can refresh them in the
+    background.
+
+    Cache keys are built from the query after a QueryNormalizer has collapsed
+    trivial differences (case, whitespace, Unicode forms, punctuation) plus
+    every result-affecting search parameter, so equivalent searches share one
+    entry. ``num_results`` is not part of the key: an entry holding 20 results
+    also answers a request for 10, sliced on read.
+
+    With ``codec="compact"`` entries are stored as compressed positional arrays
+    and results are kept in memory as tuples with interned ``source`` strings,
+    which cuts both file size and memory use for large caches. Hits still
+    return result dicts.
+
+    With a shared storage backend such as RedisStorage this cache is the
+    in-process first tier (L1) of a two-tier cache: misses are read through
+    from the shared second tier (L2), writes go through to it, and entries
+    other processes change are invalidated locally. Statistics report hits
+    per tier.
+
+    Results are content-addressed: entries that contain the same result (same
+    canonical URL and content) share one reference-counted copy, and the
+    statistics report how many distinct results and URLs are cached.
+
+    Statistics also break hits down by the provider that originally returned
+    the results and by TTL query class, and estimate how much upstream latency
+    cache hits saved, based on how long the provider took to return each entry.
+
+    With ``similarity`` set, a query that misses the exact key can still be
+    answered by a cached near-duplicate (same provider and search parameters,
+    similar words), found through a MinHash index over resident entries. Such
+    hits are flagged ``approximate``.
+    """
+
+    # Maximum number of expired entries removed per write or stats call
+    SWEEP_BATCH_SIZE = 64
+
+    def __init__(
+        self,
+        cache_file: str | None = None,
+        storage: CacheStorage | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        eviction_policy: str | EvictionPolicy = "lru",
+        preload: bool = True,
+        write_behind: bool = False,
+        flush_interval: float = 5.0,
+        flush_threshold: int = 100,
+        negative_ttl: timedelta | None = timedelta(minutes=10),
+        ttl_policy: TTLPolicy | None = None,
+        normalizer: QueryNormalizer | None = None,
+        codec: str | EntryCodec = "json",
+        snapshot: str | Path | None = None,
+        similarity: float | QuerySimilarityIndex | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_file: Cache file path (default: ~/.cache/multi-search-api/search_results.json)
+            storage: Storage backend to use instead of one derived from cache_file
+            max_entries: Maximum number of cached queries (default: unbounded)
+            max_bytes: Approximate memory budget for cached results in bytes
+                       (default: unbounded)
+            eviction_policy: "lru", "tinylfu" or an EvictionPolicy instance
+            preload: Load all entries into memory at startup (default: True).
+                     When False, entries are read from storage on demand and
+                     memory limits only bound the resident entries.
+            write_behind: Persist writes from a background thread (default: False)
+            flush_interval: Seconds between background flushes in write-behind mode
+            flush_threshold: Number of dirty entries that triggers an early flush
+            negative_ttl: How long to remember that a query returned no results
+                          (default: 10 minutes, None disables negative caching)
+            ttl_policy: TTL rules and stale-while-revalidate window
+                        (default: 1 day, 1 hour for time_range="recent")
+            normalizer: Query normalization used for cache keys
+                        (default: QueryNormalizer())
+            codec: Entry encoding, "json", "compact" or an EntryCodec instance
+                   (default: "json")
+            snapshot: Snapshot file to warm the cache from at startup, if it
+                      exists (see export_snapshot())
+            similarity: Serve near-duplicate queries from the cache: a minimum
+                        similarity between 0 and 1, or a QuerySimilarityIndex
+                        (default: exact matches only)
+        """
+        if storage is not None:
+            self.cache_file = storage.path
+        else:
+            if cache_file:
+                self.cache_file = Path(cache_file)
+            else:
+                # Default to user cache directory
+                self.cache_file = (
+                    Path.home() / ".cache" / "multi-search-api" / "search_results.json"
+                )
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.codec = create_codec(codec)
+        # Non-JSON codecs also keep results packed in memory
+        self.pack_results = not isinstance(self.codec, JSONCodec)
+        self.storage = storage or open_storage(self.cache_file, codec=self.codec)
+        if write_behind:
+            self.storage = WriteBehindStorage(
+                self.storage, flush_interval=flush_interval, flush_threshold=flush_threshold
+            )
+        self.ttl_policy = ttl_policy or TTLPolicy()
+        self.normalizer = normalizer or QueryNormalizer()
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.preload = preload
+        self.eviction_policy = create_eviction_policy(eviction_policy, capacity_hint=max_entries)
+        self._lock = threading.Lock()
+        self._entry_sizes: dict[str, int] = {}
+        self._total_bytes = 0
+        self.result_store = ResultStore()
+        self._expiry = ExpiryIndex()
+        # Creation times, whatever order entries arrive in (lazy loads and snapshot
+        # imports can be older than resident entries); the second heap holds them
+        # negated, so the minimum of each is the oldest and the newest entry
+        self._created = ExpiryIndex()
+        self._created_desc = ExpiryIndex()
+        self._evictions = 0
+        self._rejected_admissions = 0
+        self._negative_entries = 0
+        self._negative_hits = 0
+        self._hits = 0
+        self._misses = 0
+        self._normalized_hits = 0
+        self._sliced_hits = 0
+        self._l1_hits = 0
+        self._l2_hits = 0
+        self._l2_lookups = 0
+        self._invalidations = 0
+        # Hits per resident entry, used to pick the hottest entries for snapshots
+        self._access_counts: dict[str, int] = {}
+        if isinstance(similarity, int | float):
+            similarity = QuerySimilarityIndex(threshold=similarity)
+        self.similarity_index = similarity
+        self._approximate_hits = 0
+        self._expired_hits = 0
+        self._stale_hits = 0
+        self._latency_saved = 0.0
+        # Per provider of origin: resident entries, hits, latency saved, fetch time, fetches
+        self._origins: dict[str, list] = {}
+        # Per TTL query class: hits, misses
+        self._query_classes: dict[str, list[int]] = {}
+        self.cache_data: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        # Drop entries other processes change in shared storage, so they are read again
+        self.storage.subscribe(self._invalidate)
+
+        if preload:
+            with self._lock:
+                entries = [
+                    (key, upgrade_legacy_entry(entry)) for key, entry in self.load_cache().items()
+                ]
+                entries.sort(key=lambda item: item[1]["created_at"])
+                for key, entry in entries:
+                    self._store_in_memory(key, entry)
+                self._enforce_capacity()
+
+        if snapshot is not None and Path(snapshot).exists():
+            imported = self.import_snapshot(snapshot)
+            logger.info(f"Warmed search cache with {imported} entries from {snapshot}")
+
+    @property
+    def cache_duration(self) -> timedelta:
+        """Default time to live for cached results."""
+        return self.ttl_policy.default_ttl
+
+    @cache_duration.setter
+    def cache_duration(self, value: timedelta):
+        self.ttl_policy.default_ttl = value
+
+    def load_cache(self) -> dict:
+        """Load cached search results."""
+        return self.storage.load()
+
+    def save_cache(self):
+        """Persist all in-memory cache data to the storage backend."""
+        self.storage.put_many(list(self.cache_data.items()))
+
+    def _generate_cache_key(self, query: str, provider: str, **kwargs) -> str:
+        """Generate a unique cache key for a search query.
+
+        The query is normalized first; see build_cache_key() for the key schema.
+        """
+        return build_cache_key(self.normalizer.normalize(query), provider, **kwargs)
+
+    def lookup(self, query: str, provider: str, **kwargs) -> CacheLookup | None:
+        """Look up a query and describe the kind of cache hit.
+
+        Thread-safe method using lock to prevent concurrent modifications.
+        Entries missing from memory are read through from storage when it is
+        shared (so results cached by other processes are picked up) or when the
+        cache was created with ``preload=False``.
+
+        An entry answers a request for ``num_results`` results if it holds at
+        least that many, or if it was fetched for at least that many (so the
+        providers had no more to give); results are sliced to ``num_results``.
+
+        Returns:
+            CacheLookup on a hit (positive, negative or stale), None on a miss
+        """
+        return self._lookup(query, provider, None, **kwargs)
+
+    def lookup_many(self, queries: list[str], provider: str, **kwargs) -> list[CacheLookup | None]:
+        """Look up several queries with the same search arguments.
+
+        Entries that have to be read from storage are fetched with a single
+        CacheStorage.get_many() call (one MGET for RedisStorage) instead of
+        one read per query.
+
+        Returns:
+            One CacheLookup or None per query, in order
+        """
+        prefetched = None
+        if self.storage.shared or not self.preload:
+            keys = [self._generate_cache_key(query, provider, **kwargs) for query in queries]
+            with self._lock:
+                missing = list(dict.fromkeys(key for key in keys if key not in self.cache_data))
+            # Keys read from storage, None for those it did not have
+            prefetched = dict.fromkeys(missing)
+            if missing:
+                prefetched.update(self.storage.get_many(missing))
+        return [self._lookup(query, provider, prefetched, **kwargs) for query in queries]
+
+    def _lookup(
+        self,
+        query: str,
+        provider: str,
+        prefetched: dict[str, dict[str, Any] | None] | None,
+        **kwargs,
+    ) -> CacheLookup | None:
+        """lookup(), with entries already read from storage by lookup_many()."""
+        num_results = kwargs.get("num_results", DEFAULT_NUM_RESULTS)
+        normalized_query = self.normalizer.normalize(query)
+        cache_key = build_cache_key(normalized_query, provider, **kwargs)
+        query_class = self.ttl_policy.query_class(query, **kwargs)
+
+        with self._lock:
+            class_counts = self._query_classes.get(query_class)
+            if class_counts is None:
+                class_counts = self._query_classes[query_class] = [0, 0]
+            self.eviction_policy.record_access(cache_key)
+            cached_entry = self.cache_data.get(cache_key)
+            from_storage = cached_entry is None and (self.storage.shared or not self.preload)
+            if from_storage:
+                self._l2_lookups += 1
+                if prefetched is not None and cache_key in prefetched:
+                    cached_entry = prefetched.pop(cache_key)
+                else:
+                    cached_entry = self.storage.get(cache_key)
+                if cached_entry is not None:
+                    self._store_in_memory(cache_key, cached_entry)
+                    self._enforce_capacity(cache_key)
+
+            approximate = False
+            if cached_entry is None and self.similarity_index is not None:
+                match = self._find_similar(normalized_query, provider, **kwargs)
+                if match is not None:
+                    cache_key, cached_entry = match
+                    approximate = True
+                    from_storage = False
+
+            if cached_entry is None:
+                self._misses += 1
+                class_counts[1] += 1
+                return None
+
+            # Check if cache is still valid (including any stale window)
+            now = time.time()
+            if now > cached_entry["expires_at"]:
+                # Remove expired entry
+                self._remove_from_memory(cache_key)
+                self.storage.delete([cache_key])
+                self._misses += 1
+                self._expired_hits += 1
+                class_counts[1] += 1
+                return None
+            stale = now > cached_entry.get("fresh_until", cached_entry["expires_at"])
+
+            results = cached_entry["results"]
+            # Entries from older versions do not record the count they were fetched for
+            requested = cached_entry.get("requested_results", DEFAULT_NUM_RESULTS)
+            if not cached_entry.get("negative") and num_results > max(len(results), requested):
+                # Entry holds fewer results than asked for and more may exist
+                self._misses += 1
+                class_counts[1] += 1
+                return None
+
+            if cache_key in self.cache_data:
+                self.cache_data.move_to_end(cache_key)
+
+            self._hits += 1
+            class_counts[0] += 1
+            if approximate:
+                self._approximate_hits += 1
+            self._access_counts[cache_key] = self._access_counts.get(cache_key, 0) + 1
+            if stale:
+                self._stale_hits += 1
+            if from_storage:
+                self._l2_hits += 1
+            else:
+                self._l1_hits += 1
+            # Count hits that the previous lowercase-and-strip keys would have missed
+            if approximate:
+                logger.info(
+                    f"Approximate cache hit for query '{query}': "
+                    f"serving results for '{cached_entry.get('query')}'"
+                )
+            elif cached_entry.get("query", query).lower().strip() != query.lower().strip():
+                self._normalized_hits += 1
+
+            if cached_entry.get("negative"):
+                self._negative_hits += 1
+                logger.info(f"Negative cache hit for query '{query}' with provider '{provider}'")
+                return CacheLookup(results=[], negative=True)
+
+            self._record_origin_hit(cached_entry)
+            if len(results) > num_results:
+                self._sliced_hits += 1
+                results = results[:num_results]
+            if self.pack_results:
+                # Packed rows are decoded per hit; rows kept as dicts are shared
+                results = FrozenResultList(
+                    freeze_result(unpack_result(result)) for result in results
+                )
+            logger.info(
+                f"Cache hit for query '{query}' with provider '{provider}' - {len(results)} results"
+            )
+            return CacheLookup(results=results, stale=stale, approximate=approximate)
+
+    def _find_similar(
+        self, normalized_query: str, provider: str, **kwargs
+    ) -> tuple[str, dict[str, Any]] | None:
+        """Most similar resident entry that can answer a query, as (key, entry).
+
+        Only unexpired positive entries holding enough results qualify. Must be
+        called with the lock held.
+        """
+        num_results = kwargs.get("num_results", DEFAULT_NUM_RESULTS)
+        now = time.time()
+        scope = search_scope(provider, **kwargs)
+        for _, key in self.similarity_index.matches(normalized_query, scope):
+            entry = self.cache_data.get(key)
+            if entry is None or entry.get("negative") or now > entry["expires_at"]:
+                continue
+            requested = entry.get("requested_results", DEFAULT_NUM_RESULTS)
+            if num_results <= max(len(entry["results"]), requested):
+                return key, entry
+        return None
+
+    def cache_results(
+        self,
+        query: str,
+        provider: str,
+        results: list[dict[str, Any]],
+        origin: str | None = None,
+        fetch_seconds: float | None = None,
+        **kwargs,
+    ):
+        """Cache search results.
+
+        Thread-safe method using lock to prevent concurrent modifications.
+
+        Args:
+            query: Search query
+            provider: Provider the entry is cached under
+            results: Results to cache
+            origin: Provider that returned the results, for statistics
+            fetch_seconds: How long the provider took to return them, used to
+                           estimate the latency later hits save
+            **kwargs: Search arguments
+        """
+        self._cache_entry(
+            query,
+            provider,
+            results,
+            self.ttl_policy.ttl_for(query, **kwargs),
+            stale_window=self.ttl_policy.stale_window_for(query, **kwargs),
+            origin=origin,
+            fetch_seconds=fetch_seconds,
+            **kwargs,
+        )
+
+    def cache_negative_result(self, query: str, provider: str, **kwargs):
+        """Remember that a query returned no results from any provider.
+
+        The entry expires after ``negative_ttl``. Does nothing if negative
+        caching is disabled.
+        """
+        if self.negative_ttl is None:
+            return
+        self._cache_entry(query, provider, [], self.negative_ttl, negative=True, **kwargs)
+
+    def _cache_entry(
+        self,
+        query: str,
+        provider: str,
+        results: list[dict[str, Any]],
+        ttl: timedelta,
+        stale_window: timedelta = timedelta(0),
+        negative: bool = False,
+        origin: str | None = None,
+        fetch_seconds: float | None = None,
+        **kwargs,
+    ):
+        """Store a positive or negative entry with the given time to live.
+
+        The entry is fresh for ``ttl`` and then stale for ``stale_window``;
+        ``expires_at`` marks the end of the stale window.
+        """
+        cache_key = self._generate_cache_key(query, provider, **kwargs)
+
+        with self._lock:
+            now = time.time()
+            fresh_until = now + ttl.total_seconds()
+            entry = {
+                "created_at": now,
+                "fresh_until": fresh_until,
+                "expires_at": fresh_until + stale_window.total_seconds(),
+                "query": query,
+                "provider": provider,
+                "results": results,
+                "result_count": len(results),
+                "requested_results": kwargs.get("num_results", DEFAULT_NUM_RESULTS),
+                "scope": search_scope(provider, **kwargs),
+            }
+            if negative:
+                entry["negative"] = True
+            if origin is not None:
+                entry["origin"] = origin
+                if fetch_seconds is not None:
+                    entry["fetch_seconds"] = fetch_seconds
+                    origin_stats = self._origin_stats(origin)
+                    origin_stats[3] += fetch_seconds
+                    origin_stats[4] += 1
+            self.eviction_policy.record_access(cache_key)
+            is_new = cache_key not in self.cache_data
+            self._store_in_memory(cache_key, entry)
+            # Refreshing an entry that is already cached bypasses admission
+            self._enforce_capacity(cache_key if is_new else None)
+
+            # The entry may have been refused admission by the eviction policy
+            if cache_key in self.cache_data:
+                self.storage.put(cache_key, entry)
+                logger.info(
+                    f"Cached {len(results)} results for query '{query}' with provider '{provider}'"
+                )
+
+            expired_keys = self._sweep_expired(now, self.SWEEP_BATCH_SIZE)
+            if expired_keys:
+                self.storage.delete(expired_keys)
+
+    def _store_in_memory(self, key: str, entry: dict[str, Any]):
+        """Insert or replace an entry in memory as most recently used.
+
+        Must be called with the lock held.
+        """
+        # Replacing an entry keeps its access count
+        hits = self._access_counts.get(key)
+        self._remove_from_memory(key)
+        if hits is not None:
+            self._access_counts[key] = hits
+        upgrade_legacy_entry(entry)
+        if self.pack_results:
+            entry["results"] = pack_results(entry["results"])
+        elif any(not isinstance(result, dict) for result in entry["results"]):
+            entry["results"] = unpack_results(entry["results"])
+        entry["results"] = self.result_store.intern(entry["results"])
+        size = _estimate_entry_size(entry)
+        self.cache_data[key] = entry
+        self._entry_sizes[key] = size
+        self._total_bytes += size
+        self._expiry.add(key, entry["expires_at"])
+        self._created.add(key, entry["created_at"])
+        self._created_desc.add(key, -entry["created_at"])
+        if entry.get("negative"):
+            self._negative_entries += 1
+        self._origin_stats(entry.get("origin", "unknown"))[0] += 1
+        # Entries from older versions have no scope and cannot be matched approximately
+        if self.similarity_index is not None and not entry.get("negative") and "scope" in entry:
+            self.similarity_index.add(
+                key, self.normalizer.normalize(entry.get("query", "")), entry["scope"]
+            )
+
+    def _remove_from_memory(self, key: str) -> dict[str, Any] | None:
+        """Remove an entry from memory and its size accounting.
+
+        Must be called with the lock held.
+        """
+        entry = self.cache_data.pop(key, None)
+        self._total_bytes -= self._entry_sizes.pop(key, 0)
+        if entry is not None:
+            self.result_store.release(entry["results"])
+            if entry.get("negative"):
+                self._negative_entries -= 1
+            self._origins[entry.get("origin", "unknown")][0] -= 1
+        self._expiry.discard(key)
+        self._created.discard(key)
+        self._created_desc.discard(key)
+        self._access_counts.pop(key, None)
+        if self.similarity_index is not None:
+            self.similarity_index.remove(key)
+        return entry
+
+    def _origin_stats(self, origin: str) -> list:
+        """Counters for a provider of origin, see __init__. Must be called with the lock held."""
+        stats = self._origins.get(origin)
+        if stats is None:
+            stats = self._origins[origin] = [0, 0, 0.0, 0.0, 0]
+        return stats
+
+    def _record_origin_hit(self, entry: dict[str, Any]):
+        """Count a positive hit for the entry's provider of origin and the latency it saved.
+
+        Entries cached without a fetch time are credited with the average fetch
+        time of their provider. Must be called with the lock held.
+        """
+        origin_stats = self._origin_stats(entry.get("origin", "unknown"))
+        saved = entry.get("fetch_seconds")
+        if saved is None:
+            saved = origin_stats[3] / origin_stats[4] if origin_stats[4] else 0.0
+        origin_stats[1] += 1
+        origin_stats[2] += saved
+        self._latency_saved += saved
+
+    def _sweep_expired(self, now: float, limit: int | None = None) -> list[str]:
+        """Remove up to ``limit`` expired entries from memory, earliest first.
+
+        Must be called with the lock held.
+
+        Returns:
+            Keys that were removed
+        """
+        expired_keys = self._expiry.pop_expired(now, limit)
+        for key in expired_keys:
+            self._remove_from_memory(key)
+        return expired_keys
+
+    def _is_over_capacity(self) -> bool:
+        return (self.max_entries is not None and len(self.cache_data) > self.max_entries) or (
+            self.max_bytes is not None and self._estimated_bytes() > self.max_bytes
+        )
+
+    def _estimated_bytes(self) -> int:
+        return self._total_bytes + self.result_store.bytes
+
+    def _enforce_capacity(self, candidate: str | None = None):
+        """Evict entries until the cache fits its entry and byte limits.
+
+        The least recently used entry is the eviction victim. If ``candidate`` is
+        the entry that was just inserted, the eviction policy may refuse it
+        admission instead, in which case the candidate itself is dropped.
+        Must be called with the lock held.
+        """
+        evicted = []
+        while self._is_over_capacity() and self.cache_data:
+            victim = next(iter(self.cache_data))
+            if victim == candidate:
+                # Candidate alone exceeds the budget
+                evicted.append(victim)
+                self._remove_from_memory(victim)
+                break
+
+            if candidate is not None and not self.eviction_policy.admit(candidate, victim):
+                self._rejected_admissions += 1
+                self._remove_from_memory(candidate)
+                break
+
+            self._remove_from_memory(victim)
+            evicted.append(victim)
+
+        self._evictions += len(evicted)
+        # Shared storage is used by other processes and lazily loaded entries can be
+        # read again later, so in those cases only local memory is bounded
+        if evicted and self.preload and not self.storage.shared:
+            self.storage.delete(evicted)
+
+    def clear_expired_entries(self):
+        """Remove all expired cache entries.
+
+        Thread-safe method using lock to prevent concurrent modifications.
+        Uses the expiry heap, so the cost is proportional to the number of
+        expired entries rather than the size of the cache.
+        """
+        now = time.time()
+
+        with self._lock:
+            expired_keys = self._sweep_expired(now)
+
+            if self.preload and not self.storage.shared:
+                # Memory mirrors storage, so the expired keys are exactly known
+                self.storage.delete(expired_keys)
+                removed = len(expired_keys)
+            else:
+                # The backend purges its own copy, including entries not in memory
+                removed = max(len(expired_keys), self.storage.purge_expired(now))
+            if removed:
+                logger.info(f"Removed {removed} expired cache entries")
+
+    def _invalidate(self, keys: list[str], version: float | None = None):
+        """Remove entries changed by another process from memory (not from storage).
+
+        Entries created at or after ``version`` are already the changed version
+        or newer (e.g. read from storage before the notice arrived), so they stay.
+        """
+        with self._lock:
+            for key in keys:
+                entry = self.cache_data.get(key)
+                if entry is None or (version is not None and entry["created_at"] >= version):
+                    continue
+                self._remove_from_memory(key)
+                self._invalidations += 1
+
+    def export_snapshot(
+        self, path: str | Path, top_k: int | None = None, format: str = "jsonl"
+    ) -> int:
+        """Write unexpired entries to a snapshot file for warm-starting another cache.
+
+        Entries are streamed to the file one at a time. With ``top_k``, only the
+        resident entries with the most cache hits are written, which keeps
+        snapshots of large caches small while still covering the hot queries.
+
+        Args:
+            path: Snapshot file
+            top_k: Export only this many of the most frequently hit entries
+                   (default: all entries)
+            format: "jsonl" or "binary" (see write_snapshot())
+
+        Returns:
+            Number of entries written
+        """
+        now = time.time()
+        with self._lock:
+            if top_k is not None:
+                keys = heapq.nlargest(
+                    top_k, self.cache_data, key=lambda key: self._access_counts.get(key, 0)
+                )
+                entries = [(key, self.cache_data[key]) for key in keys]
+            elif self.preload and not self.storage.shared:
+                entries = list(self.cache_data.items())
+            else:
+                entries = None
+            counts = dict(self._access_counts)
+
+        if entries is None:
+            # Memory holds only part of the cache, stream the rest from storage
+            entries = self.storage.iter_entries()
+        records = (
+            (key, self._snapshot_entry(entry), counts.get(key, 0))
+            for key, entry in entries
+            if entry["expires_at"] >= now
+        )
+        written = write_snapshot(path, records, format=format)
+        logger.info(f"Exported {written} cache entries to {path}")
+        return written
+
+    def _snapshot_entry(self, entry: dict[str, Any]) -> dict[str, Any]:
+        """Copy an entry with plain result dicts for writing to a snapshot."""
+        entry = dict(entry)
+        entry["results"] = unpack_results(entry["results"])
+        return entry
+
+    def import_snapshot(self, path: str | Path) -> int:
+        """Load entries from a snapshot file written by export_snapshot().
+
+        Expired entries, and entries older than the cached copy of the same
+        key, are skipped. Imported entries keep their access counts, so the
+        same hot entries are exported again by the next snapshot.
+
+        Args:
+            path: Snapshot file in either format
+
+        Returns:
+            Number of entries imported
+        """
+        now = time.time()
+        imported = 0
+        pending: list[tuple[str, dict[str, Any]]] = []
+        for key, entry, hits in read_snapshot(path):
+            upgrade_legacy_entry(entry)
+            if entry["expires_at"] < now:
+                continue
+            with self._lock:
+                current = self.cache_data.get(key)
+                if current is not None and current["created_at"] >= entry["created_at"]:
+                    continue
+                self._store_in_memory(key, entry)
+                self._access_counts[key] = hits
+                self._enforce_capacity(key)
+                # Evicted entries are only kept in storage that is not a mirror of memory
+                if key in self.cache_data or not self.preload or self.storage.shared:
+                    pending.append((key, entry))
+                    if len(pending) >= 500:
+                        self.storage.put_many(pending)
+                        pending = []
+            imported += 1
+        if pending:
+            with self._lock:
+                self.storage.put_many(pending)
+        return imported
+
+    def compact(self):
+        """Remove expired entries and reclaim space in the storage backend."""
+        self.clear_expired_entries()
+        with self._lock:
+            self.storage.compact()
+
+    def flush(self):
+        """Write any buffered changes to storage (only relevant in write-behind mode)."""
+        if isinstance(self.storage, WriteBehindStorage):
+            self.storage.flush()
+
+    def close(self):
+        """Flush buffered changes and close the storage backend."""
+        with self._lock:
+            self.storage.close()
+
+    def get_cache_stats(self) -> dict:
+        """Get cache statistics.
+
+        Thread-safe method using lock to prevent concurrent access. Runs in
+        constant time: statistics are maintained incrementally and only a
+        bounded batch of expired entries is swept first.
+        """
+        with self._lock:
+            expired_keys = self._sweep_expired(time.time(), self.SWEEP_BATCH_SIZE)
+            if expired_keys:
+                self.storage.delete(expired_keys)
+
+            lookups = self._hits + self._misses
+            resident = len(self.cache_data)
+            stats = {
+                "total_entries": resident if self.preload else self.storage.count(),
+                "resident_entries": resident,
+                "cache_file_size": self.storage.size_bytes(),
+                "storage": self.storage.__class__.__name__,
+                "codec": self.codec.name,
+                "estimated_bytes": self._estimated_bytes(),
+                "avg_entry_bytes": self._estimated_bytes() / resident if resident else 0.0,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "eviction_policy": self.eviction_policy.name,
+                "evictions": self._evictions,
+                "rejected_admissions": self._rejected_admissions,
+                "negative_entries": self._negative_entries,
+                "negative_hits": self._negative_hits,
+                "lookups": lookups,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "expired_hits": self._expired_hits,
+                "stale_hits": self._stale_hits,
+                "estimated_latency_saved": self._latency_saved,
+                # Tier 1 is this process' memory, tier 2 the storage backend read through on a miss
+                "l1_hits": self._l1_hits,
+                "l1_misses": lookups - self._l1_hits,
+                "l2_hits": self._l2_hits,
+                "l2_misses": self._l2_lookups - self._l2_hits,
+                "invalidations": self._invalidations,
+                "normalized_hits": self._normalized_hits,
+                "approximate_hits": self._approximate_hits,
+                "sliced_hits": self._sliced_hits,
+                "distinct_results": len(self.result_store),
+                "distinct_urls": self.result_store.distinct_urls,
+                "result_references": self.result_store.references,
+                "by_origin": {
+                    origin: {
+                        "entries": entries,
+                        "hits": hits,
+                        "estimated_latency_saved": saved,
+                        "avg_fetch_seconds": fetch_total / fetches if fetches else None,
+                    }
+                    for origin, (entries, hits, saved, fetch_total, fetches) in sorted(
+                        self._origins.items()
+                    )
+                },
+                "by_query_class": {
+                    name: {
+                        "hits": hits,
+                        "misses": misses,
+                        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                    }
+                    for name, (hits, misses) in sorted(self._query_classes.items())
+                },
+                "next_expiry": _isoformat(self._expiry.next_expiry()),
+                "oldest_entry": None,
+                "newest_entry": None,
+            }
+
+            if self._created:
+                stats["oldest_entry"] = _isoformat(self._created.next_expiry())
+                stats["newest_entry"] = _isoformat(-self._created_desc.next_expiry())
+
+            return stats
@@ -0,0 +1,136 @@
+"""Near-duplicate query matching with MinHash and locality-sensitive hashing."""
+
+import random
+from collections.abc import Iterable
+
+# Mersenne prime modulus for the MinHash permutations
+_PRIME = (1 << 61) - 1
+
+
+class QuerySimilarityIndex:
+    """Find cached queries that are near-duplicates of a new query.
+
+    Each normalized query is reduced to a set of features: its words by default,
+    or its character n-grams with ``char_ngrams`` (more tolerant of typos and
+    inflections). Similarity is the Jaccard index of two feature sets, so word
+    order does not matter: "latest ai regulation eu" and "eu ai regulation
+    latest news" share 4 of 5 words, a similarity of 0.8.
+
+    Queries are indexed by a MinHash signature split into ``bands``. Queries
+    sharing any band land in the same bucket, so a lookup only compares against
+    the few queries in its own buckets, never the whole cache, and the cost
+    stays flat as the cache grows. Candidates are then checked against the
+    exact Jaccard index. With the default 16 bands of 4 rows, a pair with
+    similarity 0.8 becomes a candidate with probability above 0.999.
+
+    Not thread-safe; SearchResultCache calls it with its lock held.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+        char_ngrams: int | None = None,
+        seed: int = 1,
+    ):
+        """Initialize the index.
+
+        Args:
+            threshold: Minimum Jaccard similarity for a match, between 0 and 1
+                       (default: 0.8)
+            num_perm: Number of MinHash permutations (default: 64)
+            bands: Number of LSH bands; must divide num_perm. More bands find
+                   less similar candidates at the cost of more comparisons
+                   (default: 16)
+            char_ngrams: Use character n-grams of this size instead of words
+                         (default: words)
+            seed: Seed for the MinHash permutations
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1")
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.char_ngrams = char_ngrams
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+        # bucket -> keys of queries in it
+        self._buckets: dict[int, set[str]] = {}
+        # key -> (features, buckets)
+        self._entries: dict[str, tuple[frozenset[str], list[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def features(self, normalized_query: str) -> frozenset[str]:
+        """Feature set of a normalized query."""
+        if self.char_ngrams is None:
+            return frozenset(normalized_query.split())
+        text = f" {normalized_query} "
+        size = self.char_ngrams
+        return frozenset(text[i : i + size] for i in range(max(len(text) - size + 1, 1)))
+
+    def add(self, key: str, normalized_query: str, scope: str):
+        """Index a query, replacing any previous query under the same key.
+
+        Args:
+            key: Cache key of the entry
+            normalized_query: The entry's query after normalization
+            scope: Only queries with the same scope are matched with each other
+        """
+        self.remove(key)
+        features = self.features(normalized_query)
+        if not features:
+            return
+        buckets = self._bucket_ids(features, scope)
+        for bucket in buckets:
+            self._buckets.setdefault(bucket, set()).add(key)
+        self._entries[key] = (features, buckets)
+
+    def remove(self, key: str):
+        """Remove a query from the index. Unknown keys are ignored."""
+        indexed = self._entries.pop(key, None)
+        if indexed is None:
+            return
+        for bucket in indexed[1]:
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+    def matches(self, normalized_query: str, scope: str) -> list[tuple[float, str]]:
+        """Indexed queries at least ``threshold`` similar to a query.
+
+        Returns:
+            (similarity, key) pairs, most similar first
+        """
+        features = self.features(normalized_query)
+        if not features:
+            return []
+        candidates: set[str] = set()
+        for bucket in self._bucket_ids(features, scope):
+            candidates.update(self._buckets.get(bucket, ()))
+        matches = []
+        for key in candidates:
+            other = self._entries[key][0]
+            similarity = len(features & other) / len(features | other)
+            if similarity >= self.threshold:
+                matches.append((similarity, key))
+        matches.sort(reverse=True)
+        return matches
+
+    def _bucket_ids(self, features: Iterable[str], scope: str) -> list[int]:
+        # hash() of a str is salted per process, which is fine for an in-memory index
+        hashes = [hash(feature) & 0xFFFFFFFFFFFFFFFF for feature in features]
+        signature = [min([(a * h + b) % _PRIME for h in hashes]) for a, b in self._permutations]
+        rows = self.rows
+        return [
+            hash((scope, band, *signature[band * rows : (band + 1) * rows]))
+            for band in range(self.bands)
+        ]
@@ -0,0 +1,94 @@
+"""Streaming snapshot files for warm-starting search result caches."""
+
+import json
+import logging
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from multi_search_api.cache.codec import CompactCodec, decode_entry
+
+logger = logging.getLogger(__name__)
+
+# First bytes of a binary snapshot; JSONL snapshots start with "{"
+BINARY_MAGIC = b"MSASNAP1"
+# Per record: key length, access count, payload length
+_RECORD_HEADER = struct.Struct(">HII")
+
+# A snapshot record: cache key, entry, number of hits the entry had
+SnapshotRecord = tuple[str, dict[str, Any], int]
+
+
+def write_snapshot(
+    path: str | Path, records: Iterable[SnapshotRecord], format: str = "jsonl"
+) -> int:
+    """Write records to a snapshot file, one at a time.
+
+    The file is written under a temporary name and moved into place when
+    complete, so a crash never leaves a truncated snapshot behind.
+
+    Args:
+        path: Snapshot file
+        records: (key, entry, hits) tuples
+        format: "jsonl" (one JSON object per line) or "binary" (length-prefixed
+                records encoded with CompactCodec)
+
+    Returns:
+        Number of records written
+    """
+    if format not in ("jsonl", "binary"):
+        raise ValueError(f"Unknown snapshot format: {format!r}")
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    count = 0
+    with open(tmp_path, "wb") as f:
+        if format == "binary":
+            codec = CompactCodec()
+            f.write(BINARY_MAGIC)
+            for key, entry, hits in records:
+                key_bytes = key.encode("utf-8")
+                payload = codec.encode(entry)
+                f.write(_RECORD_HEADER.pack(len(key_bytes), hits, len(payload)))
+                f.write(key_bytes)
+                f.write(payload)
+                count += 1
+        else:
+            for key, entry, hits in records:
+                record = {"key": key, "hits": hits, "entry": entry}
+                f.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+                count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def read_snapshot(path: str | Path) -> Iterator[SnapshotRecord]:
+    """Stream records from a snapshot file in either format.
+
+    Corrupt records are skipped; a truncated binary file ends the stream.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+            while header := f.read(_RECORD_HEADER.size):
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                key_length, hits, payload_length = _RECORD_HEADER.unpack(header)
+                key = f.read(key_length).decode("utf-8")
+                payload = f.read(payload_length)
+                if len(payload) < payload_length:
+                    logger.warning(f"Snapshot {path} is truncated")
+                    break
+                try:
+                    yield key, decode_entry(payload), hits
+                except ValueError as e:
+                    logger.warning(f"Skipping corrupt snapshot record {key}: {e}")
+            return
+
+        f.seek(0)
+        for line in f:
+            try:
+                record = json.loads(line)
+                yield record["key"], record["entry"], record.get("hits", 0)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping corrupt snapshot line: {e}")
@@ -0,0 +1,823 @@
+"""Persistence backends for the search result cache."""
+
+import atexit
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from multi_search_api.cache.codec import EntryCodec, JSONCodec, decode_entry, unpack_result
+from multi_search_api.cache.results import result_key
+
+logger = logging.getLogger(__name__)
+
+# File suffixes that select the SQLite backend in open_storage()
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+# File suffix that selects the indexed append-only backend in open_storage()
+INDEXED_SUFFIX = ".jsonl"
+
+# Entries written before expiry was stored explicitly always lived for one day
+LEGACY_CACHE_DURATION = timedelta(days=1)
+
+
+def upgrade_legacy_entry(entry: dict[str, Any]) -> dict[str, Any]:
+    """Convert entries written by older versions of the cache to epoch timestamps.
+
+    Older entries store an ISO ``timestamp``; current entries store
+    ``created_at`` and ``expires_at`` as epoch seconds.
+    """
+    if "created_at" in entry and "expires_at" in entry:
+        return entry
+    try:
+        created_at = datetime.fromisoformat(entry.pop("timestamp")).timestamp()
+    except (ValueError, KeyError, TypeError):
+        # Invalid timestamp, treat as expired
+        created_at = 0.0
+    entry["created_at"] = created_at
+    if "expires_at" not in entry:
+        entry["expires_at"] = (
+            created_at + LEGACY_CACHE_DURATION.total_seconds() if created_at else 0.0
+        )
+    return entry
+
+
+class CacheStorage(ABC):
+    """Abstract base class for cache persistence backends.
+
+    A backend persists individual cache entries by cache key. Entries are the
+    plain dictionaries produced by SearchResultCache and always carry an
+    ``expires_at`` epoch timestamp that backends may index on.
+    """
+
+    # Whether several processes may read and write this storage concurrently
+    shared = False
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    @abstractmethod
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Load stored entries.
+
+        Backends may skip entries that have already expired.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get a single entry, or None if it is not stored."""
+        pass
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Get several entries at once; keys that are not stored are left out.
+
+        Backends with a round trip per read override this to batch them.
+        """
+        entries = {}
+        for key in keys:
+            entry = self.get(key)
+            if entry is not None:
+                entries[key] = entry
+        return entries
+
+    def iter_entries(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Iterate over stored entries; backends may stream them instead of loading all."""
+        yield from self.load().items()
+
+    @abstractmethod
+    def put_many(self, entries: Iterable[tuple[str, dict[str, Any]]]):
+        """Insert or replace several entries at once."""
+        pass
+
+    @abstractmethod
+    def delete(self, keys: Iterable[str]):
+        """Delete entries by key. Unknown keys are ignored."""
+        pass
+
+    @abstractmethod
+    def purge_expired(self, now: float) -> int:
+        """Delete all entries whose expiry lies before ``now``.
+
+        Returns:
+            Number of entries removed
+        """
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored entries."""
+        pass
+
+    def put(self, key: str, entry: dict[str, Any]):
+        """Insert or replace a single entry."""
+        self.put_many([(key, entry)])
+
+    def size_bytes(self) -> int:
+        """Size of the backing file(s) on disk."""
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def compact(self):
+        """Reclaim space left behind by deleted or expired entries."""
+        self.purge_expired(time.time())
+
+    def subscribe(  # noqa: B027 - optional hook
+        self, callback: Callable[[list[str], float | None], None]
+    ):
+        """Register ``callback`` to be called with keys other processes changed.
+
+        The callback also gets the change's version: the ``created_at`` of the
+        newest entry written, or the time of a delete (None if unknown).
+        Cached copies at least that new are not outdated by the change.
+
+        Backends that cannot notify about remote changes ignore this.
+        """
+        pass
+
+    def close(self):  # noqa: B027 - optional hook, no-op by default
+        """Release any resources held by the backend."""
+        pass
+
+
+class JSONFileStorage(CacheStorage):
+    """Store all entries in a single JSON file.
+
+    Every mutation rewrites the whole file, which keeps the file human readable
+    but makes writes O(total cache size). Suitable for small caches. Pass
+    ``indent=None`` to write the file without pretty-printing.
+
+    The file is read by load(), or on first use by any other method, so a
+    cache that does not preload still sees and keeps the existing entries.
+    """
+
+    def __init__(self, path: str | Path, indent: int | None = 2):
+        super().__init__(path)
+        self.indent = indent
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._loaded = False
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Load all entries from the JSON file."""
+        self._loaded = True
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._entries = {
+                        key: upgrade_legacy_entry(entry)
+                        for key, entry in data.items()
+                        if isinstance(entry, dict)
+                    }
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Failed to load search cache: {e}")
+        return dict(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get a single entry from the in-memory copy of the file."""
+        self._ensure_loaded()
+        return self._entries.get(key)
+
+    def put_many(self, entries: Iterable[tuple[str, dict[str, Any]]]):
+        """Insert entries and rewrite the file once."""
+        self._ensure_loaded()
+        self._entries.update(entries)
+        self._write()
+
+    def delete(self, keys: Iterable[str]):
+        """Delete entries and rewrite the file if anything changed."""
+        self._ensure_loaded()
+        removed = [key for key in keys if self._entries.pop(key, None) is not None]
+        if removed:
+            self._write()
+
+    def purge_expired(self, now: float) -> int:
+        """Delete expired entries by scanning all entries."""
+        self._ensure_loaded()
+        expired = [key for key, entry in self._entries.items() if entry.get("expires_at", 0) < now]
+        self.delete(expired)
+        return len(expired)
+
+    def count(self) -> int:
+        """Number of entries in the file."""
+        self._ensure_loaded()
+        return len(self._entries)
+
+    def compact(self):
+        """Drop expired entries and rewrite the file."""
+        if not self.purge_expired(time.time()):
+            self._write()
+
+    def _ensure_loaded(self):
+        """Read the file if load() has not, so writes never drop entries they did not see."""
+        if not self._loaded:
+            self.load()
+
+    def _write(self):
+        """Atomically rewrite the JSON file with the current entries.
+
+        The data is written to a temporary file that then replaces the cache file,
+        so readers and crashes never observe a half-written cache.
+        """
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                if self.indent is None:
+                    json.dump(self._entries, f, ensure_ascii=False, separators=(",", ":"))
+                else:
+                    json.dump(self._entries, f, indent=self.indent, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save search cache: {e}")
+
+
+class SQLiteStorage(CacheStorage):
+    """Store entries in an embedded SQLite database in WAL mode.
+
+    Each entry is a single row, so writes are per-entry upserts instead of full
+    file rewrites. Expiry is indexed, and WAL mode lets several worker processes
+    read concurrently while one of them writes. Payloads are encoded by
+    ``codec`` (JSON text by default); rows written with any codec can be read.
+
+    Results are content-addressed: each distinct result (canonical URL plus
+    content hash) is stored once in ``search_results`` and entries only hold
+    references to it. Results no entry refers to any more are removed by
+    compact() with a mark-and-sweep pass.
+    """
+
+    shared = True
+
+    # Seconds to wait for a lock held by another process before failing
+    BUSY_TIMEOUT = 30.0
+
+    def __init__(self, path: str | Path, codec: EntryCodec | None = None):
+        super().__init__(path)
+        self.codec = codec or JSONCodec()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=self.BUSY_TIMEOUT,
+            isolation_level=None,  # autocommit; explicit transactions below
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_expires ON search_cache (expires_at)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_results ("
+            "url TEXT NOT NULL, hash TEXT NOT NULL, payload TEXT NOT NULL, PRIMARY KEY (url, hash))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_results_hash ON search_results (hash)"
+        )
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Load all unexpired entries."""
+        with self._lock, self._read_transaction():
+            rows = self._conn.execute(
+                "SELECT key, payload FROM search_cache WHERE expires_at >= ?", (time.time(),)
+            ).fetchall()
+            result_rows = self._conn.execute(
+                "SELECT url, hash, payload FROM search_results"
+            ).fetchall()
+        # Entries referring to the same result share one dict
+        results = {
+            (url, content_hash): json.loads(payload) for url, content_hash, payload in result_rows
+        }
+        entries = {}
+        for key, payload in rows:
+            try:
+                entries[key] = self._resolve(decode_entry(payload), results)
+            except ValueError as e:
+                logger.warning(f"Skipping corrupt cache entry {key}: {e}")
+        return entries
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get a single entry by primary key."""
+        with self._lock, self._read_transaction():
+            row = self._conn.execute(
+                "SELECT payload FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            try:
+                entry = decode_entry(row[0])
+            except ValueError:
+                return None
+            hashes = sorted({content_hash for _, content_hash in entry.get("result_refs", ())})
+            result_rows = self._conn.execute(
+                "SELECT url, hash, payload FROM search_results "
+                f"WHERE hash IN ({', '.join('?' * len(hashes))})",
+                hashes,
+            ).fetchall()
+        results = {
+            (url, content_hash): json.loads(payload) for url, content_hash, payload in result_rows
+        }
+        return self._resolve(entry, results)
+
+    @contextmanager
+    def _read_transaction(self):
+        """Read several tables from one consistent snapshot. Must be called with the lock held."""
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        finally:
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _resolve(
+        entry: dict[str, Any], results: dict[tuple[str, str], dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Replace an entry's result references with the referenced results."""
+        refs = entry.pop("result_refs", None)
+        if refs is not None:
+            entry["results"] = [results[tuple(ref)] for ref in refs if tuple(ref) in results]
+            entry["result_count"] = len(entry["results"])
+        return entry
+
+    @staticmethod
+    def _split_results(entry: dict[str, Any]) -> tuple[dict[str, Any], list[tuple[str, str, str]]]:
+        """Replace an entry's results with references, returning the result rows to store."""
+        refs, result_rows = [], []
+        for result in entry["results"]:
+            url, content_hash = result_key(result)
+            refs.append([url, content_hash])
+            payload = json.dumps(unpack_result(result), ensure_ascii=False)
+            result_rows.append((url, content_hash, payload))
+        return {**entry, "results": [], "result_refs": refs}, result_rows
+
+    def put_many(self, entries: Iterable[tuple[str, dict[str, Any]]]):
+        """Upsert entries and their results in a single transaction."""
+        rows, result_rows = [], []
+        for key, entry in entries:
+            stored, entry_results = self._split_results(entry)
+            rows.append((key, entry.get("expires_at", 0), self._encode(stored)))
+            result_rows.extend(entry_results)
+        if not rows:
+            return
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO search_results (url, hash, payload) "
+                        "VALUES (?, ?, ?)",
+                        result_rows,
+                    )
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO search_cache (key, expires_at, payload) "
+                        "VALUES (?, ?, ?)",
+                        rows,
+                    )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save search cache: {e}")
+
+    def _encode(self, entry: dict[str, Any]) -> bytes | str:
+        payload = self.codec.encode(entry)
+        # Text payloads stay TEXT so the database remains readable with the sqlite3 CLI
+        return payload if self.codec.binary else payload.decode("utf-8")
+
+    def delete(self, keys: Iterable[str]):
+        """Delete entries by primary key."""
+        params = [(key,) for key in keys]
+        if not params:
+            return
+        try:
+            with self._lock:
+                self._conn.executemany("DELETE FROM search_cache WHERE key = ?", params)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to delete search cache entries: {e}")
+
+    def purge_expired(self, now: float) -> int:
+        """Delete expired entries using the expiry index."""
+        try:
+            with self._lock:
+                cursor = self._conn.execute("DELETE FROM search_cache WHERE expires_at < ?", (now,))
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Failed to purge expired search cache entries: {e}")
+            return 0
+
+    def count(self) -> int:
+        """Number of stored rows, including rows not yet purged."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+    def size_bytes(self) -> int:
+        """Size of the database plus its write-ahead log."""
+        wal = self.path.with_name(self.path.name + "-wal")
+        return sum(p.stat().st_size for p in (self.path, wal) if p.exists())
+
+    def compact(self):
+        """Purge expired rows and unreferenced results, checkpoint the WAL and vacuum."""
+        self.purge_expired(time.time())
+        self._sweep_results()
+        try:
+            with self._lock:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.execute("VACUUM")
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to compact search cache: {e}")
+
+    def _sweep_results(self):
+        """Mark results referenced by any entry and delete the rest."""
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    referenced = set()
+                    for (payload,) in self._conn.execute("SELECT payload FROM search_cache"):
+                        try:
+                            refs = decode_entry(payload).get("result_refs", ())
+                        except ValueError:
+                            continue
+                        referenced.update(tuple(ref) for ref in refs)
+                    unreferenced = [
+                        row
+                        for row in self._conn.execute("SELECT url, hash FROM search_results")
+                        if row not in referenced
+                    ]
+                    self._conn.executemany(
+                        "DELETE FROM search_results WHERE url = ? AND hash = ?", unreferenced
+                    )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            if unreferenced:
+                logger.info(f"Removed {len(unreferenced)} unreferenced cached results")
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to sweep cached results: {e}")
+
+    def distinct_urls(self) -> int:
+        """Number of distinct canonical URLs among stored results."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT url) FROM search_results").fetchone()[
+                0
+            ]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class IndexedFileStorage(CacheStorage):
+    """Store entries in an append-only data file with a separate key index.
+
+    Entries are appended to ``<path>`` one record per line, encoded by ``codec``
+    (JSON by default); ``<path>.idx`` records
+    ``key, offset, length, expires_at`` for every write (or a tombstone for a
+    delete). Opening the storage only reads the compact index, and entry bodies
+    are read on demand through a memory map of the data file, so startup cost
+    depends on the number of keys rather than the size of the cached results.
+    Superseded records are reclaimed by compact().
+    """
+
+    def __init__(self, path: str | Path, codec: EntryCodec | None = None):
+        super().__init__(path)
+        self.codec = codec or JSONCodec()
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self._lock = threading.Lock()
+        self._index: dict[str, tuple[int, int, float]] = {}
+        self._mmap: mmap.mmap | None = None
+        self._load_index()
+        self._data_file = open(self.path, "ab")
+        self._index_file = open(self.index_path, "a", encoding="utf-8")
+
+    def _load_index(self):
+        """Replay the index log; later records win over earlier ones."""
+        if not self.index_path.exists():
+            return
+        data_size = self.path.stat().st_size if self.path.exists() else 0
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    key, offset, length, expires_at = line.rstrip("\n").split("\t")
+                    offset, length = int(offset), int(length)
+                except ValueError:
+                    continue  # Partially written line after a crash
+                if offset < 0:
+                    self._index.pop(key, None)
+                elif offset + length <= data_size:
+                    self._index[key] = (offset, length, float(expires_at))
+
+    def _read(self, offset: int, length: int) -> dict[str, Any] | None:
+        """Read one entry body from the memory-mapped data file.
+
+        Must be called with the lock held.
+        """
+        end = offset + length
+        if self._mmap is None or len(self._mmap) < end:
+            # The data file grew since it was mapped, map it again
+            self._data_file.flush()
+            if self._mmap is not None:
+                self._mmap.close()
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return decode_entry(self._mmap[offset:end])
+        except (ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Skipping corrupt cache record at offset {offset}: {e}")
+            return None
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Load all unexpired entries (reads every body)."""
+        now = time.time()
+        entries = {}
+        with self._lock:
+            for key, (offset, length, expires_at) in list(self._index.items()):
+                if expires_at >= now:
+                    entry = self._read(offset, length)
+                    if entry is not None:
+                        entries[key] = entry
+        return entries
+
+    def iter_entries(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Stream unexpired entries, reading one body at a time."""
+        now = time.time()
+        with self._lock:
+            keys = [key for key, record in self._index.items() if record[2] >= now]
+        for key in keys:
+            with self._lock:
+                # Look the record up again, compaction may have moved it
+                record = self._index.get(key)
+                entry = self._read(record[0], record[1]) if record is not None else None
+            if entry is not None:
+                yield key, entry
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Read a single entry body via the index."""
+        with self._lock:
+            record = self._index.get(key)
+            if record is None:
+                return None
+            return self._read(record[0], record[1])
+
+    def put_many(self, entries: Iterable[tuple[str, dict[str, Any]]]):
+        """Append entries to the data file and their records to the index."""
+        try:
+            with self._lock:
+                offset = self._data_file.tell()
+                index_lines = []
+                for key, entry in entries:
+                    payload = self.codec.encode(entry)
+                    self._data_file.write(payload + b"\n")
+                    expires_at = entry.get("expires_at", 0)
+                    self._index[key] = (offset, len(payload), expires_at)
+                    index_lines.append(f"{key}\t{offset}\t{len(payload)}\t{expires_at}\n")
+                    offset += len(payload) + 1
+                self._data_file.flush()
+                self._index_file.writelines(index_lines)
+                self._index_file.flush()
+        except OSError as e:
+            logger.error(f"Failed to save search cache: {e}")
+
+    def delete(self, keys: Iterable[str]):
+        """Append tombstones for deleted keys."""
+        try:
+            with self._lock:
+                removed = [key for key in keys if self._index.pop(key, None) is not None]
+                if removed:
+                    self._index_file.writelines(f"{key}\t-1\t0\t0\n" for key in removed)
+                    self._index_file.flush()
+        except OSError as e:
+            logger.error(f"Failed to delete search cache entries: {e}")
+
+    def purge_expired(self, now: float) -> int:
+        """Delete expired entries using the in-memory index."""
+        with self._lock:
+            expired = [key for key, record in self._index.items() if record[2] < now]
+        self.delete(expired)
+        return len(expired)
+
+    def count(self) -> int:
+        """Number of live keys in the index."""
+        return len(self._index)
+
+    def size_bytes(self) -> int:
+        """Size of the data file plus its index."""
+        return sum(p.stat().st_size for p in (self.path, self.index_path) if p.exists())
+
+    def compact(self):
+        """Rewrite both files with only the live, unexpired entries."""
+        self.purge_expired(time.time())
+        with self._lock:
+            live = [
+                (key, self._read(offset, length))
+                for key, (offset, length, _) in self._index.items()
+            ]
+            data_tmp = self.path.with_name(self.path.name + ".tmp")
+            index_tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+            new_index = {}
+            try:
+                with (
+                    open(data_tmp, "wb") as data_f,
+                    open(index_tmp, "w", encoding="utf-8") as index_f,
+                ):
+                    offset = 0
+                    for key, entry in live:
+                        if entry is None:
+                            continue
+                        payload = self.codec.encode(entry)
+                        data_f.write(payload + b"\n")
+                        expires_at = entry.get("expires_at", 0)
+                        index_f.write(f"{key}\t{offset}\t{len(payload)}\t{expires_at}\n")
+                        new_index[key] = (offset, len(payload), expires_at)
+                        offset += len(payload) + 1
+
+                self._close_files()
+                os.replace(data_tmp, self.path)
+                os.replace(index_tmp, self.index_path)
+                self._index = new_index
+            except OSError as e:
+                logger.warning(f"Failed to compact search cache: {e}")
+            finally:
+                if self._data_file.closed:
+                    self._data_file = open(self.path, "ab")
+                    self._index_file = open(self.index_path, "a", encoding="utf-8")
+
+    def _close_files(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._data_file.close()
+        self._index_file.close()
+
+    def close(self):
+        """Close the data file, index and memory map."""
+        with self._lock:
+            self._close_files()
+
+
+class WriteBehindStorage(CacheStorage):
+    """Buffer writes in memory and persist them from a background thread.
+
+    Mutations only update a dirty set, so callers never wait for disk I/O. A
+    flusher thread applies the dirty set to the wrapped storage every
+    ``flush_interval`` seconds, or sooner once ``flush_threshold`` keys are
+    dirty, turning a burst of N writes into a single write. Pending writes are
+    also flushed by flush(), close() and at interpreter exit.
+    """
+
+    def __init__(
+        self, storage: CacheStorage, flush_interval: float = 5.0, flush_threshold: int = 100
+    ):
+        super().__init__(storage.path)
+        self.storage = storage
+        self.shared = storage.shared
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        # Dirty set: key -> entry to write, or None for a pending delete
+        self._pending: dict[str, dict[str, Any] | None] = {}
+        self._pending_lock = threading.Lock()
+        # Serializes access to the wrapped storage between flushes and reads
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self.flush_count = 0
+        self._flusher = threading.Thread(
+            target=self._run_flusher, name="search-cache-flusher", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _run_flusher(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _mark_dirty(self, updates: dict[str, dict[str, Any] | None]):
+        with self._pending_lock:
+            self._pending.update(updates)
+            dirty = len(self._pending)
+        if dirty >= self.flush_threshold:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write all pending changes to the wrapped storage."""
+        with self._io_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            writes = [(key, entry) for key, entry in pending.items() if entry is not None]
+            deletes = [key for key, entry in pending.items() if entry is None]
+            if writes:
+                self.storage.put_many(writes)
+            if deletes:
+                self.storage.delete(deletes)
+            self.flush_count += 1
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Load entries from the wrapped storage, including pending writes."""
+        self.flush()
+        with self._io_lock:
+            return self.storage.load()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get an entry, preferring a pending write over the stored copy."""
+        with self._pending_lock:
+            if key in self._pending:
+                return self._pending[key]
+        with self._io_lock:
+            return self.storage.get(key)
+
+    def put_many(self, entries: Iterable[tuple[str, dict[str, Any]]]):
+        """Mark entries dirty; they are written on the next flush."""
+        self._mark_dirty(dict(entries))
+
+    def delete(self, keys: Iterable[str]):
+        """Mark keys for deletion on the next flush."""
+        self._mark_dirty(dict.fromkeys(keys))
+
+    def purge_expired(self, now: float) -> int:
+        """Flush pending changes, then purge expired entries from storage."""
+        self.flush()
+        with self._io_lock:
+            return self.storage.purge_expired(now)
+
+    def count(self) -> int:
+        """Number of stored entries, not counting pending changes."""
+        with self._io_lock:
+            return self.storage.count()
+
+    def size_bytes(self) -> int:
+        """Size of the wrapped storage on disk."""
+        with self._io_lock:
+            return self.storage.size_bytes()
+
+    def compact(self):
+        """Flush pending changes and compact the wrapped storage."""
+        self.flush()
+        with self._io_lock:
+            self.storage.compact()
+
+    def subscribe(self, callback: Callable[[list[str], float | None], None]):
+        """Subscribe to remote changes of the wrapped storage."""
+        self.storage.subscribe(callback)
+
+    def close(self):
+        """Stop the flusher, write pending changes and close the wrapped storage."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._flusher.join(timeout=self.flush_interval + 1)
+        self.flush()
+        with self._io_lock:
+            self.storage.close()
+        atexit.unregister(self.close)
+
+
+def open_storage(path: str | Path, codec: EntryCodec | None = None) -> CacheStorage:
+    """Open the storage backend that matches a cache file's suffix.
+
+    ``.db``, ``.sqlite`` and ``.sqlite3`` files use SQLiteStorage, ``.jsonl``
+    files use IndexedFileStorage and anything else uses JSONFileStorage.
+    ``codec`` encodes entries for the SQLite and indexed backends; with a
+    non-JSON codec the JSON file is written without pretty-printing instead.
+    """
+    path = Path(path)
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        return SQLiteStorage(path, codec=codec)
+    if path.suffix.lower() == INDEXED_SUFFIX:
+        return IndexedFileStorage(path, codec=codec)
+    compact = codec is not None and not isinstance(codec, JSONCodec)
+    return JSONFileStorage(path, indent=None if compact else 2)
+
+
+def migrate_storage(source: CacheStorage, target: CacheStorage) -> int:
+    """Copy all unexpired entries from one backend into another.
+
+    Typical use is moving an existing ``search_results.json`` into SQLite::
+
+        migrate_storage(JSONFileStorage("search_results.json"), SQLiteStorage("cache.db"))
+
+    Returns:
+        Number of entries copied
+    """
+    now = time.time()
+    entries = [(key, entry) for key, entry in source.load().items() if entry["expires_at"] >= now]
+    target.put_many(entries)
+    logger.info(f"Migrated {len(entries)} cache entries from {source.path} to {target.path}")
+    return len(entries)
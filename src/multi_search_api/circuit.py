@@ -0,0 +1,238 @@
+"""Per-provider circuit breakers: pausing rate-limited providers for a while."""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator, MutableSet
+from dataclasses import dataclass
+from typing import Any
+
+from multi_search_api.exceptions import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class _Breaker:
+    state: str = CLOSED
+    # Openings since the provider last answered, for the exponential backoff
+    trips: int = 0
+    open_until: float = 0.0
+    probe_started: float | None = None
+    last_error: str | None = None
+
+
+class CircuitBreakers(MutableSet):
+    """A circuit breaker per provider, replacing session-long rate limit bans.
+
+    - closed: requests flow. A rate limit opens the breaker.
+    - open: the provider is skipped for a cooldown: the ``retry_after`` of the
+      RateLimitError (the provider's Retry-After header or its own backoff),
+      otherwise ``cooldown * 2 ** (trips - 1)`` capped at ``max_cooldown``,
+      where trips counts openings since the provider last answered.
+    - half-open: after the cooldown a single probe request is let through.
+      An answer closes the breaker, any error opens it again. A probe that
+      never reports back (e.g. a cancelled hedge) is replaced after
+      ``probe_timeout`` seconds.
+
+    The breakers also act as the set of providers that are currently rate
+    limited (open or half-open): ``add()`` opens a provider's breaker and
+    ``discard()`` closes it. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        cooldown: float = 60.0,
+        max_cooldown: float = 3600.0,
+        probe_timeout: float = 30.0,
+        history: int = 50,
+    ):
+        """Initialize the breakers.
+
+        Args:
+            cooldown: Seconds a breaker stays open after a first rate limit
+                      without Retry-After (default: 60)
+            max_cooldown: Upper bound for the backoff (default: 1 hour)
+            probe_timeout: Seconds before an unanswered probe is replaced
+                           (default: 30)
+            history: Number of recent state transitions kept (default: 50)
+        """
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._breakers: dict[str, _Breaker] = {}
+        self._transitions: deque[dict[str, Any]] = deque(maxlen=history)
+
+    def allow(self, provider_name: str) -> bool:
+        """Whether a request to the provider may be sent now.
+
+        In half-open state this claims the single probe, so only call it right
+        before sending the request.
+        """
+        with self._lock:
+            breaker = self._breakers.get(provider_name)
+            if breaker is None or breaker.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if not self._probe_ready(breaker, now):
+                return False
+            if breaker.state == OPEN:
+                self._transition(provider_name, breaker, HALF_OPEN, "cooldown over, probing")
+            breaker.probe_started = now
+            return True
+
+    def ready(self, provider_name: str) -> bool:
+        """Whether allow() would let a request through, without claiming a probe."""
+        with self._lock:
+            breaker = self._breakers.get(provider_name)
+            if breaker is None or breaker.state == CLOSED:
+                return True
+            return self._probe_ready(breaker, time.monotonic())
+
+    def retry_in(self, provider_name: str) -> float:
+        """Seconds until the provider's breaker lets a request through (0 if it does now)."""
+        with self._lock:
+            breaker = self._breakers.get(provider_name)
+            if breaker is None or breaker.state == CLOSED:
+                return 0.0
+            now = time.monotonic()
+            if breaker.state == OPEN:
+                return max(breaker.open_until - now, 0.0)
+            if breaker.probe_started is None:
+                return 0.0
+            return max(breaker.probe_started + self.probe_timeout - now, 0.0)
+
+    def state(self, provider_name: str) -> str:
+        """Current state of a provider's breaker: "closed", "open" or "half_open"."""
+        with self._lock:
+            breaker = self._breakers.get(provider_name)
+            return breaker.state if breaker is not None else CLOSED
+
+    def record_success(self, provider_name: str):
+        """Record that the provider answered (with or without results)."""
+        with self._lock:
+            breaker = self._breakers.get(provider_name)
+            if breaker is None:
+                return
+            if breaker.state == HALF_OPEN:
+                self._transition(provider_name, breaker, CLOSED, "probe answered")
+            if breaker.state == CLOSED:
+                breaker.trips = 0
+                breaker.probe_started = None
+
+    def record_failure(self, provider_name: str, error: Exception):
+        """Record a failed request.
+
+        A rate limit opens a closed breaker; any error reopens a half-open one.
+        Other errors leave a closed breaker alone.
+        """
+        rate_limited = isinstance(error, RateLimitError)
+        with self._lock:
+            breaker = self._breakers.get(provider_name)
+            if breaker is None:
+                if not rate_limited:
+                    return
+                breaker = self._breakers[provider_name] = _Breaker()
+            if breaker.state == HALF_OPEN or (breaker.state == CLOSED and rate_limited):
+                retry_after = getattr(error, "retry_after", None)
+                self._open(provider_name, breaker, retry_after, str(error))
+
+    def trip(self, provider_name: str, cooldown: float | None = None, reason: str = "tripped"):
+        """Open a provider's breaker, for ``cooldown`` seconds or the next backoff step."""
+        with self._lock:
+            breaker = self._breakers.setdefault(provider_name, _Breaker())
+            self._open(provider_name, breaker, cooldown, reason)
+
+    def reset(self, provider_name: str | None = None):
+        """Close one provider's breaker, or all of them."""
+        with self._lock:
+            names = [provider_name] if provider_name is not None else list(self._breakers)
+            for name in names:
+                breaker = self._breakers.pop(name, None)
+                if breaker is not None and breaker.state != CLOSED:
+                    self._transition(name, breaker, CLOSED, "reset")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Breaker per provider that has been rate limited, and recent transitions."""
+        with self._lock:
+            names = list(self._breakers)
+            transitions = list(self._transitions)
+        providers = {}
+        for name in names:
+            with self._lock:
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    continue
+                info = {
+                    "state": breaker.state,
+                    "trips": breaker.trips,
+                    "last_error": breaker.last_error,
+                }
+            info["retry_in"] = round(self.retry_in(name), 3)
+            providers[name] = info
+        return {"providers": providers, "transitions": transitions}
+
+    def _probe_ready(self, breaker: _Breaker, now: float) -> bool:
+        if breaker.state == OPEN:
+            return now >= breaker.open_until
+        return breaker.probe_started is None or now - breaker.probe_started >= self.probe_timeout
+
+    def _open(self, provider_name: str, breaker: _Breaker, cooldown: float | None, reason: str):
+        breaker.trips += 1
+        if cooldown is None:
+            cooldown = min(self.cooldown * 2 ** (breaker.trips - 1), self.max_cooldown)
+        breaker.open_until = time.monotonic() + cooldown
+        breaker.probe_started = None
+        breaker.last_error = reason
+        self._transition(provider_name, breaker, OPEN, f"{reason} (retry in {cooldown:.0f}s)")
+
+    def _transition(self, provider_name: str, breaker: _Breaker, state: str, reason: str):
+        previous, breaker.state = breaker.state, state
+        self._transitions.append(
+            {
+                "provider": provider_name,
+                "from": previous,
+                "to": state,
+                "reason": reason,
+                "at": time.time(),
+            }
+        )
+        if state == OPEN:
+            logger.warning(f"🔌 {provider_name} paused: {reason}")
+        else:
+            logger.info(f"🔌 {provider_name} circuit {state.replace('_', '-')}: {reason}")
+
+    # Set of rate-limited providers, for code that used the old session-long set
+
+    def __contains__(self, provider_name: object) -> bool:
+        with self._lock:
+            breaker = self._breakers.get(provider_name)  # type: ignore[arg-type]
+            return breaker is not None and breaker.state != CLOSED
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            names = [name for name, b in self._breakers.items() if b.state != CLOSED]
+        return iter(names)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(b.state != CLOSED for b in self._breakers.values())
+
+    def add(self, provider_name: str):
+        """Open a provider's breaker (see trip())."""
+        if provider_name not in self:
+            self.trip(provider_name)
+
+    def discard(self, provider_name: str):
+        """Close a provider's breaker."""
+        self.reset(provider_name)
+
+    def clear(self):
+        """Close all breakers."""
+        self.reset()
@@ -1,21 +1,50 @@
 """Core SmartSearchTool implementation."""
 
+import asyncio
 import logging
 import os
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import Any
 
 from dotenv import load_dotenv
 
-from multi_search_api.cache import SearchResultCache
+from multi_search_api.batch import (
+    DEFAULT_PROVIDER_LIMITS,
+    BatchItem,
+    ProviderBudget,
+    ProviderLimit,
+    schedule_batch,
+)
+from multi_search_api.cache import (
+    CacheBackend,
+    CacheLookup,
+    QueryNormalizer,
+    SearchResultCache,
+    TTLPolicy,
+    build_cache_key,
+)
+from multi_search_api.cache.normalize import DEFAULT_NUM_RESULTS
+from multi_search_api.circuit import CircuitBreakers
 from multi_search_api.exceptions import RateLimitError
+from multi_search_api.fusion import fuse_results
+from multi_search_api.hedging import HedgingPolicy
+from multi_search_api.pacing import RateScheduler
 from multi_search_api.providers import (
     BraveProvider,
     DuckDuckGoProvider,
     GoogleScraperProvider,
+    SearchProvider,
     SearXNGProvider,
     SerperProvider,
 )
+from multi_search_api.routing import DEFAULT_STATE_FILE, AdaptiveRouter
 
 # Load environment variables
 load_dotenv()
@@ -26,6 +55,9 @@ logger = logging.getLogger(__name__)
 # Suppress verbose logging from httpx
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
+# Cache provider name and response provider of merged fan-out results
+FAN_OUT = "fan_out"
+
 
 def configure_logging(level: int = logging.WARNING, quiet: bool = False) -> None:
     """Configure logging for multi-search-api.
@@ -48,8 +80,16 @@ class SmartSearchTool:
     Features:
     - Multi-provider fallback (SearXNG → Serper → Brave → DuckDuckGo → Google Scraper)
     - Automatic rate limit detection (HTTP 402/429)
-    - Session-based provider skipping when rate limited
+    - Circuit breakers that pause rate-limited providers and probe them before resuming
     - 1-day result caching for performance
+    - Short-lived negative caching of queries no provider has results for
+    - Per-query-class TTLs with optional stale-while-revalidate
+    - Optional near-duplicate query matching against the cache
+    - Optional hedged requests to the next provider when one is slow
+    - Fan-out searches that merge the results of several providers
+    - Batch searches scheduled across providers within per-provider limits
+    - Concurrent identical searches share one provider walk (single-flight)
+    - Optional adaptive provider ordering from live latency and success rates
 
     Provider Priority:
     1. SearXNG - Free, unlimited (preferred when self-hosted via SEARXNG_INSTANCE)
@@ -68,7 +108,21 @@ class SmartSearchTool:
         brave_api_key: str | None = None,
         searxng_instance: str | None = None,
         enable_cache: bool = True,
+        cache: CacheBackend | None = None,
         cache_file: str | None = None,
+        cache_preload: bool = True,
+        cache_write_behind: bool = False,
+        cache_ttl_policy: TTLPolicy | None = None,
+        query_normalizer: QueryNormalizer | None = None,
+        cache_fetch_results: int | None = None,
+        cache_codec: str = "json",
+        cache_snapshot: str | None = None,
+        cache_similarity: float | None = None,
+        hedging: HedgingPolicy | float | None = None,
+        single_flight: bool = True,
+        adaptive_routing: AdaptiveRouter | bool = False,
+        circuit_breakers: CircuitBreakers | None = None,
+        rate_scheduler: RateScheduler | None = None,
         log_level: int | None = None,
         quiet: bool = False,
     ):
@@ -80,7 +134,51 @@ class SmartSearchTool:
             brave_api_key: Brave Search API key (optional)
             searxng_instance: Custom SearXNG instance URL (optional)
             enable_cache: Enable result caching (default: True)
-            cache_file: Custom cache file path (optional)
+            cache: Cache to use instead of creating a SearchResultCache, e.g. a
+                   two-tier cache shared between workers; the cache_* options
+                   below are then ignored
+            cache_file: Custom cache file path (optional). Files ending in .db,
+                        .sqlite or .sqlite3 are stored in SQLite instead of JSON,
+                        .jsonl files in an indexed append-only file
+            cache_preload: Load the whole cache at startup (default: True). Set to
+                           False to read entries on demand, which keeps startup
+                           fast for large indexed or SQLite caches
+            cache_write_behind: Persist cache writes from a background thread so
+                                searches never wait on disk I/O (default: False)
+            cache_ttl_policy: Per-query-class TTLs and stale-while-revalidate window
+                              (default: 1 day, 1 hour for time_range="recent")
+            query_normalizer: How queries are canonicalized before cache lookups
+                              (default: Unicode, case, whitespace and punctuation folding)
+            cache_fetch_results: On a cache miss, fetch at least this many results
+                                 from providers and cache them all, so later requests
+                                 for more results are served from the cache too
+                                 (default: fetch only what was asked for)
+            cache_codec: "json" or "compact" (compressed entries and packed
+                         in-memory results for large caches, default: "json")
+            cache_snapshot: Snapshot file (see SearchResultCache.export_snapshot())
+                            to warm the cache from at startup, if it exists
+            cache_similarity: Serve cached results for near-duplicate queries that
+                              share at least this fraction of their words, e.g. 0.8
+                              (default: exact matches only)
+            hedging: Start the next provider in parallel when the current one
+                     has not answered after this many seconds, or after the
+                     delay a HedgingPolicy derives from observed latencies
+                     (default: one provider at a time)
+            single_flight: Let concurrent searches for the same query wait for
+                           the one already calling providers instead of calling
+                           them again (default: True)
+            adaptive_routing: Order providers (and SearXNG instances) by their
+                              recent latency, success and empty-result rates.
+                              True uses an AdaptiveRouter that persists its
+                              statistics in ~/.cache/multi-search-api (default:
+                              the fixed priority order)
+            circuit_breakers: Pauses rate-limited providers, for their
+                              Retry-After or a growing backoff, then probes
+                              them with a single request (default: 60 seconds
+                              after a first rate limit, up to 1 hour)
+            rate_scheduler: Paces requests to providers with a request rate
+                            limit (Brave, DuckDuckGo); share one between tools
+                            that use the same API keys (default: one per tool)
             log_level: Logging level (e.g., logging.DEBUG, logging.INFO).
                        Default: WARNING (only warnings and errors shown)
             quiet: If True, suppress all logging output
@@ -89,14 +187,47 @@ class SmartSearchTool:
         if quiet or log_level is not None:
             configure_logging(level=log_level or logging.WARNING, quiet=quiet)
         # Initialize cache only
-        self.cache = SearchResultCache(cache_file=cache_file) if enable_cache else None
+        self.query_normalizer = query_normalizer or QueryNormalizer()
+        self.cache: CacheBackend | None = cache
+        if self.cache is None and enable_cache:
+            self.cache = SearchResultCache(
+                cache_file=cache_file,
+                preload=cache_preload,
+                write_behind=cache_write_behind,
+                ttl_policy=cache_ttl_policy,
+                normalizer=self.query_normalizer,
+                codec=cache_codec,
+                snapshot=cache_snapshot,
+                similarity=cache_similarity,
+            )
 
-        # Track rate-limited providers for current session
-        self.rate_limited_providers = set()
+        self.cache_fetch_results = cache_fetch_results
+
+        if isinstance(hedging, int | float):
+            hedging = HedgingPolicy(delay=hedging)
+        self.hedging: HedgingPolicy | None = hedging
+        self._provider_executor: ThreadPoolExecutor | None = None
+
+        # Provider walks in progress per request key, for single-flight coalescing.
+        # Blocking and async searches are coalesced separately, so a blocking
+        # search on the event loop thread never waits for a task on that loop.
+        self.single_flight = single_flight
+        self._flights: dict[str, Future] = {}
+        self._async_flights: dict[str, Future] = {}
+        self._flight_lock = threading.Lock()
+        self._flight_stats = {"searches": 0, "coalesced": 0}
+
+        # Pause rate-limited providers until their cooldown is over
+        self.circuit_breakers = circuit_breakers or CircuitBreakers()
 
         # Track warnings that have already been shown (to avoid spam)
         self._seen_warnings: set[str] = set()
 
+        # Queries whose stale cached results are being refreshed in the background
+        self._revalidating: set[str] = set()
+        self._revalidate_lock = threading.Lock()
+        self._background_tasks: set[asyncio.Task] = set()
+
         # Initialize providers in priority order
         self.providers = []
 
@@ -125,6 +256,19 @@ class SmartSearchTool:
         # if ollama_api_key or os.getenv("OLLAMA_API_KEY"):
         #     self.providers.append(OllamaProvider(ollama_api_key or os.getenv("OLLAMA_API_KEY")))
 
+        # Providers declare their rate limits to one scheduler, so the fallback
+        # loop can see which of them may be sent a request right away
+        self.rate_scheduler = rate_scheduler or RateScheduler()
+        for provider in self.providers:
+            provider.attach_scheduler(self.rate_scheduler)
+
+        if adaptive_routing is True:
+            adaptive_routing = AdaptiveRouter(state_file=DEFAULT_STATE_FILE)
+        self.router: AdaptiveRouter | None = adaptive_routing or None
+        for provider in self.providers:
+            if isinstance(provider, SearXNGProvider):
+                provider.router = self.router
+
         logger.info(f"Smart Search Tool initialized with {len(self.providers)} providers")
 
     def _log_warning_once(self, message: str):
@@ -155,7 +299,7 @@ class SmartSearchTool:
 
         try:
             # Use existing search method
-            search_results = self.search(
+            search_results = await self.asearch(
                 query=query,
                 max_results=max_results,
                 language=language,
@@ -197,12 +341,20 @@ class SmartSearchTool:
             logger.error(f"Error in search_recent_content: {e}")
             return []
 
-    def search(self, query: str, **kwargs) -> dict[str, Any]:
+    def search(self, query: str, timeout: float | None = None, **kwargs) -> dict[str, Any]:
         """
         Execute search with automatic fallback and caching.
 
+        Blocking version of asearch(); both share the cache and provider logic
+        and differ only in how providers are called.
+
+        With a timeout, each provider gets the time that is left as its HTTP
+        timeout and as the longest it may wait for its rate limit, and no
+        provider is started once the time is up.
+
         Args:
             query: Search query string
+            timeout: Seconds the search may take (default: no limit)
             **kwargs: Additional arguments:
                 - num_results: Number of results to return (default: 10)
                 - language: Language filter (default: "nl")
@@ -212,92 +364,1241 @@ class SmartSearchTool:
                 - query: The search query
                 - provider: Provider used (or "cached")
                 - cache_hit: Whether result came from cache
+                - negative_cache_hit: Whether the cache recorded that no provider
+                  had results for this query (results is then empty)
+                - stale: Whether cached results are past their TTL; they are
+                  refreshed in the background for subsequent searches
+                - approximate: Whether cached results were served for a similar,
+                  not the same, query
                 - timestamp: ISO timestamp
                 - results: List of search results
+                - deadline_exceeded: Whether the timeout ran out before a
+                  provider had results (results is then empty)
         """
-        results = []
-        used_provider = None
-        cache_hit = False
+        deadline_at = self._deadline_at(timeout)
+        upstream_kwargs = self._upstream_kwargs(kwargs)
+        lookup = self._lookup_cache(query, **kwargs)
+        if lookup is not None:
+            if lookup.stale:
+                # Serve the stale results now and refresh them for the next caller
+                self._revalidate_in_background(query, **upstream_kwargs)
+            return self._build_response(query, lookup.results, "cached", lookup)
 
-        # Try cache first if enabled (query-based, provider-agnostic)
-        if self.cache:
-            cached_results = self.cache.get_cached_results(query, "any", **kwargs)
-
-            if cached_results is not None and len(cached_results) > 0:
-                results = cached_results
-                used_provider = "cached"
-                cache_hit = True
-                logger.info(f"Cache hit for query '{query}': {len(results)} results")
-
-        # If no cache hit, search with providers
-        if not cache_hit:
-            for provider in self.providers:
-                provider_name = provider.__class__.__name__
-
-                # Skip rate-limited providers
-                if provider_name in self.rate_limited_providers:
-                    logger.info(f"⏭️  Skipping {provider_name} (rate limited during this session)")
+        results, used_provider, deadline_exceeded = self._single_flight(
+            query, self._search_providers, deadline_at=deadline_at, **upstream_kwargs
+        )
+        if upstream_kwargs is not kwargs:
+            results = results[: kwargs.get("num_results", DEFAULT_NUM_RESULTS)]
+        return self._build_response(
+            query, results, used_provider, deadline_exceeded=deadline_exceeded
+        )
+
+    async def asearch(self, query: str, timeout: float | None = None, **kwargs) -> dict[str, Any]:
+        """
+        Execute search with automatic fallback and caching, without blocking the event loop.
+
+        Providers are called through their async search implementations and
+        rate limit pauses use asyncio.sleep, so other tasks keep running while
+        a search is in flight. Stale cached results are refreshed in a
+        background task.
+
+        Args:
+            query: Search query string
+            timeout: Seconds the search may take, see search() (default: no limit)
+            **kwargs: Additional arguments, see search()
+
+        Returns:
+            Dictionary as returned by search()
+        """
+        deadline_at = self._deadline_at(timeout)
+        upstream_kwargs = self._upstream_kwargs(kwargs)
+        lookup = self._lookup_cache(query, **kwargs)
+        if lookup is not None:
+            if lookup.stale:
+                self._arevalidate_in_background(query, **upstream_kwargs)
+            return self._build_response(query, lookup.results, "cached", lookup)
+
+        results, used_provider, deadline_exceeded = await self._asingle_flight(
+            query, self._asearch_providers, deadline_at=deadline_at, **upstream_kwargs
+        )
+        if upstream_kwargs is not kwargs:
+            results = results[: kwargs.get("num_results", DEFAULT_NUM_RESULTS)]
+        return self._build_response(
+            query, results, used_provider, deadline_exceeded=deadline_exceeded
+        )
+
+    def search_fan_out(
+        self,
+        query: str,
+        deadline: float = 5.0,
+        max_providers: int | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """
+        Search several providers concurrently and merge their results.
+
+        For breadth rather than the first answer: all usable providers (or the
+        first max_providers in priority order) are queried at once, and the
+        results that arrive before the deadline are merged with reciprocal
+        rank fusion and deduplicated by URL (see fuse_results()). Each merged
+        result records in ``ranks`` which providers returned it and where.
+        Providers that miss the deadline are dropped; the search only comes
+        back empty if none of the others had results.
+
+        Merged results are cached separately from search() results, with the
+        same TTLs and stale-while-revalidate behaviour.
+
+        Args:
+            query: Search query string
+            deadline: Seconds to wait for providers (default: 5)
+            max_providers: Query at most this many providers (default: all)
+            **kwargs: Additional arguments, see search()
+
+        Returns:
+            Dictionary as returned by search(), with provider "fan_out" (or
+            "cached") and:
+                - providers: Providers whose results were merged
+                - timed_out: Providers dropped because they missed the deadline
+        """
+        fan_out_options = {"deadline": deadline, "max_providers": max_providers}
+        upstream_kwargs = self._upstream_kwargs(kwargs)
+        lookup = self._lookup_cache(query, FAN_OUT, **kwargs)
+        if lookup is not None:
+            if lookup.stale:
+                self._revalidate_in_background(
+                    query, self._fan_out_providers, **fan_out_options, **upstream_kwargs
+                )
+            return self._build_fan_out_response(query, lookup.results, lookup=lookup)
+
+        results, providers, timed_out = self._fan_out_providers(
+            query, **fan_out_options, **upstream_kwargs
+        )
+        if upstream_kwargs is not kwargs:
+            results = results[: kwargs.get("num_results", DEFAULT_NUM_RESULTS)]
+        return self._build_fan_out_response(query, results, providers, timed_out)
+
+    async def asearch_fan_out(
+        self,
+        query: str,
+        deadline: float = 5.0,
+        max_providers: int | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """
+        Async version of search_fan_out(); providers that miss the deadline are cancelled.
+
+        Args:
+            query: Search query string
+            deadline: Seconds to wait for providers (default: 5)
+            max_providers: Query at most this many providers (default: all)
+            **kwargs: Additional arguments, see search()
+
+        Returns:
+            Dictionary as returned by search_fan_out()
+        """
+        fan_out_options = {"deadline": deadline, "max_providers": max_providers}
+        upstream_kwargs = self._upstream_kwargs(kwargs)
+        lookup = self._lookup_cache(query, FAN_OUT, **kwargs)
+        if lookup is not None:
+            if lookup.stale:
+                self._arevalidate_in_background(
+                    query, self._afan_out_providers, **fan_out_options, **upstream_kwargs
+                )
+            return self._build_fan_out_response(query, lookup.results, lookup=lookup)
+
+        results, providers, timed_out = await self._afan_out_providers(
+            query, **fan_out_options, **upstream_kwargs
+        )
+        if upstream_kwargs is not kwargs:
+            results = results[: kwargs.get("num_results", DEFAULT_NUM_RESULTS)]
+        return self._build_fan_out_response(query, results, providers, timed_out)
+
+    def search_many(
+        self,
+        queries: Iterable[str],
+        provider_limits: dict[str, ProviderLimit] | None = None,
+        **kwargs,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Search many queries concurrently, yielding responses as they complete.
+
+        Queries that are the same after normalization are searched once, and
+        the cache is checked for all of them in one bulk lookup before any
+        provider is called; cache hits are yielded first. The misses are
+        scheduled across the providers: each query goes to the first provider,
+        in priority order, that has a free slot and rate budget (see
+        ProviderLimit), so throughput approaches the sum of the providers'
+        rates. A query that fails or comes back empty is retried on its next
+        provider. Stale cache hits are refreshed within the same budgets.
+
+        Args:
+            queries: Queries to search
+            provider_limits: Provider class name -> ProviderLimit, overriding
+                             DEFAULT_PROVIDER_LIMITS
+            **kwargs: Search arguments for every query, see search()
+
+        Yields:
+            One response per distinct input query, as returned by search(), with:
+                - status: "cached", "found", "no_results" (the providers answered
+                  but had nothing) or "failed" (every provider raised an error
+                  or none was available)
+                - error: The last provider error, if status is "failed"
+        """
+        upstream_kwargs = self._upstream_kwargs(kwargs)
+        limit = kwargs.get("num_results", DEFAULT_NUM_RESULTS)
+        limit = limit if upstream_kwargs is not kwargs else None
+        pending, responses = self._plan_batch(queries, **kwargs)
+        yield from responses
+        budgets = self._batch_budgets(provider_limits)
+        executor = ThreadPoolExecutor(
+            max_workers=max(sum(budget.limit.concurrency for budget in budgets.values()), 1),
+            thread_name_prefix="search-batch",
+        )
+        in_flight: dict[Future, tuple[BatchItem, str, float]] = {}
+
+        try:
+            while pending or in_flight:
+                schedule = schedule_batch(pending, budgets, self.circuit_breakers.allow)
+                for item in schedule.exhausted:
+                    yield from self._finish_batch_item(item, limit, **upstream_kwargs)
+                for item, provider in schedule.launches:
+                    future = executor.submit(provider.search, item.query, **upstream_kwargs)
+                    in_flight[future] = (item, provider.__class__.__name__, time.perf_counter())
+                if not in_flight:
+                    if pending:
+                        time.sleep(schedule.retry_in or 0)
                     continue
 
-                if provider.is_available():
-                    logger.info(f"Trying search with {provider_name}")
+                done, _ = wait(in_flight, timeout=schedule.retry_in, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item, provider_name, started = in_flight.pop(future)
+                    budgets[provider_name].release()
                     try:
-                        results = provider.search(query, **kwargs)
+                        results = future.result()
+                    except Exception as e:
+                        results = e
+                    yield from self._settle_batch_request(
+                        item, provider_name, results, started, pending, limit, **upstream_kwargs
+                    )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
-                        if results:
-                            used_provider = provider_name
-                            query_display = query[:50] + "..." if len(query) > 50 else query
-                            logger.info(
-                                f"🔍 {query_display} → {len(results)} results ({provider_name})"
-                            )
+    async def asearch_many(
+        self,
+        queries: Iterable[str],
+        provider_limits: dict[str, ProviderLimit] | None = None,
+        **kwargs,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Async version of search_many(); providers are called as tasks on the event loop.
 
-                            # Cache the results if caching is enabled (only cache non-empty)
-                            # Cache under generic "any" provider so any provider can retrieve it
-                            if self.cache and len(results) > 0:
-                                self.cache.cache_results(query, "any", results, **kwargs)
+        Args:
+            queries: Queries to search
+            provider_limits: Provider class name -> ProviderLimit, overriding
+                             DEFAULT_PROVIDER_LIMITS
+            **kwargs: Search arguments for every query, see search()
 
-                            break
-                        else:
-                            self._log_warning_once(
-                                f"⏭️  {provider_name} returned no results, trying next provider"
-                            )
-                    except RateLimitError as e:
-                        # Mark provider as rate-limited for rest of session
-                        self.rate_limited_providers.add(provider_name)
-                        self._log_warning_once(
-                            f"⚠️  {provider_name} rate limited, skipping for rest of session: {e}"
-                        )
-                        # Continue to next provider
-                        continue
+        Yields:
+            Responses as yielded by search_many()
+        """
+        upstream_kwargs = self._upstream_kwargs(kwargs)
+        limit = kwargs.get("num_results", DEFAULT_NUM_RESULTS)
+        limit = limit if upstream_kwargs is not kwargs else None
+        pending, responses = self._plan_batch(queries, **kwargs)
+        for response in responses:
+            yield response
+        budgets = self._batch_budgets(provider_limits)
+        in_flight: dict[asyncio.Task, tuple[BatchItem, str, float]] = {}
+
+        try:
+            while pending or in_flight:
+                schedule = schedule_batch(pending, budgets, self.circuit_breakers.allow)
+                for item in schedule.exhausted:
+                    for response in self._finish_batch_item(item, limit, **upstream_kwargs):
+                        yield response
+                for item, provider in schedule.launches:
+                    task = asyncio.create_task(provider.asearch(item.query, **upstream_kwargs))
+                    in_flight[task] = (item, provider.__class__.__name__, time.perf_counter())
+                if not in_flight:
+                    if pending:
+                        await asyncio.sleep(schedule.retry_in or 0)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    in_flight, timeout=schedule.retry_in, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    item, provider_name, started = in_flight.pop(task)
+                    budgets[provider_name].release()
+                    try:
+                        results = task.result()
                     except Exception as e:
-                        # Other errors - log and try next provider
-                        self._log_warning_once(
-                            f"⏭️  {provider_name} failed: {e}, trying next provider"
-                        )
-                        continue
-                else:
-                    logger.info(f"⏭️  {provider_name} not available, trying next provider")
+                        results = e
+                    for response in self._settle_batch_request(
+                        item, provider_name, results, started, pending, limit, **upstream_kwargs
+                    ):
+                        yield response
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def _upstream_kwargs(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Search arguments for providers on a cache miss.
+
+        Fetches the configured "max useful" count upstream so the cached entry
+        can also serve larger requests; callers still get what they asked for.
+        Returns ``kwargs`` itself if nothing changes.
+        """
+        num_results = kwargs.get("num_results", DEFAULT_NUM_RESULTS)
+        if self.cache and self.cache_fetch_results and self.cache_fetch_results > num_results:
+            return {**kwargs, "num_results": self.cache_fetch_results}
+        return kwargs
+
+    def _single_flight(
+        self, query: str, walk: Callable[..., tuple], **kwargs
+    ) -> tuple[list[dict[str, Any]], str | None, bool]:
+        """Run a provider walk, or wait for an identical one already running.
+
+        Searches are identical if they have the same request key (normalized
+        query and search arguments) and ask providers for as many results. The
+        first caller runs the walk; callers arriving while it runs get a copy
+        of its results, or give up waiting at their own ``deadline_at``. A
+        caller with time left when the walk ended at the leader's (shorter)
+        deadline runs its own walk.
+        """
+        if not self.single_flight:
+            return walk(query, **kwargs)
+        key, flight, leader = self._join_flight(self._flights, query, **kwargs)
+        if not leader:
+            deadline_at = kwargs.get("deadline_at")
+            try:
+                results, provider, deadline_exceeded = flight.result(
+                    timeout=self._time_left(deadline_at)
+                )
+            except FutureTimeoutError:
+                return [], None, True
+            if deadline_exceeded and not self._deadline_passed(deadline_at):
+                logger.info(f"Search for '{query}' ran out of the first caller's time, retrying")
+                return walk(query, **kwargs)
+            return [dict(result) for result in results], provider, deadline_exceeded
+        try:
+            outcome = walk(query, **kwargs)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(outcome)
+            return outcome
+        finally:
+            self._leave_flight(self._flights, key)
+
+    async def _asingle_flight(
+        self, query: str, walk: Callable[..., Any], **kwargs
+    ) -> tuple[list[dict[str, Any]], str | None, bool]:
+        """Async version of _single_flight()."""
+        if not self.single_flight:
+            return await walk(query, **kwargs)
+        key, flight, leader = self._join_flight(self._async_flights, query, **kwargs)
+        if not leader:
+            deadline_at = kwargs.get("deadline_at")
+            try:
+                # Shielded so a waiter that is cancelled or times out leaves the shared walk running
+                results, provider, deadline_exceeded = await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(flight)), self._time_left(deadline_at)
+                )
+            except asyncio.TimeoutError:
+                return [], None, True
+            if deadline_exceeded and not self._deadline_passed(deadline_at):
+                logger.info(f"Search for '{query}' ran out of the first caller's time, retrying")
+                return await walk(query, **kwargs)
+            return [dict(result) for result in results], provider, deadline_exceeded
+        try:
+            outcome = await walk(query, **kwargs)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(outcome)
+            return outcome
+        finally:
+            self._leave_flight(self._async_flights, key)
+
+    def _join_flight(
+        self, flights: dict[str, Future], query: str, **kwargs
+    ) -> tuple[str, Future, bool]:
+        """Request key and flight of a search, and whether the caller leads it (runs the walk)."""
+        # The cache key leaves out the result count, but a walk for fewer results cannot serve more
+        num_results = kwargs.get("num_results", DEFAULT_NUM_RESULTS)
+        key = f"{self._request_key(query, **kwargs)}:{num_results}"
+        with self._flight_lock:
+            flight = flights.get(key)
+            if flight is not None:
+                self._flight_stats["coalesced"] += 1
+                logger.info(f"Waiting for the search in progress for '{query}'")
+                return key, flight, False
+            flight = flights[key] = Future()
+            self._flight_stats["searches"] += 1
+            return key, flight, True
+
+    def _leave_flight(self, flights: dict[str, Future], key: str):
+        with self._flight_lock:
+            flights.pop(key, None)
+
+    def _request_key(self, query: str, **kwargs) -> str:
+        """Cache key of a search, shared by all queries that normalize alike."""
+        return build_cache_key(self.query_normalizer.normalize(query), "any", **kwargs)
+
+    def _lookup_cache(self, query: str, provider: str = "any", **kwargs) -> CacheLookup | None:
+        """Cache hit that answers the search, or None to search the providers.
+
+        The cache is query-based and provider-agnostic: search() results are
+        cached under "any", merged fan-out results under "fan_out".
+        """
+        if not self.cache:
+            return None
+        lookup = self.cache.lookup(query, provider, **kwargs)
+        if lookup is None or not (lookup.results or lookup.negative):
+            return None
+        if lookup.negative:
+            logger.info(f"Negative cache hit for query '{query}': skipping providers")
+        else:
+            logger.info(f"Cache hit for query '{query}': {len(lookup.results)} results")
+        return lookup
 
-        # Format response
+    @staticmethod
+    def _build_response(
+        query: str,
+        results: list[dict[str, Any]],
+        provider: str | None,
+        lookup: CacheLookup | None = None,
+        deadline_exceeded: bool = False,
+    ) -> dict[str, Any]:
+        """Format a search response, see search()."""
         return {
             "query": query,
-            "provider": used_provider,
+            "provider": provider,
             "results": results,
-            "cache_hit": cache_hit,
+            "cache_hit": lookup is not None,
+            "negative_cache_hit": lookup is not None and lookup.negative,
+            "stale": lookup is not None and lookup.stale,
+            "approximate": lookup is not None and lookup.approximate,
+            "deadline_exceeded": deadline_exceeded,
             "timestamp": datetime.now().isoformat(),
         }
 
+    @classmethod
+    def _build_fan_out_response(
+        cls,
+        query: str,
+        results: list[dict[str, Any]],
+        providers: list[str] | None = None,
+        timed_out: list[str] | None = None,
+        lookup: CacheLookup | None = None,
+    ) -> dict[str, Any]:
+        """Format a fan-out search response, see search_fan_out()."""
+        provider = FAN_OUT if lookup is None else "cached"
+        # Every provider missing the deadline is the fan-out's deadline running out
+        deadline_exceeded = not results and bool(timed_out)
+        response = cls._build_response(query, results, provider, lookup, deadline_exceeded)
+        if providers is None:
+            # Cached merged results still carry the providers they came from
+            providers = list(dict.fromkeys(name for r in results for name in r.get("ranks", ())))
+        response["providers"] = providers
+        response["timed_out"] = timed_out or []
+        return response
+
+    def _plan_batch(
+        self, queries: Iterable[str], **kwargs
+    ) -> tuple[deque[BatchItem], list[dict[str, Any]]]:
+        """Group a batch's queries by cache key and answer what the cache can.
+
+        Returns:
+            Tuple of (queries to search, in input order; responses for cache hits)
+        """
+        groups: dict[str, list[str]] = {}
+        for query in dict.fromkeys(queries):
+            groups.setdefault(self._request_key(query, **kwargs), []).append(query)
+        inputs = list(groups.values())
+        lookups: list[CacheLookup | None] = [None] * len(inputs)
+        if self.cache:
+            lookups = self.cache.lookup_many([group[0] for group in inputs], "any", **kwargs)
+
+        providers = list(self._usable_providers(claim=False))
+        pending: deque[BatchItem] = deque()
+        responses = []
+        for group, lookup in zip(inputs, lookups, strict=True):
+            item = BatchItem(query=group[0], inputs=group, remaining=list(providers))
+            if lookup is None or not (lookup.results or lookup.negative):
+                pending.append(item)
+                continue
+            responses.extend(self._batch_responses(item, lookup.results, "cached", lookup=lookup))
+            if lookup.stale:
+                item.refresh = True
+                pending.append(item)
+        logger.info(
+            f"Batch of {len(inputs)} distinct queries: {len(responses)} answered from cache, "
+            f"{sum(not item.refresh for item in pending)} to search"
+        )
+        return pending, responses
+
+    def _batch_budgets(
+        self, provider_limits: dict[str, ProviderLimit] | None
+    ) -> dict[str, ProviderBudget]:
+        """A fresh budget per provider for one batch."""
+        limits = {**DEFAULT_PROVIDER_LIMITS, **(provider_limits or {})}
+        budgets = {}
+        for provider in self.providers:
+            provider_name = provider.__class__.__name__
+            budgets[provider_name] = ProviderBudget(limits.get(provider_name, ProviderLimit()))
+        return budgets
+
+    def _settle_batch_request(
+        self,
+        item: BatchItem,
+        provider_name: str,
+        outcome: list[dict[str, Any]] | Exception,
+        started: float,
+        pending: deque[BatchItem],
+        limit: int | None,
+        **kwargs,
+    ) -> list[dict[str, Any]]:
+        """Handle a finished batch request: cache its results, or queue the next provider.
+
+        Returns:
+            Responses to yield
+        """
+        elapsed = time.perf_counter() - started
+        if isinstance(outcome, Exception):
+            self._handle_provider_error(provider_name, outcome, elapsed)
+            item.error = outcome
+        else:
+            item.answered += 1
+            if self._accept_results(item.query, provider_name, outcome, elapsed, **kwargs):
+                if item.refresh:
+                    return []
+                return self._batch_responses(item, outcome, provider_name, limit=limit)
+        # Try the query's next provider as soon as one has capacity
+        pending.appendleft(item)
+        return []
+
+    def _finish_batch_item(
+        self, item: BatchItem, limit: int | None, **kwargs
+    ) -> list[dict[str, Any]]:
+        """Responses for a batch query no provider had results for."""
+        self._finish_provider_walk(item.query, item.answered, not item.refresh, **kwargs)
+        if item.refresh:
+            return []
+        return self._batch_responses(item, [], None, limit=limit)
+
+    def _batch_responses(
+        self,
+        item: BatchItem,
+        results: list[dict[str, Any]],
+        provider: str | None,
+        lookup: CacheLookup | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """One response per input query a batch item answers, see search_many()."""
+        if limit is not None:
+            results = results[:limit]
+        if lookup is not None:
+            status = "cached"
+        elif results:
+            status = "found"
+        else:
+            status = "no_results" if item.answered else "failed"
+        responses = []
+        for query in item.inputs:
+            response = self._build_response(query, results, provider, lookup)
+            response["status"] = status
+            if status == "failed" and item.error is not None:
+                response["error"] = str(item.error)
+            responses.append(response)
+        return responses
+
+    def _search_providers(
+        self,
+        query: str,
+        cache_negative: bool = True,
+        deadline_at: float | None = None,
+        **kwargs,
+    ) -> tuple[list[dict[str, Any]], str | None, bool]:
+        """Walk the provider chain until one returns results, and cache the outcome.
+
+        Args:
+            query: Search query string
+            cache_negative: Cache an empty outcome as a negative entry
+            deadline_at: time.monotonic() by which the walk must end (default: none)
+            **kwargs: Search arguments passed to the providers
+
+        Returns:
+            Tuple of (results, name of the provider that returned them, whether
+            the deadline ended the walk)
+        """
+        if self.hedging:
+            return self._search_providers_hedged(query, cache_negative, deadline_at, **kwargs)
+
+        results = []
+        providers_answered = 0
+        deadline_exceeded = False
+
+        for provider, delay in self._scheduled_providers():
+            provider_name = provider.__class__.__name__
+            time_left = self._time_left(deadline_at)
+            if time_left is not None and delay >= time_left:
+                deadline_exceeded = True
+                logger.info(f"⏱️  Out of time, not trying {provider_name} and later providers")
+                break
+            if delay > 0:
+                time.sleep(delay)
+            started = time.perf_counter()
+            try:
+                results = provider.search(query, **self._with_time_left(kwargs, deadline_at))
+                elapsed = time.perf_counter() - started
+                providers_answered += 1
+            except Exception as e:
+                if deadline_at is not None and self._ran_out_of_time(provider_name, e):
+                    deadline_exceeded = True
+                else:
+                    self._handle_provider_error(provider_name, e, time.perf_counter() - started)
+                continue
+            if self._accept_results(query, provider_name, results, elapsed, **kwargs):
+                return results, provider_name, False
+
+        deadline_exceeded = deadline_exceeded or self._deadline_passed(deadline_at)
+        self._finish_provider_walk(
+            query, providers_answered, cache_negative and not deadline_exceeded, **kwargs
+        )
+        return [], None, deadline_exceeded
+
+    async def _asearch_providers(
+        self,
+        query: str,
+        cache_negative: bool = True,
+        deadline_at: float | None = None,
+        **kwargs,
+    ) -> tuple[list[dict[str, Any]], str | None, bool]:
+        """Async version of _search_providers(); a provider running at the deadline is cancelled."""
+        if self.hedging:
+            return await self._asearch_providers_hedged(
+                query, cache_negative, deadline_at, **kwargs
+            )
+
+        results = []
+        providers_answered = 0
+        deadline_exceeded = False
+
+        for provider, delay in self._scheduled_providers():
+            provider_name = provider.__class__.__name__
+            time_left = self._time_left(deadline_at)
+            if time_left is not None and delay >= time_left:
+                deadline_exceeded = True
+                logger.info(f"⏱️  Out of time, not trying {provider_name} and later providers")
+                break
+            if delay > 0:
+                await asyncio.sleep(delay)
+            started = time.perf_counter()
+            try:
+                results = await asyncio.wait_for(
+                    provider.asearch(query, **self._with_time_left(kwargs, deadline_at)),
+                    self._time_left(deadline_at),
+                )
+                elapsed = time.perf_counter() - started
+                providers_answered += 1
+            except Exception as e:
+                if deadline_at is not None and self._ran_out_of_time(provider_name, e):
+                    deadline_exceeded = True
+                else:
+                    self._handle_provider_error(provider_name, e, time.perf_counter() - started)
+                continue
+            if self._accept_results(query, provider_name, results, elapsed, **kwargs):
+                return results, provider_name, False
+
+        deadline_exceeded = deadline_exceeded or self._deadline_passed(deadline_at)
+        self._finish_provider_walk(
+            query, providers_answered, cache_negative and not deadline_exceeded, **kwargs
+        )
+        return [], None, deadline_exceeded
+
+    def _search_providers_hedged(
+        self,
+        query: str,
+        cache_negative: bool = True,
+        deadline_at: float | None = None,
+        **kwargs,
+    ) -> tuple[list[dict[str, Any]], str | None, bool]:
+        """Walk the provider chain, starting the next provider early when one is slow.
+
+        Providers are called from a thread pool. When the most recently started
+        provider has not answered within the hedging delay, or any provider
+        fails or comes back empty, the next usable provider is started
+        alongside the ones still running. The first non-empty answer wins;
+        providers that have not started yet are cancelled and the answers of
+        those still running are discarded, as they are at the deadline.
+        """
+        hedging = self.hedging
+        executor = self._get_provider_executor()
+        # Providers that must wait for their rate limit pace themselves in the worker
+        providers = (provider for provider, _ in self._scheduled_providers())
+        in_flight: dict[Future, tuple[str, float]] = {}
+        providers_tried = 0
+        providers_answered = 0
+        start_next_at = 0.0
+        exhausted = False
+        deadline_exceeded = False
+
+        try:
+            while True:
+                time_left = self._time_left(deadline_at)
+                if time_left is not None and time_left <= 0:
+                    deadline_exceeded = True
+                    break
+                now = time.perf_counter()
+                if not exhausted and (not in_flight or now >= start_next_at):
+                    provider = next(providers, None)
+                    if provider is None:
+                        exhausted = True
+                    else:
+                        provider_name = provider.__class__.__name__
+                        if in_flight:
+                            self._log_hedge(provider_name, in_flight.values())
+                        future = executor.submit(
+                            provider.search, query, **self._with_time_left(kwargs, deadline_at)
+                        )
+                        in_flight[future] = (provider_name, now)
+                        providers_tried += 1
+                        start_next_at = now + hedging.delay_for(provider_name)
+                        continue
+                if not in_flight:
+                    break
+
+                timeout = None if exhausted else max(start_next_at - now, 0)
+                if time_left is not None:
+                    timeout = time_left if timeout is None else min(timeout, time_left)
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    provider_name, started = in_flight.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        elapsed = time.perf_counter() - started
+                        if deadline_at is not None and self._ran_out_of_time(provider_name, e):
+                            deadline_exceeded = True
+                        else:
+                            self._handle_provider_error(provider_name, e, elapsed)
+                        start_next_at = 0.0
+                        continue
+                    elapsed = time.perf_counter() - started
+                    providers_answered += 1
+                    hedging.record_latency(provider_name, elapsed)
+                    if self._accept_results(query, provider_name, results, elapsed, **kwargs):
+                        hedging.record_outcome(provider_name, hedged=providers_tried > 1)
+                        return results, provider_name, False
+                    start_next_at = 0.0
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+        hedging.record_outcome(None, hedged=providers_tried > 1)
+        self._finish_provider_walk(
+            query, providers_answered, cache_negative and not deadline_exceeded, **kwargs
+        )
+        return [], None, deadline_exceeded
+
+    async def _asearch_providers_hedged(
+        self,
+        query: str,
+        cache_negative: bool = True,
+        deadline_at: float | None = None,
+        **kwargs,
+    ) -> tuple[list[dict[str, Any]], str | None, bool]:
+        """Async version of _search_providers_hedged().
+
+        Providers run as tasks on the event loop, and the losers are cancelled
+        as soon as one provider returns results.
+        """
+        hedging = self.hedging
+        providers = (provider for provider, _ in self._scheduled_providers())
+        in_flight: dict[asyncio.Task, tuple[str, float]] = {}
+        providers_tried = 0
+        providers_answered = 0
+        start_next_at = 0.0
+        exhausted = False
+        deadline_exceeded = False
+
+        try:
+            while True:
+                time_left = self._time_left(deadline_at)
+                if time_left is not None and time_left <= 0:
+                    deadline_exceeded = True
+                    break
+                now = time.perf_counter()
+                if not exhausted and (not in_flight or now >= start_next_at):
+                    provider = next(providers, None)
+                    if provider is None:
+                        exhausted = True
+                    else:
+                        provider_name = provider.__class__.__name__
+                        if in_flight:
+                            self._log_hedge(provider_name, in_flight.values())
+                        task = asyncio.create_task(
+                            provider.asearch(query, **self._with_time_left(kwargs, deadline_at))
+                        )
+                        in_flight[task] = (provider_name, now)
+                        providers_tried += 1
+                        start_next_at = now + hedging.delay_for(provider_name)
+                        continue
+                if not in_flight:
+                    break
+
+                timeout = None if exhausted else max(start_next_at - now, 0)
+                if time_left is not None:
+                    timeout = time_left if timeout is None else min(timeout, time_left)
+                done, _ = await asyncio.wait(
+                    in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    provider_name, started = in_flight.pop(task)
+                    try:
+                        results = task.result()
+                    except Exception as e:
+                        elapsed = time.perf_counter() - started
+                        if deadline_at is not None and self._ran_out_of_time(provider_name, e):
+                            deadline_exceeded = True
+                        else:
+                            self._handle_provider_error(provider_name, e, elapsed)
+                        start_next_at = 0.0
+                        continue
+                    elapsed = time.perf_counter() - started
+                    providers_answered += 1
+                    hedging.record_latency(provider_name, elapsed)
+                    if self._accept_results(query, provider_name, results, elapsed, **kwargs):
+                        hedging.record_outcome(provider_name, hedged=providers_tried > 1)
+                        return results, provider_name, False
+                    start_next_at = 0.0
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        hedging.record_outcome(None, hedged=providers_tried > 1)
+        self._finish_provider_walk(
+            query, providers_answered, cache_negative and not deadline_exceeded, **kwargs
+        )
+        return [], None, deadline_exceeded
+
+    def _fan_out_providers(
+        self,
+        query: str,
+        deadline: float,
+        max_providers: int | None = None,
+        cache_negative: bool = True,
+        **kwargs,
+    ) -> tuple[list[dict[str, Any]], list[str], list[str]]:
+        """Query providers concurrently, merge what arrives before the deadline and cache it.
+
+        Providers are called from a thread pool. Calls still running at the
+        deadline cannot be interrupted; they finish in the background and
+        their answers are discarded.
+
+        Returns:
+            Tuple of (merged results, providers that had results, providers
+            that missed the deadline)
+        """
+        executor = self._get_provider_executor()
+        started = time.perf_counter()
+        # The deadline is also the providers' own timeout, so late calls end soon after it
+        provider_kwargs = {**kwargs, "timeout": deadline}
+        futures = {
+            executor.submit(provider.search, query, **provider_kwargs): provider.__class__.__name__
+            for provider in islice(self._usable_providers(), max_providers)
+        }
+        done, pending = wait(futures, timeout=deadline)
+        for future in pending:
+            future.cancel()
+
+        answers = {}
+        timed_out = [futures[future] for future in futures if future in pending]
+        for future, provider_name in futures.items():
+            if future in done:
+                try:
+                    answers[provider_name] = future.result()
+                except Exception as e:
+                    if self._ran_out_of_time(provider_name, e):
+                        timed_out.append(provider_name)
+                    else:
+                        self._handle_provider_error(provider_name, e)
+        return self._merge_fan_out(
+            query,
+            answers,
+            timed_out,
+            time.perf_counter() - started,
+            cache_negative,
+            **kwargs,
+        )
+
+    async def _afan_out_providers(
+        self,
+        query: str,
+        deadline: float,
+        max_providers: int | None = None,
+        cache_negative: bool = True,
+        **kwargs,
+    ) -> tuple[list[dict[str, Any]], list[str], list[str]]:
+        """Async version of _fan_out_providers(); providers missing the deadline are cancelled."""
+        started = time.perf_counter()
+        provider_kwargs = {**kwargs, "timeout": deadline}
+        tasks = {
+            asyncio.create_task(provider.asearch(query, **provider_kwargs)): (
+                provider.__class__.__name__
+            )
+            for provider in islice(self._usable_providers(), max_providers)
+        }
+        done, pending = set(), set()
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        answers = {}
+        timed_out = [tasks[task] for task in tasks if task in pending]
+        for task, provider_name in tasks.items():
+            if task in done:
+                try:
+                    answers[provider_name] = task.result()
+                except Exception as e:
+                    if self._ran_out_of_time(provider_name, e):
+                        timed_out.append(provider_name)
+                    else:
+                        self._handle_provider_error(provider_name, e)
+        return self._merge_fan_out(
+            query,
+            answers,
+            timed_out,
+            time.perf_counter() - started,
+            cache_negative,
+            **kwargs,
+        )
+
+    def _merge_fan_out(
+        self,
+        query: str,
+        answers: dict[str, list[dict[str, Any]]],
+        timed_out: list[str],
+        elapsed: float,
+        cache_negative: bool,
+        **kwargs,
+    ) -> tuple[list[dict[str, Any]], list[str], list[str]]:
+        """Fuse the providers' answers and cache the outcome, see _fan_out_providers()."""
+        if timed_out:
+            logger.info(f"⏱️  Dropped {', '.join(timed_out)}: no answer before the deadline")
+        for provider_name, provider_results in answers.items():
+            self._record_route(provider_name, None, provider_results)
+        answered = {name: results for name, results in answers.items() if results}
+        results = fuse_results(answered, limit=kwargs.get("num_results", DEFAULT_NUM_RESULTS))
+        if results:
+            query_display = query[:50] + "..." if len(query) > 50 else query
+            logger.info(
+                f"🔍 {query_display} → {len(results)} merged results ({', '.join(answered)})"
+            )
+            if self.cache:
+                self.cache.cache_results(
+                    query, FAN_OUT, results, origin=FAN_OUT, fetch_seconds=elapsed, **kwargs
+                )
+        elif not timed_out:
+            # Only a walk where every provider answered proves there are no results
+            self._finish_provider_walk(
+                query, len(answers), cache_negative, provider=FAN_OUT, **kwargs
+            )
+        return results, list(answered), timed_out
+
+    def _get_provider_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for concurrent provider calls, created on first use."""
+        with self._revalidate_lock:
+            if self._provider_executor is None:
+                self._provider_executor = ThreadPoolExecutor(
+                    max_workers=max(4, 2 * len(self.providers)),
+                    thread_name_prefix="search-provider",
+                )
+            return self._provider_executor
+
+    @staticmethod
+    def _deadline_at(timeout: float | None) -> float | None:
+        """time.monotonic() at which a search with this timeout must end."""
+        return None if timeout is None else time.monotonic() + timeout
+
+    @staticmethod
+    def _time_left(deadline_at: float | None) -> float | None:
+        """Seconds until the deadline, None without one."""
+        return None if deadline_at is None else deadline_at - time.monotonic()
+
+    @staticmethod
+    def _deadline_passed(deadline_at: float | None) -> bool:
+        return deadline_at is not None and time.monotonic() >= deadline_at
+
+    @classmethod
+    def _with_time_left(cls, kwargs: dict[str, Any], deadline_at: float | None) -> dict[str, Any]:
+        """Provider arguments with the time left as ``timeout``, the provider's budget."""
+        if deadline_at is None:
+            return kwargs
+        return {**kwargs, "timeout": cls._time_left(deadline_at)}
+
+    @staticmethod
+    def _log_hedge(provider_name: str, running: Any):
+        waiting_for = ", ".join(name for name, _ in running)
+        logger.info(f"⏱️  {waiting_for} slow to answer, also trying {provider_name}")
+
+    def _usable_providers(self, claim: bool = True) -> Iterator[SearchProvider]:
+        """Yield providers in priority order, skipping rate-limited and unavailable ones.
+
+        With adaptive routing the order comes from the router, which may also
+        skip providers that keep failing.
+
+        Args:
+            claim: Claim the probe request of a half-open circuit breaker for
+                   each yielded provider; False only checks whether one could
+                   be claimed, for callers that admit requests themselves
+        """
+        ready = self.circuit_breakers.allow if claim else self.circuit_breakers.ready
+        for provider in self._routed_providers():
+            provider_name = provider.__class__.__name__
+
+            if not provider.is_available():
+                logger.info(f"⏭️  {provider_name} not available, trying next provider")
+                continue
+
+            # Skip rate-limited providers until their circuit breaker lets a request through
+            if not ready(provider_name):
+                retry_in = self.circuit_breakers.retry_in(provider_name)
+                logger.info(f"⏭️  Skipping {provider_name} (rate limited, retry in {retry_in:.0f}s)")
+                continue
+
+            logger.info(f"Trying search with {provider_name}")
+            yield provider
+
+    def _scheduled_providers(self) -> Iterator[tuple[SearchProvider, float]]:
+        """Yield usable providers with the seconds their rate limit still asks to wait.
+
+        Providers the rate scheduler lets go now come first, in priority
+        order. Those that would have to wait are deferred until every ready
+        provider has been tried, then yielded soonest first, so a search only
+        waits when no provider is ready.
+        """
+        scheduler = self.rate_scheduler
+        deferred = []
+        for provider in self._usable_providers():
+            provider_name = provider.__class__.__name__
+            delay = scheduler.delay(provider_name)
+            if delay > 0:
+                logger.info(f"⏭️  {provider_name} paced for {delay:.1f}s, trying others first")
+                deferred.append(provider)
+                continue
+            yield provider, 0.0
+
+        while deferred:
+            delays = [scheduler.delay(provider.__class__.__name__) for provider in deferred]
+            soonest = delays.index(min(delays))
+            yield deferred.pop(soonest), delays[soonest]
+
+    def _routed_providers(self) -> list[SearchProvider]:
+        """Providers in the order to try them: configured, or chosen by the router."""
+        if self.router is None:
+            return self.providers
+        by_name = {provider.__class__.__name__: provider for provider in self.providers}
+        order = self.router.order(list(by_name))
+        skipped = [name for name in by_name if name not in order]
+        if skipped:
+            logger.info(f"⏭️  Adaptive routing skips {', '.join(skipped)} (failing recently)")
+        return [by_name[name] for name in order]
+
+    def _accept_results(
+        self,
+        query: str,
+        provider_name: str,
+        results: list[dict[str, Any]],
+        elapsed: float,
+        **kwargs,
+    ) -> bool:
+        """Cache a provider's results if it returned any.
+
+        Returns:
+            True if the provider returned results and the walk can stop
+        """
+        self._record_route(provider_name, elapsed, results)
+        self.circuit_breakers.record_success(provider_name)
+        if not results:
+            self._log_warning_once(f"⏭️  {provider_name} returned no results, trying next provider")
+            return False
+
+        query_display = query[:50] + "..." if len(query) > 50 else query
+        logger.info(f"🔍 {query_display} → {len(results)} results ({provider_name})")
+
+        # Cache the results if caching is enabled (only cache non-empty)
+        # Cache under generic "any" provider so any provider can retrieve it
+        if self.cache:
+            self.cache.cache_results(
+                query,
+                "any",
+                results,
+                origin=provider_name,
+                fetch_seconds=elapsed,
+                **kwargs,
+            )
+        return True
+
+    def _handle_provider_error(
+        self, provider_name: str, error: Exception, elapsed: float | None = None
+    ):
+        """Log a failed provider call and pause rate-limited providers."""
+        self._record_route(provider_name, elapsed, None)
+        # Opens the provider's circuit breaker on a rate limit, or reopens it
+        # when its probe request failed
+        self.circuit_breakers.record_failure(provider_name, error)
+        if isinstance(error, RateLimitError):
+            self._log_warning_once(f"⚠️  {provider_name} rate limited, trying next provider")
+        else:
+            # Other errors - log and try next provider
+            self._log_warning_once(f"⏭️  {provider_name} failed: {error}, trying next provider")
+
+    @staticmethod
+    def _ran_out_of_time(provider_name: str, error: Exception) -> bool:
+        """Whether a provider call that raised ``error`` under a deadline merely ran out of time.
+
+        Such calls say nothing about the provider, so they are neither
+        reported to the router nor to the circuit breakers.
+        """
+        if not isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+            return False
+        logger.info(f"⏱️  {provider_name} ran out of time: {error}")
+        return True
+
+    def _record_route(
+        self, provider_name: str, elapsed: float | None, results: list[dict[str, Any]] | None
+    ):
+        """Report a provider call to the adaptive router; ``results`` is None for an error."""
+        if self.router is not None:
+            self.router.record(
+                provider_name, elapsed, success=results is not None, empty=not results
+            )
+
+    def _finish_provider_walk(
+        self,
+        query: str,
+        providers_answered: int,
+        cache_negative: bool,
+        provider: str = "any",
+        **kwargs,
+    ):
+        """Remember that every provider came up empty so repeats skip the walk.
+
+        Only a walk where at least one provider answered (without an error)
+        proves there are no results; a walk where every provider failed is
+        not cached, so the query is retried once the providers recover.
+        """
+        if providers_answered and self.cache and cache_negative:
+            self.cache.cache_negative_result(query, provider, **kwargs)
+
+    def _claim_revalidation(self, query: str, walk: Callable, **kwargs) -> str | None:
+        """Register a background refresh, or return None if one is already running."""
+        refresh_key = f"{walk.__name__}|{query}|{sorted(kwargs.items())}"
+        with self._revalidate_lock:
+            if refresh_key in self._revalidating:
+                return None
+            self._revalidating.add(refresh_key)
+        return refresh_key
+
+    def _release_revalidation(self, refresh_key: str):
+        with self._revalidate_lock:
+            self._revalidating.discard(refresh_key)
+
+    def _revalidate_in_background(
+        self, query: str, walk: Callable[..., Any] | None = None, **kwargs
+    ):
+        """Refresh stale cached results for a query in a background thread.
+
+        At most one refresh per query and search arguments runs at a time. A
+        refresh that finds nothing keeps the stale results rather than replacing
+        them with a negative entry.
+
+        Args:
+            query: Search query string
+            walk: Provider walk that refreshes the cache (default: _search_providers)
+            **kwargs: Arguments for the walk
+        """
+        walk = walk or self._search_providers
+        refresh_key = self._claim_revalidation(query, walk, **kwargs)
+        if refresh_key is None:
+            return
+
+        def revalidate():
+            try:
+                walk(query, cache_negative=False, **kwargs)
+            except Exception as e:
+                logger.warning(f"Background refresh failed for query '{query}': {e}")
+            finally:
+                self._release_revalidation(refresh_key)
+
+        threading.Thread(target=revalidate, name="search-revalidate", daemon=True).start()
+
+    def _arevalidate_in_background(
+        self, query: str, walk: Callable[..., Any] | None = None, **kwargs
+    ):
+        """Refresh stale cached results for a query in a background task.
+
+        Same as _revalidate_in_background(), on the running event loop, with
+        an async walk (default: _asearch_providers).
+        """
+        walk = walk or self._asearch_providers
+        refresh_key = self._claim_revalidation(query, walk, **kwargs)
+        if refresh_key is None:
+            return
+
+        async def revalidate():
+            try:
+                await walk(query, cache_negative=False, **kwargs)
+            except Exception as e:
+                logger.warning(f"Background refresh failed for query '{query}': {e}")
+            finally:
+                self._release_revalidation(refresh_key)
+
+        task = asyncio.create_task(revalidate())
+        # Keep a reference so the task is not garbage collected while it runs
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     def get_status(self) -> dict[str, Any]:
         """Get status of all providers and cache."""
         status: dict[str, Any] = {
             "providers": [p.__class__.__name__ for p in self.providers],
-            "rate_limited_providers": list(self.rate_limited_providers),
+            "rate_limited_providers": list(self.circuit_breakers),
+            "circuit_breakers": self.circuit_breakers.get_stats(),
         }
 
         # Add cache statistics if caching is enabled
         if self.cache:
             status["cache"] = self.cache.get_cache_stats()
 
+        if self.hedging:
+            status["hedging"] = self.hedging.get_stats()
+
+        status["pacing"] = self.rate_scheduler.get_stats()
+
+        if self.router is not None:
+            provider_names = [provider.__class__.__name__ for provider in self.providers]
+            status["routing"] = {
+                "order": self.router.order(provider_names, explore=False),
+                "routes": self.router.get_stats(),
+            }
+
+        with self._flight_lock:
+            status["single_flight"] = {
+                **self._flight_stats,
+                "in_progress": len(self._flights) + len(self._async_flights),
+            }
+
         return status
 
     def clear_cache(self):
@@ -308,9 +1609,17 @@ class SmartSearchTool:
         else:
             logger.info("Caching not enabled")
 
+    @property
+    def rate_limited_providers(self) -> CircuitBreakers:
+        """Providers whose circuit breaker is open or half-open, as a set of names.
+
+        Adding a name opens that provider's breaker, removing it closes it.
+        """
+        return self.circuit_breakers
+
     def reset_rate_limits(self):
-        """Reset rate limit tracking (useful for new sessions)."""
-        self.rate_limited_providers.clear()
+        """Close all circuit breakers, making rate-limited providers usable again."""
+        self.circuit_breakers.reset()
         logger.info("Rate limit tracking reset")
 
     def disable_cache(self):
@@ -2,6 +2,13 @@
 
 
 class RateLimitError(Exception):
-    """Raised when a provider hits rate limits."""
+    """Raised when a provider hits rate limits.
 
-    pass
+    Attributes:
+        retry_after: Seconds the provider asked us to wait (from a Retry-After
+                     header, or the provider's own backoff), None if unknown
+    """
+
+    def __init__(self, message: str = "", retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,66 @@
+"""Merging result lists from several providers into one ranking."""
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from multi_search_api.cache.results import canonical_url
+
+# Rank offset from the original reciprocal rank fusion paper; dampens the
+# advantage of a first place in one list over good places in several lists
+RRF_K = 60
+
+
+def fuse_results(
+    ranked_lists: Mapping[str, Sequence[dict[str, Any]]],
+    k: int = RRF_K,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """Merge ranked result lists with reciprocal rank fusion.
+
+    Results are deduplicated by canonical URL (see canonical_url()). Each
+    unique URL scores the sum of ``1 / (k + rank)`` over the lists it appears
+    in, so results several providers agree on rise to the top. The merged
+    result is a copy of the best-ranked occurrence with two extra fields:
+
+    - ``ranks``: provider name -> 1-based rank in that provider's list
+    - ``fusion_score``: the reciprocal rank fusion score
+
+    Args:
+        ranked_lists: Provider name -> its results, best first. Ties are
+                      broken in the mapping's order
+        k: Rank offset (default: 60)
+        limit: Return at most this many results (default: all)
+
+    Returns:
+        Merged results, best first
+    """
+    merged: dict[str, dict[str, Any]] = {}
+    # canonical URL -> (score, best rank, order of first appearance)
+    scores: dict[str, list] = {}
+    for provider_name, results in ranked_lists.items():
+        for rank, result in enumerate(results, 1):
+            url = canonical_url(str(result.get("link", "")))
+            if not url:
+                continue
+            fused = merged.get(url)
+            if fused is None:
+                fused = merged[url] = {**result, "ranks": {}}
+                scores[url] = [0.0, rank, len(scores)]
+            elif rank < scores[url][1]:
+                merged[url] = fused = {**result, "ranks": fused["ranks"]}
+                scores[url][1] = rank
+            if provider_name in fused["ranks"]:
+                # The same URL twice in one list only counts at its best rank
+                continue
+            fused["ranks"][provider_name] = rank
+            scores[url][0] += 1 / (k + rank)
+
+    order = sorted(merged, key=lambda url: (-scores[url][0], scores[url][1], scores[url][2]))
+    if limit is not None:
+        order = order[:limit]
+    fused_results = []
+    for url in order:
+        fused = merged[url]
+        fused["fusion_score"] = round(scores[url][0], 6)
+        fused_results.append(fused)
+    return fused_results
@@ -0,0 +1,111 @@
+"""Hedged requests: when to send a search to the next provider early."""
+
+import math
+import threading
+from collections import deque
+from typing import Any
+
+
+class HedgingPolicy:
+    """Decides how long to wait for a provider before also asking the next one.
+
+    A provider that is slow but does not fail would otherwise hold up the whole
+    fallback chain until its timeout. With hedging, SmartSearchTool starts the
+    next available provider once the current one has been running for
+    ``delay_for(provider)`` seconds, and uses whichever returns results first.
+
+    The delay is either fixed, or the given percentile (p90 by default) of the
+    provider's recently observed latencies: a provider is only hedged when it
+    is slower than it usually is, which bounds the extra upstream requests to
+    roughly 1 - percentile of searches.
+
+    The policy also keeps the latency samples and hedging outcomes, so one
+    instance should not be shared between unrelated tools. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        delay: float | None = None,
+        percentile: float = 0.9,
+        default_delay: float = 1.0,
+        min_delay: float = 0.05,
+        max_delay: float = 10.0,
+        min_samples: int = 10,
+        window: int = 100,
+    ):
+        """Initialize the policy.
+
+        Args:
+            delay: Fixed hedging delay in seconds; None derives it from observed
+                   latencies (default: None)
+            percentile: Latency percentile to hedge after, between 0 and 1
+                        (default: 0.9)
+            default_delay: Delay for providers with fewer than min_samples
+                           observed latencies (default: 1 second)
+            min_delay: Lower bound for a derived delay (default: 0.05 seconds)
+            max_delay: Upper bound for a derived delay (default: 10 seconds)
+            min_samples: Latencies needed before the percentile is used (default: 10)
+            window: Number of recent latencies kept per provider (default: 100)
+        """
+        if delay is not None and delay < 0:
+            raise ValueError("delay must not be negative")
+        if not 0 < percentile <= 1:
+            raise ValueError("percentile must be between 0 and 1")
+        self.delay = delay
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.window = window
+        self._lock = threading.Lock()
+        self._latencies: dict[str, deque[float]] = {}
+        self._hedged_searches = 0
+        self._wins: dict[str, int] = {}
+
+    def record_latency(self, provider_name: str, seconds: float):
+        """Record how long a provider took to answer."""
+        with self._lock:
+            samples = self._latencies.get(provider_name)
+            if samples is None:
+                samples = self._latencies[provider_name] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def observed_latency(self, provider_name: str, percentile: float) -> float | None:
+        """Percentile of a provider's recent latencies, or None without samples."""
+        with self._lock:
+            samples = sorted(self._latencies.get(provider_name, ()))
+        if not samples:
+            return None
+        return samples[max(math.ceil(percentile * len(samples)) - 1, 0)]
+
+    def delay_for(self, provider_name: str) -> float:
+        """Seconds to wait for a provider before starting the next one."""
+        if self.delay is not None:
+            return self.delay
+        with self._lock:
+            enough = len(self._latencies.get(provider_name, ())) >= self.min_samples
+        if not enough:
+            return self.default_delay
+        observed = self.observed_latency(provider_name, self.percentile)
+        return min(max(observed, self.min_delay), self.max_delay)
+
+    def record_outcome(self, winner: str | None, hedged: bool):
+        """Record the provider that answered a search, and whether it was hedged."""
+        if not hedged:
+            return
+        with self._lock:
+            self._hedged_searches += 1
+            if winner is not None:
+                self._wins[winner] = self._wins.get(winner, 0) + 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hedged searches, winners of hedged searches and current delays per provider."""
+        with self._lock:
+            providers = list(self._latencies)
+            stats: dict[str, Any] = {
+                "hedged_searches": self._hedged_searches,
+                "wins": dict(self._wins),
+            }
+        stats["delays"] = {name: round(self.delay_for(name), 3) for name in providers}
+        return stats
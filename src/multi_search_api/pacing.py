@@ -0,0 +1,123 @@
+"""Token-bucket pacing of requests to rate-limited providers."""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _Bucket:
+    interval: float | Callable[[], float | None] | None
+    burst: int
+    tokens: float
+    updated: float
+
+
+class RateScheduler:
+    """Token buckets that pace requests per provider.
+
+    Providers declare their rate with register(): one request per
+    ``interval`` seconds, with up to ``burst`` requests at once after a quiet
+    period. The interval may be a callable, for providers that slow down
+    after errors (e.g. DuckDuckGo's backoff).
+
+    The scheduler never sleeps itself, so it serves threads and asyncio alike:
+
+    - delay() answers "can this provider go now, and if not, when?" without
+      using up a request, so a caller can try a provider that is ready instead
+    - reserve() books the next request and returns how long to wait for it;
+      concurrent callers queue up behind each other instead of racing
+
+    Unregistered providers are never delayed. Thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+
+    def register(
+        self,
+        provider_name: str,
+        interval: float | Callable[[], float | None] | None,
+        burst: int = 1,
+    ):
+        """Declare a provider's rate limit.
+
+        Args:
+            provider_name: Provider class name
+            interval: Minimum seconds between requests on average, or a callable
+                      returning it (None or 0 for no limit)
+            burst: Requests allowed back to back after a quiet period (default: 1)
+        """
+        with self._lock:
+            bucket = self._buckets.get(provider_name)
+            if bucket is None:
+                self._buckets[provider_name] = _Bucket(interval, burst, burst, time.monotonic())
+            else:
+                # Keep the tokens, so re-registering does not reset the pacing
+                bucket.interval, bucket.burst = interval, burst
+
+    def delay(self, provider_name: str) -> float:
+        """Seconds until the provider may be sent a request (0 if now), without booking it."""
+        with self._lock:
+            bucket = self._buckets.get(provider_name)
+            if bucket is None:
+                return 0.0
+            return self._wait(bucket, self._refill(bucket))
+
+    def reserve(self, provider_name: str, max_wait: float | None = None) -> float | None:
+        """Book the provider's next request.
+
+        Args:
+            provider_name: Provider class name
+            max_wait: Do not book a request that would have to wait longer than
+                      this many seconds (default: any wait)
+
+        Returns:
+            Seconds to wait before sending it (0 to send it now), or None if
+            it would have to wait longer than max_wait
+        """
+        with self._lock:
+            bucket = self._buckets.get(provider_name)
+            if bucket is None:
+                return 0.0
+            interval = self._refill(bucket)
+            wait = self._wait(bucket, interval)
+            if max_wait is not None and wait > max_wait:
+                return None
+            if interval:
+                bucket.tokens -= 1
+            return wait
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Interval and current delay per registered provider."""
+        with self._lock:
+            stats = {}
+            for name, bucket in self._buckets.items():
+                interval = self._refill(bucket)
+                stats[name] = {
+                    "interval": interval,
+                    "delay": round(self._wait(bucket, interval), 3),
+                }
+            return stats
+
+    @staticmethod
+    def _refill(bucket: _Bucket) -> float | None:
+        """Add the tokens earned since the last update; returns the current interval."""
+        now = time.monotonic()
+        interval = bucket.interval() if callable(bucket.interval) else bucket.interval
+        if interval:
+            bucket.tokens = min(bucket.tokens + (now - bucket.updated) / interval, bucket.burst)
+        else:
+            bucket.tokens = bucket.burst
+        bucket.updated = now
+        return interval
+
+    @staticmethod
+    def _wait(bucket: _Bucket, interval: float | None) -> float:
+        if not interval or bucket.tokens >= 1:
+            return 0.0
+        # Negative tokens are requests booked ahead, each one interval apart
+        return (1 - bucket.tokens) * interval
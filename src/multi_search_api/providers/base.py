@@ -1,12 +1,49 @@
 """Base class for search providers."""
 
+import asyncio
+import logging
+import time
 from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
 from typing import Any
 
+import httpx
+import requests
+
+from multi_search_api.pacing import RateScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def retry_after_seconds(response) -> float | None:
+    """Seconds a requests or httpx response asks to wait in its Retry-After header.
+
+    Accepts both forms of the header: a number of seconds and an HTTP date.
+
+    Returns:
+        Seconds to wait (0 for a date in the past), None without a valid header
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
 
 class SearchProvider(ABC):
     """Abstract base class for search providers."""
 
+    # Paces requests for providers with a request_interval(); see attach_scheduler()
+    scheduler: RateScheduler | None = None
+    # Exceptions raised when an HTTP request times out; see _check_out_of_time()
+    TIMEOUT_ERRORS: tuple[type[Exception], ...] = (requests.Timeout, httpx.TimeoutException)
+
     @abstractmethod
     def search(self, query: str, **kwargs) -> list[dict[str, Any]]:
         """Execute a search query.
@@ -21,9 +58,29 @@ class SearchProvider(ABC):
                 - snippet: Result description/snippet
                 - link: Result URL
                 - source: Provider identifier
+
+        Raises:
+            RateLimitError: When the provider is rate limited
+            TimeoutError: When the search's ``timeout`` ran out before the
+                          provider could answer; this is not a provider failure
         """
         pass
 
+    async def asearch(self, query: str, **kwargs) -> list[dict[str, Any]]:
+        """Execute a search query without blocking the event loop.
+
+        The default runs search() in a worker thread. Providers with a native
+        async HTTP client override this.
+
+        Args:
+            query: The search query string
+            **kwargs: Additional provider-specific arguments
+
+        Returns:
+            List of search results, see search()
+        """
+        return await asyncio.to_thread(self.search, query, **kwargs)
+
     @abstractmethod
     def is_available(self) -> bool:
         """Check if this provider is available.
@@ -32,3 +89,65 @@ class SearchProvider(ABC):
             True if provider can be used, False otherwise
         """
         pass
+
+    @staticmethod
+    def _request_timeout(default: float, **kwargs) -> float:
+        """HTTP timeout: ``default``, or the search's remaining ``timeout`` if that is shorter."""
+        timeout = kwargs.get("timeout")
+        return default if timeout is None else min(default, timeout)
+
+    def _check_out_of_time(self, error: Exception, default: float, **kwargs):
+        """Raise TimeoutError if ``error`` is an HTTP timeout shortened to the search's ``timeout``.
+
+        Called from a provider's error handling, so a request cut short at the
+        deadline is reported as out of time rather than as an empty answer.
+
+        Args:
+            error: Exception raised by the request
+            default: The provider's own HTTP timeout, see _request_timeout()
+            **kwargs: Search arguments, with the search's remaining ``timeout``
+
+        Raises:
+            TimeoutError: If the request timed out before ``default`` seconds
+        """
+        if self._request_timeout(default, **kwargs) < default and isinstance(
+            error, self.TIMEOUT_ERRORS
+        ):
+            raise TimeoutError(f"{self.__class__.__name__} ran out of time: {error}") from error
+
+    def request_interval(self) -> float | None:
+        """Minimum seconds between requests, or None if the provider needs no pacing."""
+        return None
+
+    def attach_scheduler(self, scheduler: RateScheduler):
+        """Pace this provider's requests through a scheduler, e.g. one shared by all providers.
+
+        Args:
+            scheduler: Scheduler to declare request_interval() to
+        """
+        self.scheduler = scheduler
+        scheduler.register(self.__class__.__name__, self.request_interval)
+
+    def _reserve_request_slot(self, timeout: float | None = None) -> float:
+        """Book the next request with the scheduler.
+
+        Args:
+            timeout: Seconds left for the search; a request that would have to
+                     wait longer is not booked (default: no limit)
+
+        Returns:
+            Seconds to wait before sending the request
+
+        Raises:
+            TimeoutError: If the request would have to wait longer than timeout
+        """
+        if self.scheduler is None:
+            return 0.0
+        sleep_time = self.scheduler.reserve(self.__class__.__name__, max_wait=timeout)
+        if sleep_time is None:
+            raise TimeoutError(
+                f"{self.__class__.__name__} rate limit allows no request within {timeout:.1f}s"
+            )
+        if sleep_time > 0:
+            logger.info(f"{self.__class__.__name__} rate limit: sleeping {sleep_time:.2f}s")
+        return sleep_time
@@ -1,13 +1,16 @@
 """Brave Search provider."""
 
+import asyncio
 import logging
 import time
 from typing import Any
 
+import httpx
 import requests
 
 from multi_search_api.exceptions import RateLimitError
-from multi_search_api.providers.base import SearchProvider
+from multi_search_api.pacing import RateScheduler
+from multi_search_api.providers.base import SearchProvider, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -18,55 +21,98 @@ class BraveProvider(SearchProvider):
     def __init__(self, api_key: str | None):
         self.api_key = api_key
         self.base_url = "https://api.search.brave.com/res/v1/web/search"
-        self.last_request_time = 0  # Track last request for rate limiting
+        # Own pacing until SmartSearchTool attaches its shared scheduler
+        self.attach_scheduler(RateScheduler())
 
     def is_available(self) -> bool:
         """Check if Brave is available."""
         return bool(self.api_key)
 
+    def request_interval(self) -> float:
+        """Brave's free tier allows 1 request per second."""
+        return 1.0
+
     def search(self, query: str, **kwargs) -> list[dict[str, Any]]:
-        """Search via Brave Search API (respects 1 req/sec rate limit)."""
+        """Search via Brave Search API (respects 1 req/sec rate limit).
+
+        Raises:
+            RateLimitError: On HTTP 402 or 429
+            TimeoutError: If the rate limit allows no request within ``timeout``
+        """
+        # Enforce 1 request per second rate limit; SmartSearchTool tries other
+        # providers first instead, so this only waits for concurrent searches
+        sleep_time = self._reserve_request_slot(kwargs.get("timeout"))
         try:
-            # Enforce 1 request per second rate limit
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < 1.0:
-                sleep_time = 1.0 - time_since_last
-                logger.info(f"Brave rate limit: sleeping {sleep_time:.2f}s")
+            if sleep_time > 0:
                 time.sleep(sleep_time)
 
-            headers = {"X-Subscription-Token": self.api_key, "Accept": "application/json"}
-
-            params = {"q": query, "count": kwargs.get("num_results", 10)}
-
-            self.last_request_time = time.time()  # Update before request
-            response = requests.get(self.base_url, headers=headers, params=params, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-
-                for item in data.get("web", {}).get("results", []):
-                    results.append(
-                        {
-                            "title": item.get("title", ""),
-                            "snippet": item.get("description", ""),
-                            "link": item.get("url", ""),
-                            "source": "brave",
-                        }
-                    )
+            headers, params = self._build_request(query, **kwargs)
+            response = requests.get(
+                self.base_url,
+                headers=headers,
+                params=params,
+                timeout=self._request_timeout(10, **kwargs),
+            )
+            return self._parse_response(response)
+        except RateLimitError:
+            raise
+        except Exception as e:
+            self._check_out_of_time(e, 10, **kwargs)
+            logger.error(f"Brave search failed: {e}")
+            return []
 
-                logger.info(f"Brave search successful: {len(results)} results")
-                return results
-            elif response.status_code in (402, 429):
-                logger.error(f"Brave API error: {response.status_code}")
-                raise RateLimitError(f"Brave rate limit hit: {response.status_code}")
-            else:
-                logger.error(f"Brave API error: {response.status_code}")
-                return []
+    async def asearch(self, query: str, **kwargs) -> list[dict[str, Any]]:
+        """Search via Brave Search API without blocking the event loop."""
+        sleep_time = self._reserve_request_slot(kwargs.get("timeout"))
+        try:
+            if sleep_time > 0:
+                await asyncio.sleep(sleep_time)
 
+            headers, params = self._build_request(query, **kwargs)
+            async with httpx.AsyncClient(timeout=self._request_timeout(10, **kwargs)) as client:
+                response = await client.get(self.base_url, headers=headers, params=params)
+            return self._parse_response(response)
         except RateLimitError:
             raise
         except Exception as e:
+            self._check_out_of_time(e, 10, **kwargs)
             logger.error(f"Brave search failed: {e}")
             return []
+
+    def _build_request(self, query: str, **kwargs) -> tuple[dict[str, str], dict[str, Any]]:
+        """Headers and query parameters for a search request."""
+        headers = {"X-Subscription-Token": self.api_key, "Accept": "application/json"}
+        params = {"q": query, "count": kwargs.get("num_results", 10)}
+        return headers, params
+
+    def _parse_response(self, response) -> list[dict[str, Any]]:
+        """Turn a requests or httpx response into results.
+
+        Raises:
+            RateLimitError: On HTTP 402 or 429
+        """
+        if response.status_code == 200:
+            data = response.json()
+            results = []
+
+            for item in data.get("web", {}).get("results", []):
+                results.append(
+                    {
+                        "title": item.get("title", ""),
+                        "snippet": item.get("description", ""),
+                        "link": item.get("url", ""),
+                        "source": "brave",
+                    }
+                )
+
+            logger.info(f"Brave search successful: {len(results)} results")
+            return results
+        elif response.status_code in (402, 429):
+            logger.error(f"Brave API error: {response.status_code}")
+            raise RateLimitError(
+                f"Brave rate limit hit: {response.status_code}",
+                retry_after=retry_after_seconds(response),
+            )
+        else:
+            logger.error(f"Brave API error: {response.status_code}")
+            return []
@@ -1,13 +1,15 @@
 """DuckDuckGo Search provider."""
 
+import asyncio
 import logging
 import time
 from typing import Any
 
 from ddgs import DDGS
-from ddgs.exceptions import RatelimitException
+from ddgs.exceptions import RatelimitException, TimeoutException
 
 from multi_search_api.exceptions import RateLimitError
+from multi_search_api.pacing import RateScheduler
 from multi_search_api.providers.base import SearchProvider
 
 logger = logging.getLogger(__name__)
@@ -22,6 +24,8 @@ class DuckDuckGoProvider(SearchProvider):
     - DuckDuckGo typically allows ~20-30 requests per minute
     """
 
+    TIMEOUT_ERRORS = (TimeoutException,)
+
     def __init__(self, min_delay: float = 3.0, max_backoff: float = 60.0):
         """Initialize DuckDuckGo provider.
 
@@ -31,8 +35,9 @@ class DuckDuckGoProvider(SearchProvider):
         """
         self.min_delay = min_delay
         self.max_backoff = max_backoff
-        self.last_request_time = 0.0
         self.consecutive_failures = 0
+        # Own pacing until SmartSearchTool attaches its shared scheduler
+        self.attach_scheduler(RateScheduler())
 
     def is_available(self) -> bool:
         """Check if DuckDuckGo is available."""
@@ -47,15 +52,14 @@ class DuckDuckGoProvider(SearchProvider):
         backoff = self.min_delay * (2**self.consecutive_failures)
         return min(backoff, self.max_backoff)
 
-    def _wait_for_rate_limit(self):
-        """Wait appropriate time before making a request."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        required_delay = self._get_backoff_time()
+    def request_interval(self) -> float:
+        """Seconds between requests: the backoff time after the previous request."""
+        return self._get_backoff_time()
 
-        if time_since_last < required_delay:
-            sleep_time = required_delay - time_since_last
-            logger.info(f"DuckDuckGo rate limit: sleeping {sleep_time:.2f}s")
+    def _wait_for_rate_limit(self, timeout: float | None = None):
+        """Wait appropriate time before making a request (at most timeout seconds)."""
+        sleep_time = self._reserve_request_slot(timeout)
+        if sleep_time > 0:
             time.sleep(sleep_time)
 
     def search(self, query: str, **kwargs) -> list[dict[str, Any]]:
@@ -69,50 +73,84 @@ class DuckDuckGoProvider(SearchProvider):
 
         Returns:
             List of search results
+
+        Raises:
+            RateLimitError: When DuckDuckGo rate limits the request
+            TimeoutError: If the rate limit allows no request within ``timeout``
         """
+        # Apply rate limiting
+        self._wait_for_rate_limit(kwargs.get("timeout"))
         try:
-            # Apply rate limiting
-            self._wait_for_rate_limit()
-
-            num_results = kwargs.get("num_results", 10)
-            region = kwargs.get("region", "wt-wt")  # wt-wt = no specific region
-
-            # Update request time before making request
-            self.last_request_time = time.time()
-
-            # Use DDGS context manager for proper resource cleanup
-            with DDGS() as ddgs:
-                raw_results = list(
-                    ddgs.text(
-                        query,
-                        region=region,
-                        max_results=num_results,
-                    )
-                )
+            return self._parse_results(self._text_search(query, **kwargs))
 
-            # Reset consecutive failures on success
-            self.consecutive_failures = 0
-
-            results = []
-            for item in raw_results:
-                results.append(
-                    {
-                        "title": item.get("title", ""),
-                        "snippet": item.get("body", ""),
-                        "link": item.get("href", ""),
-                        "source": "duckduckgo",
-                    }
-                )
+        except RatelimitException as e:
+            self.consecutive_failures += 1
+            logger.warning(f"DuckDuckGo rate limit hit (attempt {self.consecutive_failures}): {e}")
+            raise RateLimitError(
+                f"DuckDuckGo rate limit: {e}", retry_after=self._get_backoff_time()
+            ) from e
 
-            logger.info(f"DuckDuckGo search successful: {len(results)} results")
-            return results
+        except Exception as e:
+            self._check_out_of_time(e, 5, **kwargs)
+            # Don't increase consecutive_failures for non-rate-limit errors
+            logger.error(f"DuckDuckGo search failed: {e}")
+            return []
+
+    async def asearch(self, query: str, **kwargs) -> list[dict[str, Any]]:
+        """Search via DuckDuckGo without blocking the event loop.
+
+        DDGS has no async API, so the request runs in a worker thread; the
+        rate limit wait happens on the event loop.
+        """
+        sleep_time = self._reserve_request_slot(kwargs.get("timeout"))
+        try:
+            if sleep_time > 0:
+                await asyncio.sleep(sleep_time)
+            raw_results = await asyncio.to_thread(self._text_search, query, **kwargs)
+            return self._parse_results(raw_results)
 
         except RatelimitException as e:
             self.consecutive_failures += 1
             logger.warning(f"DuckDuckGo rate limit hit (attempt {self.consecutive_failures}): {e}")
-            raise RateLimitError(f"DuckDuckGo rate limit: {e}") from e
+            raise RateLimitError(
+                f"DuckDuckGo rate limit: {e}", retry_after=self._get_backoff_time()
+            ) from e
 
         except Exception as e:
-            # Don't increase consecutive_failures for non-rate-limit errors
+            self._check_out_of_time(e, 5, **kwargs)
             logger.error(f"DuckDuckGo search failed: {e}")
             return []
+
+    def _text_search(self, query: str, **kwargs) -> list[dict[str, Any]]:
+        """Run a blocking DDGS text search and return its raw results."""
+        num_results = kwargs.get("num_results", 10)
+        region = kwargs.get("region", "wt-wt")  # wt-wt = no specific region
+
+        # Use DDGS context manager for proper resource cleanup
+        with DDGS(timeout=self._request_timeout(5, **kwargs)) as ddgs:
+            return list(
+                ddgs.text(
+                    query,
+                    region=region,
+                    max_results=num_results,
+                )
+            )
+
+    def _parse_results(self, raw_results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Turn raw DDGS results into results and reset the failure backoff."""
+        # Reset consecutive failures on success
+        self.consecutive_failures = 0
+
+        results = []
+        for item in raw_results:
+            results.append(
+                {
+                    "title": item.get("title", ""),
+                    "snippet": item.get("body", ""),
+                    "link": item.get("href", ""),
+                    "source": "duckduckgo",
+                }
+            )
+
+        logger.info(f"DuckDuckGo search successful: {len(results)} results")
+        return results
@@ -41,77 +41,97 @@ class GoogleScraperProvider(SearchProvider):
     def search(self, query: str, **kwargs) -> list[dict[str, Any]]:
         """Scrape Google search results (last resort)."""
         try:
-            # Use httpx for better async support
             with httpx.Client() as client:
                 response = client.get(
                     "https://www.google.com/search",
                     params={"q": query, "hl": "nl"},
                     headers=self.headers,
-                    timeout=10,
+                    timeout=self._request_timeout(10, **kwargs),
                 )
+            if response.status_code == 200:
+                return self._parse_html(response.text)
 
-                if response.status_code == 200:
-                    doc = JustHTML(response.text)
-                    results = []
-
-                    # Parse search results - try multiple selectors as Google changes them
-                    search_divs = []
-
-                    # Try different selectors Google uses
-                    for selector in ["div.g", "div[data-ved]", ".g", ".tF2Cxc"]:
-                        search_divs = doc.query(selector)
-                        if search_divs:
-                            break
-
-                    if not search_divs:
-                        logger.warning("No search result containers found")
-                        return []
-
-                    for g in search_divs[:5]:  # Only top 5
-                        title_elem = _query_one(g, "h3")
-                        if not title_elem:
-                            # Try alternative selectors for title
-                            title_elem = _query_one(g, "h3, .LC20lb, .DKV0Md")
-
-                        link_elem = _query_one(g, "a")
-                        if not link_elem:
-                            # Try alternative selectors for link
-                            link_elem = _query_one(g, "a[href]")
-
-                        # Try multiple selectors for snippets
-                        snippet_elem = None
-                        for snippet_selector in [".aCOpRe", ".VwiC3b", ".s3v9rd", ".st"]:
-                            snippet_elem = _query_one(g, snippet_selector)
-                            if snippet_elem:
-                                break
-
-                        if title_elem and link_elem:
-                            href = link_elem.attrs.get("href", "")
-                            # Clean up href if it's a Google redirect
-                            if href.startswith("/url?q="):
-                                try:
-                                    from urllib.parse import parse_qs, urlparse
-
-                                    parsed = urlparse(href)
-                                    href = parse_qs(parsed.query).get("q", [href])[0]
-                                except Exception:
-                                    pass  # Keep original href if parsing fails
-
-                            results.append(
-                                {
-                                    "title": title_elem.to_text().strip(),
-                                    "snippet": snippet_elem.to_text().strip()
-                                    if snippet_elem
-                                    else "",
-                                    "link": href,
-                                    "source": "google_scraper",
-                                }
-                            )
-
-                    logger.info(f"Google scraper: {len(results)} results")
-                    return results
+        except Exception as e:
+            self._check_out_of_time(e, 10, **kwargs)
+            logger.error(f"Google scraper failed: {e}")
+
+        return []
+
+    async def asearch(self, query: str, **kwargs) -> list[dict[str, Any]]:
+        """Scrape Google search results without blocking the event loop."""
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(
+                    "https://www.google.com/search",
+                    params={"q": query, "hl": "nl"},
+                    headers=self.headers,
+                    timeout=self._request_timeout(10, **kwargs),
+                )
+            if response.status_code == 200:
+                return self._parse_html(response.text)
 
         except Exception as e:
+            self._check_out_of_time(e, 10, **kwargs)
             logger.error(f"Google scraper failed: {e}")
 
         return []
+
+    def _parse_html(self, html: str) -> list[dict[str, Any]]:
+        """Extract results from a Google results page."""
+        doc = JustHTML(html)
+        results = []
+
+        # Parse search results - try multiple selectors as Google changes them
+        search_divs = []
+
+        # Try different selectors Google uses
+        for selector in ["div.g", "div[data-ved]", ".g", ".tF2Cxc"]:
+            search_divs = doc.query(selector)
+            if search_divs:
+                break
+
+        if not search_divs:
+            logger.warning("No search result containers found")
+            return []
+
+        for g in search_divs[:5]:  # Only top 5
+            title_elem = _query_one(g, "h3")
+            if not title_elem:
+                # Try alternative selectors for title
+                title_elem = _query_one(g, "h3, .LC20lb, .DKV0Md")
+
+            link_elem = _query_one(g, "a")
+            if not link_elem:
+                # Try alternative selectors for link
+                link_elem = _query_one(g, "a[href]")
+
+            # Try multiple selectors for snippets
+            snippet_elem = None
+            for snippet_selector in [".aCOpRe", ".VwiC3b", ".s3v9rd", ".st"]:
+                snippet_elem = _query_one(g, snippet_selector)
+                if snippet_elem:
+                    break
+
+            if title_elem and link_elem:
+                href = link_elem.attrs.get("href", "")
+                # Clean up href if it's a Google redirect
+                if href.startswith("/url?q="):
+                    try:
+                        from urllib.parse import parse_qs, urlparse
+
+                        parsed = urlparse(href)
+                        href = parse_qs(parsed.query).get("q", [href])[0]
+                    except Exception:
+                        pass  # Keep original href if parsing fails
+
+                results.append(
+                    {
+                        "title": title_elem.to_text().strip(),
+                        "snippet": snippet_elem.to_text().strip() if snippet_elem else "",
+                        "link": href,
+                        "source": "google_scraper",
+                    }
+                )
+
+        logger.info(f"Google scraper: {len(results)} results")
+        return results
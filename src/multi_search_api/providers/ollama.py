@@ -3,10 +3,11 @@
 import logging
 from typing import Any
 
+import httpx
 import requests
 
 from multi_search_api.exceptions import RateLimitError
-from multi_search_api.providers.base import SearchProvider
+from multi_search_api.providers.base import SearchProvider, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -25,42 +26,74 @@ class OllamaProvider(SearchProvider):
     def search(self, query: str, **kwargs) -> list[dict[str, Any]]:
         """Search via Ollama Web Search API."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
+            headers, payload = self._build_request(query, **kwargs)
+            response = requests.post(
+                self.base_url,
+                headers=headers,
+                json=payload,
+                timeout=self._request_timeout(15, **kwargs),
+            )
+            return self._parse_response(response)
+        except RateLimitError:
+            raise  # Re-raise rate limit errors
+        except Exception as e:
+            self._check_out_of_time(e, 15, **kwargs)
+            logger.error(f"Ollama search failed: {e}")
+            return []
 
-            payload = {"query": query, "max_results": kwargs.get("num_results", 10)}
+    async def asearch(self, query: str, **kwargs) -> list[dict[str, Any]]:
+        """Search via Ollama Web Search API without blocking the event loop."""
+        try:
+            headers, payload = self._build_request(query, **kwargs)
+            async with httpx.AsyncClient(timeout=self._request_timeout(15, **kwargs)) as client:
+                response = await client.post(self.base_url, headers=headers, json=payload)
+            return self._parse_response(response)
+        except RateLimitError:
+            raise
+        except Exception as e:
+            self._check_out_of_time(e, 15, **kwargs)
+            logger.error(f"Ollama search failed: {e}")
+            return []
 
-            response = requests.post(self.base_url, headers=headers, json=payload, timeout=15)
+    def _build_request(self, query: str, **kwargs) -> tuple[dict[str, str], dict[str, Any]]:
+        """Headers and JSON payload for a search request."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        payload = {"query": query, "max_results": kwargs.get("num_results", 10)}
+        return headers, payload
 
-            if response.status_code == 200:
-                data = response.json()
-                results = []
+    def _parse_response(self, response) -> list[dict[str, Any]]:
+        """Turn a requests or httpx response into results.
 
-                # Parse Ollama search results format
-                for item in data.get("results", []):
-                    results.append(
-                        {
-                            "title": item.get("title", ""),
-                            "snippet": item.get("snippet", "") or item.get("description", ""),
-                            "link": item.get("url", "") or item.get("link", ""),
-                            "source": "ollama",
-                        }
-                    )
+        Raises:
+            RateLimitError: On HTTP 402 or 429
+        """
+        if response.status_code == 200:
+            data = response.json()
+            results = []
 
-                logger.info(f"Ollama search successful: {len(results)} results")
-                return results
-            elif response.status_code in (402, 429):
-                # Rate limit or payment required
-                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
-                raise RateLimitError(f"Ollama rate limit hit: {response.status_code}")
-            else:
-                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
-                return []
+            # Parse Ollama search results format
+            for item in data.get("results", []):
+                results.append(
+                    {
+                        "title": item.get("title", ""),
+                        "snippet": item.get("snippet", "") or item.get("description", ""),
+                        "link": item.get("url", "") or item.get("link", ""),
+                        "source": "ollama",
+                    }
+                )
 
-        except RateLimitError:
-            raise  # Re-raise rate limit errors
-        except Exception as e:
-            logger.error(f"Ollama search failed: {e}")
+            logger.info(f"Ollama search successful: {len(results)} results")
+            return results
+        elif response.status_code in (402, 429):
+            # Rate limit or payment required
+            logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+            raise RateLimitError(
+                f"Ollama rate limit hit: {response.status_code}",
+                retry_after=retry_after_seconds(response),
+            )
+        else:
+            logger.error(f"Ollama API error: {response.status_code} - {response.text}")
             return []
@@ -2,16 +2,20 @@
 
 import json
 import logging
+import math
 import random
 import time
+from collections.abc import Iterator
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+import httpx
 import requests
 
 from multi_search_api.exceptions import RateLimitError
 from multi_search_api.providers.base import SearchProvider
+from multi_search_api.routing import AdaptiveRouter
 
 logger = logging.getLogger(__name__)
 
@@ -179,12 +183,26 @@ class SearXNGProvider(SearchProvider):
     - Tracks rate-limited instances with cooldown period (5 min for 429)
     - Tracks failed/broken instances with shorter cooldown (2 min)
     - Raises RateLimitError when all instances are unavailable
+    - Raises TimeoutError when the search's timeout runs out; the instance
+      that was cut short is not marked as failed
     """
 
     # Cooldown period for rate-limited instances (5 minutes)
     RATE_LIMIT_COOLDOWN = 300
     # Shorter cooldown for failed/broken instances (2 minutes)
     FAILED_INSTANCE_COOLDOWN = 120
+    # HTTP timeout per instance, unless less of the search's timeout is left
+    REQUEST_TIMEOUT = 10.0
+
+    REQUEST_HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/120.0.0.0 Safari/537.36"
+        ),
+        "Accept": "application/json",
+        "Accept-Language": "nl,en;q=0.9",
+    }
 
     def __init__(self, instance_url: str | None = None):
         self.instance_manager = SearXNGInstanceManager()
@@ -202,6 +220,8 @@ class SearXNGProvider(SearchProvider):
         self.failed_instances: dict[str, float] = {}
         # Track warnings that have already been shown (to avoid spam)
         self._seen_warnings: set[str] = set()
+        # Optional AdaptiveRouter that ranks instances; set by SmartSearchTool
+        self.router: AdaptiveRouter | None = None
 
     def _log_warning_once(self, message: str):
         """Log warning once, then debug for subsequent occurrences."""
@@ -261,6 +281,21 @@ class SearXNGProvider(SearchProvider):
             instance_url
         )
 
+    def _unavailable_error(self) -> RateLimitError:
+        """Error for when no instance is available, with when the first one will be again."""
+        now = time.time()
+        waits = [
+            max(
+                self.RATE_LIMIT_COOLDOWN - (now - self.rate_limited_instances.get(url, -math.inf)),
+                self.FAILED_INSTANCE_COOLDOWN - (now - self.failed_instances.get(url, -math.inf)),
+                0.0,
+            )
+            for url in self.instances
+        ]
+        return RateLimitError(
+            "All SearXNG instances are unavailable", retry_after=min(waits, default=None)
+        )
+
     def _get_available_instances(self) -> list[str]:
         """Get list of instances that are not rate-limited or failed."""
         return [url for url in self.instances if self._is_instance_available(url)]
@@ -293,11 +328,88 @@ class SearXNGProvider(SearchProvider):
 
         Raises:
             RateLimitError: When all instances are unavailable (rate-limited or failed)
+            TimeoutError: When the search's ``timeout`` ran out
         """
+        for current_instance, timeout in self._attempt_instances(kwargs.get("timeout")):
+            started = time.perf_counter()
+            try:
+                response = requests.get(
+                    f"{current_instance}/search",
+                    params=self._build_params(query),
+                    timeout=timeout,
+                    headers=self.REQUEST_HEADERS,
+                )
+                results = self._handle_response(
+                    current_instance, response, time.perf_counter() - started
+                )
+                if results is not None:
+                    return results
+            except RateLimitError:
+                # Re-raise RateLimitError
+                raise
+            except Exception as e:
+                self._check_out_of_time(e, self.REQUEST_TIMEOUT, timeout=timeout)
+                # JSON parse errors, connection errors, etc - mark as failed
+                self._handle_instance_error(current_instance, e, time.perf_counter() - started)
+
+        return self._retries_exhausted()
+
+    async def asearch(self, query: str, **kwargs) -> list[dict[str, Any]]:
+        """Search via SearXNG without blocking the event loop.
+
+        Raises:
+            RateLimitError: When all instances are unavailable (rate-limited or failed)
+            TimeoutError: When the search's ``timeout`` ran out
+        """
+        async with httpx.AsyncClient(
+            timeout=self.REQUEST_TIMEOUT, headers=self.REQUEST_HEADERS
+        ) as client:
+            for current_instance, timeout in self._attempt_instances(kwargs.get("timeout")):
+                started = time.perf_counter()
+                try:
+                    response = await client.get(
+                        f"{current_instance}/search",
+                        params=self._build_params(query),
+                        timeout=timeout,
+                    )
+                    results = self._handle_response(
+                        current_instance, response, time.perf_counter() - started
+                    )
+                    if results is not None:
+                        return results
+                except RateLimitError:
+                    raise
+                except Exception as e:
+                    self._check_out_of_time(e, self.REQUEST_TIMEOUT, timeout=timeout)
+                    self._handle_instance_error(current_instance, e, time.perf_counter() - started)
+
+        return self._retries_exhausted()
+
+    def _attempt_instances(self, timeout: float | None = None) -> Iterator[tuple[str, float]]:
+        """Yield the instance to try for each attempt and its HTTP timeout.
+
+        Unavailable instances are skipped. Each attempt may take
+        REQUEST_TIMEOUT seconds, and all attempts together at most ``timeout``
+        seconds.
+
+        Args:
+            timeout: Seconds left for the search (default: no limit)
+
+        Raises:
+            RateLimitError: When all instances are unavailable (rate-limited or failed)
+            TimeoutError: When no time is left for another attempt
+        """
+        budget_end = None if timeout is None else time.monotonic() + timeout
         # Check if any instances are available
         available_instances = self._get_available_instances()
         if not available_instances:
-            raise RateLimitError("All SearXNG instances are unavailable")
+            raise self._unavailable_error()
+
+        if self.router is not None:
+            # Start with the instance that has recently been the quickest to answer
+            routes = [self.instance_route(url) for url in available_instances]
+            best = self.router.order(routes)[0]
+            self.instance_url = best.split("@", 1)[1]
 
         # Try up to 5 instances or all available, whichever is smaller
         max_retries = min(5, len(available_instances))
@@ -307,99 +419,131 @@ class SearXNGProvider(SearchProvider):
             if not self._is_instance_available(self.instance_url):
                 self.rotate_instance()
                 if not self._get_available_instances():
-                    raise RateLimitError("All SearXNG instances are unavailable")
+                    raise self._unavailable_error()
                 continue
 
-            current_instance = self.instance_url
-            try:
-                params = {
-                    "q": query,
-                    "format": "json",
-                    "language": "nl",
-                    "engines": "google,bing,duckduckgo",
-                }
+            attempt_timeout = self.REQUEST_TIMEOUT
+            if budget_end is not None:
+                attempt_timeout = min(attempt_timeout, budget_end - time.monotonic())
+                if attempt_timeout <= 0:
+                    raise TimeoutError("SearXNG: out of time, no more instances tried")
+            yield self.instance_url, attempt_timeout
+
+    @staticmethod
+    def _build_params(query: str) -> dict[str, str]:
+        """Query parameters for a search request."""
+        return {
+            "q": query,
+            "format": "json",
+            "language": "nl",
+            "engines": "google,bing,duckduckgo",
+        }
+
+    @staticmethod
+    def instance_route(instance_url: str) -> str:
+        """AdaptiveRouter route name of an instance."""
+        return f"SearXNGProvider@{instance_url}"
+
+    def _record_instance(
+        self, instance_url: str, elapsed: float | None, results: list[dict[str, Any]] | None
+    ):
+        """Report a request to the router; ``results`` is None for a failed request."""
+        if self.router is not None:
+            self.router.record(
+                self.instance_route(instance_url),
+                elapsed,
+                success=results is not None,
+                empty=not results,
+            )
+
+    def _handle_response(
+        self, current_instance: str, response, elapsed: float | None = None
+    ) -> list[dict[str, Any]] | None:
+        """Turn a requests or httpx response into results, or mark the instance.
+
+        Args:
+            current_instance: Instance the request went to
+            response: Its response
+            elapsed: Seconds the request took, for adaptive routing
+
+        Returns:
+            Results on success, None if the next instance should be tried
 
-                response = requests.get(
-                    f"{current_instance}/search",
-                    params=params,
-                    timeout=10,
-                    headers={
-                        "User-Agent": (
-                            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                            "AppleWebKit/537.36 (KHTML, like Gecko) "
-                            "Chrome/120.0.0.0 Safari/537.36"
-                        ),
-                        "Accept": "application/json",
-                        "Accept-Language": "nl,en;q=0.9",
-                    },
+        Raises:
+            RateLimitError: When all instances are now unavailable
+        """
+        if response.status_code != 200:
+            self._record_instance(current_instance, elapsed, None)
+        if response.status_code == 200:
+            data = response.json()
+            results = []
+
+            for item in data.get("results", [])[:10]:
+                results.append(
+                    {
+                        "title": item.get("title", ""),
+                        "snippet": item.get("content", ""),
+                        "link": item.get("url", ""),
+                        "source": "searxng",
+                    }
                 )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    results = []
-
-                    for item in data.get("results", [])[:10]:
-                        results.append(
-                            {
-                                "title": item.get("title", ""),
-                                "snippet": item.get("content", ""),
-                                "link": item.get("url", ""),
-                                "source": "searxng",
-                            }
-                        )
-
-                    logger.info(f"SearXNG search successful: {len(results)} results")
-                    return results
-                elif response.status_code == 429:
-                    # Rate limited by server IP - check Retry-After header
-                    retry_after = response.headers.get("Retry-After")
-                    if retry_after:
-                        try:
-                            wait_secs = int(retry_after)
-                            logger.info(
-                                f"SearXNG instance {current_instance} requests "
-                                f"Retry-After: {wait_secs}s"
-                            )
-                        except ValueError:
-                            pass
-                    self._mark_instance_rate_limited(current_instance)
-                    self.rotate_instance()
-                    # Check if all instances are now unavailable
-                    if not self._get_available_instances():
-                        raise RateLimitError("All SearXNG instances are unavailable")
-                elif response.status_code == 403:
-                    # 403 may mean JSON format is disabled or bot detection (permanent)
-                    # Treat as a longer-lived failure rather than a short cooldown
-                    logger.debug(
-                        f"SearXNG instance {current_instance} returned 403 "
-                        f"(JSON format may be disabled)"
+            logger.info(f"SearXNG search successful: {len(results)} results")
+            self._record_instance(current_instance, elapsed, results)
+            return results
+        elif response.status_code == 429:
+            # Rate limited by server IP - check Retry-After header
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    wait_secs = int(retry_after)
+                    logger.info(
+                        f"SearXNG instance {current_instance} requests Retry-After: {wait_secs}s"
                     )
-                    self._mark_instance_rate_limited(current_instance)
-                    self.rotate_instance()
-                    if not self._get_available_instances():
-                        raise RateLimitError("All SearXNG instances are unavailable")
-                else:
-                    # Other HTTP errors - mark as failed (shorter cooldown)
-                    logger.warning(
-                        f"SearXNG instance {current_instance} returned {response.status_code}"
-                    )
-                    self._mark_instance_failed(current_instance)
-                    self.rotate_instance()
-
-            except RateLimitError:
-                # Re-raise RateLimitError
-                raise
-            except Exception as e:
-                # JSON parse errors, connection errors, etc - mark as failed
-                logger.warning(f"SearXNG instance {current_instance} failed: {e}")
-                self._mark_instance_failed(current_instance)
-                self.rotate_instance()
+                except ValueError:
+                    pass
+            self._mark_instance_rate_limited(current_instance)
+            self.rotate_instance()
+            # Check if all instances are now unavailable
+            if not self._get_available_instances():
+                raise self._unavailable_error()
+        elif response.status_code == 403:
+            # 403 may mean JSON format is disabled or bot detection (permanent)
+            # Treat as a longer-lived failure rather than a short cooldown
+            logger.debug(
+                f"SearXNG instance {current_instance} returned 403 (JSON format may be disabled)"
+            )
+            self._mark_instance_rate_limited(current_instance)
+            self.rotate_instance()
+            if not self._get_available_instances():
+                raise self._unavailable_error()
+        else:
+            # Other HTTP errors - mark as failed (shorter cooldown)
+            logger.warning(f"SearXNG instance {current_instance} returned {response.status_code}")
+            self._mark_instance_failed(current_instance)
+            self.rotate_instance()
+        return None
+
+    def _handle_instance_error(
+        self, current_instance: str, error: Exception, elapsed: float | None = None
+    ):
+        """Mark an instance that could not be queried as failed and move on."""
+        self._record_instance(current_instance, elapsed, None)
+        logger.warning(f"SearXNG instance {current_instance} failed: {error}")
+        self._mark_instance_failed(current_instance)
+        self.rotate_instance()
+
+    def _retries_exhausted(self) -> list[dict[str, Any]]:
+        """Outcome after every attempt failed.
 
+        Raises:
+            RateLimitError: When no instance is available, to fall back to the next provider
+        """
         # If we exhausted all retries without success, check if we should raise
         # This triggers fallback to next provider
         available = self._get_available_instances()
         if not available:
-            raise RateLimitError("All SearXNG instances are unavailable")
+            raise self._unavailable_error()
 
         # Still have available instances but couldn't get results
         self._log_warning_once("SearXNG: max retries exhausted, falling back to next provider")
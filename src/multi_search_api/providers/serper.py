@@ -3,10 +3,11 @@
 import logging
 from typing import Any
 
+import httpx
 import requests
 
 from multi_search_api.exceptions import RateLimitError
-from multi_search_api.providers.base import SearchProvider
+from multi_search_api.providers.base import SearchProvider, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -25,38 +26,70 @@ class SerperProvider(SearchProvider):
     def search(self, query: str, **kwargs) -> list[dict[str, Any]]:
         """Search via Serper API."""
         try:
-            headers = {"X-API-KEY": self.api_key, "Content-Type": "application/json"}
-
-            payload = {"q": query, "num": kwargs.get("num_results", 10)}
-
-            response = requests.post(self.base_url, headers=headers, json=payload, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                results = []
-
-                # Parse organic results
-                for item in data.get("organic", []):
-                    results.append(
-                        {
-                            "title": item.get("title", ""),
-                            "snippet": item.get("snippet", ""),
-                            "link": item.get("link", ""),
-                            "source": "serper",
-                        }
-                    )
-
-                logger.info(f"Serper search successful: {len(results)} results")
-                return results
-            elif response.status_code in (402, 429):
-                logger.error(f"Serper API error: {response.status_code}")
-                raise RateLimitError(f"Serper rate limit hit: {response.status_code}")
-            else:
-                logger.error(f"Serper API error: {response.status_code}")
-                return []
+            headers, payload = self._build_request(query, **kwargs)
+            response = requests.post(
+                self.base_url,
+                headers=headers,
+                json=payload,
+                timeout=self._request_timeout(10, **kwargs),
+            )
+            return self._parse_response(response)
+        except RateLimitError:
+            raise
+        except Exception as e:
+            self._check_out_of_time(e, 10, **kwargs)
+            logger.error(f"Serper search failed: {e}")
+            return []
 
+    async def asearch(self, query: str, **kwargs) -> list[dict[str, Any]]:
+        """Search via Serper API without blocking the event loop."""
+        try:
+            headers, payload = self._build_request(query, **kwargs)
+            async with httpx.AsyncClient(timeout=self._request_timeout(10, **kwargs)) as client:
+                response = await client.post(self.base_url, headers=headers, json=payload)
+            return self._parse_response(response)
         except RateLimitError:
             raise
         except Exception as e:
+            self._check_out_of_time(e, 10, **kwargs)
             logger.error(f"Serper search failed: {e}")
             return []
+
+    def _build_request(self, query: str, **kwargs) -> tuple[dict[str, str], dict[str, Any]]:
+        """Headers and JSON payload for a search request."""
+        headers = {"X-API-KEY": self.api_key, "Content-Type": "application/json"}
+        payload = {"q": query, "num": kwargs.get("num_results", 10)}
+        return headers, payload
+
+    def _parse_response(self, response) -> list[dict[str, Any]]:
+        """Turn a requests or httpx response into results.
+
+        Raises:
+            RateLimitError: On HTTP 402 or 429
+        """
+        if response.status_code == 200:
+            data = response.json()
+            results = []
+
+            # Parse organic results
+            for item in data.get("organic", []):
+                results.append(
+                    {
+                        "title": item.get("title", ""),
+                        "snippet": item.get("snippet", ""),
+                        "link": item.get("link", ""),
+                        "source": "serper",
+                    }
+                )
+
+            logger.info(f"Serper search successful: {len(results)} results")
+            return results
+        elif response.status_code in (402, 429):
+            logger.error(f"Serper API error: {response.status_code}")
+            raise RateLimitError(
+                f"Serper rate limit hit: {response.status_code}",
+                retry_after=retry_after_seconds(response),
+            )
+        else:
+            logger.error(f"Serper API error: {response.status_code}")
+            return []
@@ -0,0 +1,213 @@
+"""Adaptive provider ordering from observed latency, success and empty-result rates."""
+
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_FILE = Path.home() / ".cache" / "multi-search-api" / "provider_stats.json"
+
+# Assumed for routes without observations: a one second answer, always useful
+_PRIOR = {"latency": 1.0, "success": 1.0, "empty": 0.0, "samples": 0}
+
+
+class AdaptiveRouter:
+    """Orders providers by how quickly they have recently produced useful results.
+
+    For every route (a provider class name, or a provider plus one of its
+    instances such as ``"SearXNGProvider@https://searx.be"``) the router keeps
+    exponentially weighted moving averages of latency, success rate (answers
+    without an error) and empty rate (answers without results). Routes are
+    ordered by their expected time to a useful answer::
+
+        latency / (success_rate * (1 - empty_rate))
+
+    so a provider that is slow for hours, or keeps failing, drops down the
+    fallback chain, and climbs back as its averages recover. Routes whose
+    success rate falls below ``min_success`` are skipped, except when picked
+    for exploration: with probability ``exploration`` an ordering moves a
+    random other route to the front, so demoted routes keep being sampled.
+
+    Constraints pin relative positions regardless of statistics, e.g.
+    ``never_above=[("GoogleScraperProvider", "SerperProvider")]``.
+
+    With a ``state_file`` the averages are saved (at most every
+    ``save_interval`` seconds, and on save()) and loaded at startup, so a
+    restarted process routes on what earlier ones learned. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        exploration: float = 0.05,
+        never_above: Iterable[tuple[str, str]] = (),
+        min_success: float = 0.1,
+        min_samples: int = 5,
+        state_file: str | Path | None = None,
+        save_interval: float = 30.0,
+        seed: int | None = None,
+    ):
+        """Initialize the router.
+
+        Args:
+            alpha: Weight of each new observation in the moving averages,
+                   between 0 and 1 (default: 0.2)
+            exploration: Probability that an ordering tries a random other
+                         route first (default: 0.05)
+            never_above: (route, other) pairs: route is never ordered above
+                         other when both are available
+            min_success: Skip routes whose success rate is below this
+                         (default: 0.1)
+            min_samples: Observations needed before a route can be skipped
+                         (default: 5)
+            state_file: JSON file to persist statistics in (default: none)
+            save_interval: Minimum seconds between automatic saves (default: 30)
+            seed: Seed for exploration, for reproducible orderings
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be between 0 and 1")
+        self.alpha = alpha
+        self.exploration = exploration
+        self.never_above = list(never_above)
+        self.min_success = min_success
+        self.min_samples = min_samples
+        self.state_file = Path(state_file) if state_file is not None else None
+        self.save_interval = save_interval
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, float]] = {}
+        self._last_save = 0.0
+        if self.state_file is not None:
+            self._load()
+
+    def record(self, route: str, latency: float | None, success: bool, empty: bool = False):
+        """Record the outcome of one request.
+
+        Args:
+            route: Provider class name, or "<provider>@<instance>"
+            latency: Seconds the request took; None if unknown
+            success: False if the request raised an error
+            empty: True if it answered without results
+        """
+        alpha = self.alpha
+        with self._lock:
+            stats = self._stats.get(route)
+            if stats is None:
+                stats = self._stats[route] = dict(_PRIOR)
+            if latency is not None:
+                # The first latency replaces the prior instead of averaging with it
+                weight = alpha if stats["samples"] else 1.0
+                stats["latency"] += weight * (latency - stats["latency"])
+            stats["success"] += alpha * (float(success) - stats["success"])
+            if success:
+                stats["empty"] += alpha * (float(empty) - stats["empty"])
+            stats["samples"] += 1
+            stats["updated_at"] = time.time()
+        if self.state_file is not None and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def score(self, route: str) -> float:
+        """Expected seconds to a useful answer; lower is better."""
+        with self._lock:
+            stats = self._stats.get(route, _PRIOR)
+            usefulness = stats["success"] * (1 - stats["empty"])
+            return stats["latency"] / max(usefulness, 0.01)
+
+    def is_skipped(self, route: str) -> bool:
+        """Whether a route fails too often to be tried (outside exploration)."""
+        with self._lock:
+            stats = self._stats.get(route, _PRIOR)
+            return stats["samples"] >= self.min_samples and stats["success"] < self.min_success
+
+    def order(self, routes: list[str], explore: bool = True) -> list[str]:
+        """Order routes best first, leaving out skipped ones.
+
+        Ties keep the given order, so routes without observations stay in
+        their configured priority. At least one route is always returned for
+        a non-empty input.
+
+        Args:
+            routes: Routes in configured priority order
+            explore: Allow an exploration step (default: True)
+        """
+        if not routes:
+            return []
+        position = {route: i for i, route in enumerate(routes)}
+        ordered = sorted(routes, key=lambda route: (self.score(route), position[route]))
+        if explore and len(ordered) > 1 and self._random.random() < self.exploration:
+            explored = self._random.choice(ordered[1:])
+            logger.debug(f"Adaptive routing: exploring {explored}")
+            ordered.remove(explored)
+            ordered.insert(0, explored)
+        else:
+            ordered = [route for route in ordered if not self.is_skipped(route)] or ordered[:1]
+        return self._apply_constraints(ordered)
+
+    def _apply_constraints(self, ordered: list[str]) -> list[str]:
+        """Move routes below the routes they must never be above."""
+        for _ in range(len(self.never_above) * len(ordered) + 1):
+            for route, other in self.never_above:
+                if route in ordered and other in ordered:
+                    if ordered.index(route) < ordered.index(other):
+                        ordered.remove(route)
+                        ordered.insert(ordered.index(other) + 1, route)
+                        break
+            else:
+                return ordered
+        logger.warning("Adaptive routing constraints are contradictory; ignoring the rest")
+        return ordered
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Moving averages and score per route."""
+        with self._lock:
+            routes = {route: dict(stats) for route, stats in self._stats.items()}
+        return {
+            route: {
+                "latency": round(stats["latency"], 3),
+                "success_rate": round(stats["success"], 3),
+                "empty_rate": round(stats["empty"], 3),
+                "samples": int(stats["samples"]),
+                "score": round(self.score(route), 3),
+                "skipped": self.is_skipped(route),
+            }
+            for route, stats in routes.items()
+        }
+
+    def save(self):
+        """Write the statistics to the state file, if one is configured."""
+        if self.state_file is None:
+            return
+        with self._lock:
+            data = json.dumps(self._stats)
+            self._last_save = time.monotonic()
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_file.with_name(self.state_file.name + ".tmp")
+            tmp_path.write_text(data)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            logger.debug(f"Could not save provider statistics: {e}")
+
+    def _load(self):
+        try:
+            raw = json.loads(self.state_file.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable provider statistics {self.state_file}: {e}")
+            return
+        for route, stats in raw.items():
+            if isinstance(stats, dict) and all(
+                isinstance(stats.get(name), int | float) and math.isfinite(stats[name])
+                for name in _PRIOR
+            ):
+                self._stats[route] = {**_PRIOR, **stats}
+        logger.info(f"Loaded provider statistics for {len(self._stats)} routes")
@@ -1,7 +1,10 @@
 """Pytest configuration and fixtures for multi-search-api tests."""
 
+import asyncio
 import tempfile
+import time
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -38,6 +41,43 @@ def smart_search_tool_with_cache(temp_cache_file):
     return SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
 
 
+@pytest.fixture
+def make_provider():
+    """Factory for mock providers with sync and async search.
+
+    Each provider sleeps ``delay`` seconds, then raises ``side_effect`` or returns
+    ``results``; ``provider.cancelled`` is set when an async search is cancelled.
+    """
+
+    def make(name, results=None, side_effect=None, delay=0.0):
+        provider = MagicMock()
+        provider.__class__.__name__ = name
+        provider.is_available.return_value = True
+        provider.cancelled = False
+
+        def search(query, **kwargs):
+            time.sleep(delay)
+            if side_effect is not None:
+                raise side_effect
+            return results
+
+        async def asearch(query, **kwargs):
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                provider.cancelled = True
+                raise
+            if side_effect is not None:
+                raise side_effect
+            return results
+
+        provider.search.side_effect = search
+        provider.asearch = AsyncMock(side_effect=asearch)
+        return provider
+
+    return make
+
+
 @pytest.fixture
 def sample_search_results():
     """Sample search results for testing."""
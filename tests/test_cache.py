@@ -1,11 +1,24 @@
 """Tests for search result caching."""
 
+import copy
+import json
 import threading
-from datetime import timedelta
+from datetime import datetime, timedelta
 
+import pytest
 from freezegun import freeze_time
 
 from multi_search_api import SearchResultCache
+from multi_search_api.cache import (
+    ENGLISH_STOPWORDS,
+    FrozenResult,
+    FrozenResultList,
+    QueryNormalizer,
+    QuerySimilarityIndex,
+    TTLPolicy,
+    TTLRule,
+)
+from multi_search_api.cache.results import canonical_url
 
 
 def test_cache_initialization(temp_cache_file):
@@ -66,9 +79,13 @@ def test_cache_key_generation(search_cache):
     key3 = search_cache._generate_cache_key("different", "provider", num_results=10)
     assert key1 != key3
 
-    # Different params should generate different key
+    # num_results is not part of the key: entries are sliced on read instead
     key4 = search_cache._generate_cache_key("test", "provider", num_results=20)
-    assert key1 != key4
+    assert key1 == key4
+
+    # Different result-affecting params should generate different key
+    key5 = search_cache._generate_cache_key("test", "provider", language="en")
+    assert key1 != key5
 
 
 def test_clear_expired_entries(search_cache, sample_search_results):
@@ -273,3 +290,491 @@ def test_concurrent_get_cache_stats(search_cache, sample_search_results):
     for stats in results:
         assert "total_entries" in stats
         assert stats["total_entries"] >= 0
+
+
+def test_max_entries_evicts_least_recently_used(temp_cache_file, sample_search_results):
+    """Test that a bounded cache evicts the least recently used entry."""
+    cache = SearchResultCache(cache_file=temp_cache_file, max_entries=2)
+
+    cache.cache_results("query1", "provider", sample_search_results)
+    cache.cache_results("query2", "provider", sample_search_results)
+    # Touch query1 so query2 becomes the LRU entry
+    assert cache.get_cached_results("query1", "provider") is not None
+    cache.cache_results("query3", "provider", sample_search_results)
+
+    assert len(cache.cache_data) == 2
+    assert cache.get_cached_results("query1", "provider") is not None
+    assert cache.get_cached_results("query2", "provider") is None
+    assert cache.get_cache_stats()["evictions"] == 1
+
+    # Evicted entries are removed from the cache file as well
+    reloaded = SearchResultCache(cache_file=temp_cache_file)
+    assert len(reloaded.cache_data) == 2
+
+
+def test_max_bytes_budget(temp_cache_file, sample_search_results):
+    """Test that the approximate byte budget bounds the cache."""
+    cache = SearchResultCache(cache_file=temp_cache_file, max_bytes=2_000)
+
+    for i in range(20):
+        cache.cache_results(f"query{i}", "provider", sample_search_results)
+
+    stats = cache.get_cache_stats()
+    assert 0 < stats["total_entries"] < 20
+    assert stats["estimated_bytes"] <= 2_000
+    assert stats["evictions"] == 20 - stats["total_entries"]
+
+
+def test_tinylfu_protects_hot_entries(temp_cache_file, sample_search_results):
+    """Test that TinyLFU keeps popular entries when one-off queries arrive."""
+    cache = SearchResultCache(cache_file=temp_cache_file, max_entries=2, eviction_policy="tinylfu")
+
+    cache.cache_results("hot1", "provider", sample_search_results)
+    cache.cache_results("hot2", "provider", sample_search_results)
+    for _ in range(5):
+        cache.get_cached_results("hot1", "provider")
+        cache.get_cached_results("hot2", "provider")
+
+    for i in range(10):
+        cache.cache_results(f"one-off {i}", "provider", sample_search_results)
+
+    assert cache.get_cached_results("hot1", "provider") is not None
+    assert cache.get_cached_results("hot2", "provider") is not None
+    assert cache.get_cache_stats()["rejected_admissions"] == 10
+
+
+def test_expired_entries_swept_incrementally_on_write(search_cache, sample_search_results):
+    """Test that writes sweep expired entries without a full clear."""
+    with freeze_time("2025-01-01 12:00:00"):
+        for i in range(3):
+            search_cache.cache_results(f"old{i}", "provider", sample_search_results)
+
+    with freeze_time("2025-01-03 12:00:00"):
+        search_cache.cache_results("new", "provider", sample_search_results)
+
+        assert list(search_cache.cache_data) == [
+            search_cache._generate_cache_key("new", "provider")
+        ]
+
+
+def test_cache_stats_are_maintained_incrementally(search_cache, sample_search_results):
+    """Test oldest/newest entry and byte size tracking without scanning entries."""
+    with freeze_time("2025-01-01 12:00:00"):
+        search_cache.cache_results("query1", "provider", sample_search_results)
+    with freeze_time("2025-01-01 18:00:00"):
+        search_cache.cache_results("query2", "provider", sample_search_results)
+        stats = search_cache.get_cache_stats()
+
+    assert stats["oldest_entry"].startswith("2025-01-01")
+    assert stats["oldest_entry"] < stats["newest_entry"]
+    assert stats["next_expiry"].startswith("2025-01-02")
+    assert stats["estimated_bytes"] > 0
+
+    with freeze_time("2025-01-02 15:00:00"):
+        search_cache.clear_expired_entries()
+        stats = search_cache.get_cache_stats()
+    assert stats["total_entries"] == 1
+    assert stats["oldest_entry"] == stats["newest_entry"]
+
+
+def test_cache_stats_order_late_arriving_older_entries(tmp_path, sample_search_results):
+    """Test oldest/newest entry when lazily loaded or imported entries are older."""
+    cache_file = str(tmp_path / "cache.jsonl")
+    snapshot = tmp_path / "snapshot.jsonl"
+    with freeze_time("2025-01-01 06:00:00"):
+        other = SearchResultCache(cache_file=str(tmp_path / "other.jsonl"))
+        other.cache_results("imported", "any", sample_search_results)
+        other.export_snapshot(snapshot)
+    with freeze_time("2025-01-01 12:00:00"):
+        writer = SearchResultCache(cache_file=cache_file)
+        writer.cache_results("stored", "any", sample_search_results)
+        writer.close()
+
+    with freeze_time("2025-01-01 18:00:00"):
+        cache = SearchResultCache(cache_file=cache_file, preload=False)
+        cache.cache_results("new", "any", sample_search_results)
+        newest = cache.get_cache_stats()["newest_entry"]
+        # Read from storage, older than the resident entry
+        assert cache.get_cached_results("stored", "any") is not None
+        stats = cache.get_cache_stats()
+        assert stats["newest_entry"] == newest
+        assert stats["oldest_entry"] < newest
+
+        assert cache.import_snapshot(snapshot) == 1
+        imported = cache.get_cache_stats()
+    assert imported["newest_entry"] == newest
+    assert imported["oldest_entry"] < stats["oldest_entry"]
+
+
+def test_legacy_iso_timestamps_are_upgraded(temp_cache_file, sample_search_results):
+    """Test that entries written with ISO timestamps are converted on load."""
+    with open(temp_cache_file, "w") as f:
+        json.dump(
+            {
+                "legacy": {
+                    "timestamp": datetime.now().isoformat(),
+                    "query": "legacy",
+                    "provider": "any",
+                    "results": sample_search_results,
+                    "result_count": 3,
+                }
+            },
+            f,
+        )
+
+    cache = SearchResultCache(cache_file=temp_cache_file)
+
+    entry = cache.cache_data["legacy"]
+    assert "timestamp" not in entry
+    assert entry["expires_at"] - entry["created_at"] == timedelta(days=1).total_seconds()
+
+
+def test_negative_cache_entries(search_cache, sample_search_results):
+    """Test negative entries are reported separately and replaced by real results."""
+    search_cache.cache_negative_result("empty query", "provider")
+
+    lookup = search_cache.lookup("empty query", "provider")
+    assert lookup.negative is True
+    assert search_cache.get_cached_results("empty query", "provider") == []
+    stats = search_cache.get_cache_stats()
+    assert stats["negative_entries"] == 1
+    assert stats["negative_hits"] == 2
+
+    search_cache.cache_results("empty query", "provider", sample_search_results)
+
+    assert search_cache.lookup("empty query", "provider").negative is False
+    assert search_cache.get_cache_stats()["negative_entries"] == 0
+
+
+def test_ttl_policy_rules(temp_cache_file, sample_search_results):
+    """Test that TTL rules give query classes their own time to live."""
+    policy = TTLPolicy(
+        rules=[
+            TTLRule("recent", timedelta(hours=1), match={"time_range": "recent"}),
+            TTLRule("evergreen", timedelta(days=30), query_pattern=r"^what is "),
+        ]
+    )
+    cache = SearchResultCache(cache_file=temp_cache_file, ttl_policy=policy)
+
+    with freeze_time("2025-01-01 12:00:00"):
+        cache.cache_results("ai news", "any", sample_search_results, time_range="recent")
+        cache.cache_results("what is python", "any", sample_search_results)
+        cache.cache_results("python asyncio", "any", sample_search_results)
+
+    with freeze_time("2025-01-01 14:00:00"):
+        assert cache.get_cached_results("ai news", "any", time_range="recent") is None
+        assert cache.get_cached_results("python asyncio", "any") is not None
+
+    with freeze_time("2025-01-10 12:00:00"):
+        assert cache.get_cached_results("python asyncio", "any") is None
+        assert cache.get_cached_results("what is python", "any") is not None
+
+    assert policy.query_class("what is python") == "evergreen"
+    assert policy.query_class("python asyncio") == "default"
+
+
+def test_stale_while_revalidate_window(temp_cache_file, sample_search_results):
+    """Test that expired results are served as stale inside the revalidate window."""
+    policy = TTLPolicy(default_ttl=timedelta(hours=1), stale_while_revalidate=timedelta(hours=2))
+    cache = SearchResultCache(cache_file=temp_cache_file, ttl_policy=policy)
+
+    with freeze_time("2025-01-01 12:00:00"):
+        cache.cache_results("query", "any", sample_search_results)
+        assert cache.lookup("query", "any").stale is False
+
+    with freeze_time("2025-01-01 14:00:00"):
+        lookup = cache.lookup("query", "any")
+        assert lookup.stale is True
+        assert len(lookup.results) == 3
+
+    with freeze_time("2025-01-01 15:30:00"):
+        assert cache.lookup("query", "any") is None
+
+
+def test_query_normalizer_default_pipeline():
+    """Test the default normalization steps."""
+    normalizer = QueryNormalizer()
+
+    assert normalizer.normalize("  Python   AsyncIO?? ") == "python asyncio"
+    assert normalizer.normalize("Ｐｙｔｈｏｎ") == "python"  # fullwidth
+    assert normalizer.normalize("\u201cmachine learning\u201d") == "machine learning"
+    assert normalizer.normalize("C++ vs C#") == "c++ vs c#"
+    # Word order is kept unless token sorting is enabled
+    assert normalizer.normalize("rust to python") != normalizer.normalize("python to rust")
+
+
+def test_query_normalizer_optional_steps():
+    """Test token sorting and stopword removal."""
+    normalizer = QueryNormalizer(sort_tokens=True, stopwords=ENGLISH_STOPWORDS)
+
+    assert normalizer.normalize("What is the Python GIL") == "gil python"
+    assert normalizer.normalize("gil python") == "gil python"
+    # A query made of stopwords only is kept as is
+    assert normalizer.normalize("the who") == "the who"
+
+
+def test_cache_key_covers_result_affecting_kwargs(search_cache):
+    """Test that the key schema includes all result-affecting kwargs with defaults."""
+    key = search_cache._generate_cache_key("test", "any")
+
+    assert key == search_cache._generate_cache_key("test", "any", num_results=5, language="nl")
+    assert key == search_cache._generate_cache_key("Test!", "any", unrelated="ignored")
+    assert key != search_cache._generate_cache_key("test", "any", time_range="recent")
+    assert key != search_cache._generate_cache_key("test", "any", region="us-en")
+    assert key != search_cache._generate_cache_key("test", "other")
+
+
+def test_normalized_queries_share_entries(search_cache, sample_search_results):
+    """Test that equivalent queries hit the same entry and are counted."""
+    search_cache.cache_results("Python asyncio", "any", sample_search_results)
+
+    assert search_cache.get_cached_results("python   asyncio?", "any") is not None
+    assert search_cache.get_cached_results("PYTHON ASYNCIO", "any") is not None
+    assert search_cache.get_cached_results("python threading", "any") is None
+
+    stats = search_cache.get_cache_stats()
+    assert stats["lookups"] == 3
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 2 / 3
+    # Only the first hit needed more than case folding and stripping
+    assert stats["normalized_hits"] == 1
+
+
+def test_smaller_requests_served_from_cached_superset(search_cache, sample_search_results):
+    """Test that an entry serves requests for up to as many results as it holds."""
+    search_cache.cache_results("query", "any", sample_search_results, num_results=3)
+
+    assert len(search_cache.get_cached_results("query", "any", num_results=2)) == 2
+    assert len(search_cache.get_cached_results("query", "any", num_results=3)) == 3
+    assert search_cache.get_cached_results("query", "any", num_results=4) is None
+    # The entry is kept for requests it can serve
+    assert search_cache.get_cached_results("query", "any", num_results=1) is not None
+    assert search_cache.get_cache_stats()["sliced_hits"] == 2
+
+
+def test_exhausted_results_serve_larger_requests(search_cache, sample_search_results):
+    """Test that an entry holding everything the providers had serves larger requests."""
+    # Asked for 10, providers only had 3
+    search_cache.cache_results("query", "any", sample_search_results, num_results=10)
+
+    assert len(search_cache.get_cached_results("query", "any", num_results=10)) == 3
+    assert search_cache.get_cached_results("query", "any", num_results=20) is None
+
+
+def test_canonical_url():
+    """Test that URL variants of the same page share a canonical form."""
+    canonical = canonical_url("https://example.com/page?a=1&b=2")
+
+    assert canonical_url("HTTPS://www.Example.com:443/page/?b=2&a=1#top") == canonical
+    assert canonical_url("https://example.com/page?a=1&utm_source=x&b=2&gclid=y") == canonical
+    assert canonical_url("https://example.com/other?a=1&b=2") != canonical
+    assert canonical_url("not a url") == "not a url"
+
+
+def test_results_shared_between_entries(search_cache, sample_search_results):
+    """Test that identical results in different entries are stored once."""
+    search_cache.cache_results("query a", "any", sample_search_results)
+    search_cache.cache_results("query b", "any", [dict(r) for r in sample_search_results[:2]])
+
+    entry_a, entry_b = search_cache.cache_data.values()
+    assert entry_a["results"][0] is entry_b["results"][0]
+
+    stats = search_cache.get_cache_stats()
+    assert stats["distinct_results"] == 3
+    assert stats["distinct_urls"] == 3
+    assert stats["result_references"] == 5
+
+    # Results are released when the last entry referring to them goes
+    search_cache.cache_results("query a", "any", sample_search_results[:1])
+    stats = search_cache.get_cache_stats()
+    assert stats["distinct_results"] == 2
+    assert stats["result_references"] == 3
+
+
+@pytest.mark.parametrize("format", ["jsonl", "binary"])
+def test_snapshot_roundtrip(tmp_path, search_cache, sample_search_results, format):
+    """Test exporting a cache and importing it into an empty one."""
+    search_cache.cache_results("query a", "any", sample_search_results)
+    search_cache.cache_negative_result("query b", "any")
+    snapshot = tmp_path / f"snapshot.{format}"
+
+    assert search_cache.export_snapshot(snapshot, format=format) == 2
+
+    cache = SearchResultCache(cache_file=str(tmp_path / "cache.db"))
+    assert cache.import_snapshot(snapshot) == 2
+    assert cache.get_cached_results("query a", "any") == sample_search_results
+    assert cache.get_cached_results("query b", "any") == []
+    # Imported entries are persisted as well
+    reopened = SearchResultCache(cache_file=str(tmp_path / "cache.db"))
+    assert reopened.get_cached_results("query a", "any") == sample_search_results
+
+
+def test_snapshot_exports_hottest_entries(tmp_path, search_cache, sample_search_results):
+    """Test that top_k exports the most frequently hit entries with their counts."""
+    for query in ("cold", "warm", "hot"):
+        search_cache.cache_results(query, "any", sample_search_results)
+    for query, hits in (("warm", 2), ("hot", 5)):
+        for _ in range(hits):
+            search_cache.get_cached_results(query, "any")
+    # Refreshing an entry keeps its hit count
+    search_cache.cache_results("hot", "any", sample_search_results)
+    snapshot = tmp_path / "snapshot.jsonl"
+
+    assert search_cache.export_snapshot(snapshot, top_k=2) == 2
+
+    records = [json.loads(line) for line in snapshot.read_text().splitlines()]
+    assert [(r["entry"]["query"], r["hits"]) for r in records] == [("hot", 5), ("warm", 2)]
+
+
+def test_snapshot_preloaded_at_startup(tmp_path, search_cache, sample_search_results):
+    """Test warm-starting a cache from a snapshot, skipping expired and older entries."""
+    with freeze_time(datetime.now() - timedelta(days=2)):
+        search_cache.cache_results("expired", "any", sample_search_results)
+    search_cache.cache_results("query", "any", sample_search_results)
+    snapshot = tmp_path / "snapshot.bin"
+    search_cache.export_snapshot(snapshot, format="binary")
+
+    cache = SearchResultCache(cache_file=str(tmp_path / "cache.jsonl"), snapshot=snapshot)
+    stats = cache.get_cache_stats()
+    assert stats["total_entries"] == 1
+    assert cache.get_cached_results("query", "any") == sample_search_results
+
+    # A newer cached copy wins over the snapshot
+    cache.cache_results("query", "any", sample_search_results[:1])
+    assert cache.import_snapshot(snapshot) == 0
+    assert cache.get_cached_results("query", "any") == sample_search_results[:1]
+
+
+def test_snapshot_streams_lazily_loaded_cache(tmp_path, sample_search_results):
+    """Test that a cache not held in memory is exported from storage."""
+    cache_file = str(tmp_path / "cache.jsonl")
+    writer = SearchResultCache(cache_file=cache_file)
+    for i in range(5):
+        writer.cache_results(f"query {i}", "any", sample_search_results)
+    writer.close()
+
+    lazy = SearchResultCache(cache_file=cache_file, preload=False)
+    snapshot = tmp_path / "snapshot.jsonl"
+
+    assert lazy.get_cache_stats()["resident_entries"] == 0
+    assert lazy.export_snapshot(snapshot) == 5
+
+
+def test_cache_analytics(temp_cache_file, sample_search_results):
+    """Test hit breakdowns by provider of origin and query class, and latency saved."""
+    cache = SearchResultCache(cache_file=temp_cache_file, max_entries=2)
+    cache.cache_results("query a", "any", sample_search_results, origin="Serper", fetch_seconds=0.5)
+    cache.cache_results("query b", "any", sample_search_results, origin="Serper", fetch_seconds=1.5)
+    # Entries cached without a fetch time are credited with their provider's average
+    cache.cache_results("query c", "any", sample_search_results, origin="Serper")
+
+    cache.get_cached_results("query b", "any")
+    cache.get_cached_results("query c", "any")
+    cache.get_cached_results("query a", "any")  # evicted
+    cache.get_cached_results("query c", "any", time_range="recent")
+
+    stats = cache.get_cache_stats()
+    assert stats["evictions"] == 1
+    assert stats["avg_entry_bytes"] > 0
+    assert stats["estimated_latency_saved"] == pytest.approx(2.5)
+    assert stats["by_origin"]["Serper"] == {
+        "entries": 2,
+        "hits": 2,
+        "estimated_latency_saved": pytest.approx(2.5),
+        "avg_fetch_seconds": pytest.approx(1.0),
+    }
+    assert stats["by_query_class"]["default"] == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+    assert stats["by_query_class"]["recent"]["misses"] == 1
+
+    with freeze_time(datetime.now() + timedelta(days=2)):
+        assert cache.get_cached_results("query b", "any") is None
+        assert cache.get_cache_stats()["expired_hits"] == 1
+
+
+@pytest.mark.parametrize("codec", ["json", "compact"])
+def test_cache_hits_return_read_only_results(temp_cache_file, sample_search_results, codec):
+    """Test that callers cannot corrupt cached results through the returned objects."""
+    cache = SearchResultCache(cache_file=temp_cache_file, codec=codec)
+    cache.cache_results("query", "any", sample_search_results)
+    # The provider's own results stay mutable and are not shared with the cache
+    sample_search_results[0]["title"] = "changed by provider caller"
+
+    results = cache.get_cached_results("query", "any")
+    assert isinstance(results, FrozenResultList)
+    assert isinstance(results[0], FrozenResult)
+    assert isinstance(results[:1], FrozenResultList)
+    with pytest.raises(TypeError):
+        results[0]["score"] = 1.0
+    with pytest.raises(TypeError):
+        results.append({})
+    with pytest.raises(TypeError):
+        results[0].update(title="x")
+
+    # Explicit copies are plain and mutable
+    mutable = results.copy()
+    mutable[0]["score"] = 1.0
+    mutable.append({})
+    assert type(copy.deepcopy(results)[0]) is dict
+    assert cache.get_cached_results("query", "any")[0]["title"] == "Test Result 1"
+    assert "score" not in cache.get_cached_results("query", "any")[0]
+    assert json.loads(json.dumps(results))[0]["title"] == "Test Result 1"
+
+
+def test_cache_hits_share_result_objects(search_cache, sample_search_results):
+    """Test that hits hand out the cached results without copying them."""
+    search_cache.cache_results("query", "any", sample_search_results)
+
+    first = search_cache.get_cached_results("query", "any")
+    second = search_cache.get_cached_results("query", "any")
+
+    assert first is second
+    assert first[0] is search_cache.get_cached_results("query", "any", num_results=1)[0]
+
+
+def test_similarity_index_finds_near_duplicates():
+    """Test that the MinHash index matches reordered and extended queries only."""
+    index = QuerySimilarityIndex(threshold=0.8)
+    index.add("a", "latest ai regulation eu", scope="nl")
+    index.add("b", "python asyncio tutorial", scope="nl")
+
+    assert index.matches("eu ai regulation latest news", "nl") == [(0.8, "a")]
+    assert index.matches("eu ai regulation", "nl") == []  # 3 of 4 words
+    assert index.matches("latest ai regulation eu", "en") == []
+
+    index.remove("a")
+    assert index.matches("latest ai regulation eu", "nl") == []
+    assert len(index) == 1
+
+
+def test_similarity_index_character_ngrams():
+    """Test that character n-grams match queries with typos."""
+    index = QuerySimilarityIndex(threshold=0.6, char_ngrams=3)
+    index.add("a", "kubernetes deployment strategies", scope="")
+
+    assert [key for _, key in index.matches("kubernets deployment strategies", "")] == ["a"]
+
+
+def test_approximate_cache_hits(temp_cache_file, sample_search_results):
+    """Test serving near-duplicate queries, flagged as approximate."""
+    cache = SearchResultCache(cache_file=temp_cache_file, similarity=0.8)
+    cache.cache_results("latest AI regulation EU", "any", sample_search_results)
+    cache.cache_negative_result("nothing to find here", "any")
+
+    lookup = cache.lookup("EU AI regulation latest news", "any")
+    assert lookup.approximate is True
+    assert lookup.results == sample_search_results
+    assert cache.lookup("latest AI regulation EU", "any").approximate is False
+    # Near-duplicates must share search parameters, and negative entries never match
+    assert cache.lookup("EU AI regulation latest news", "any", language="en") is None
+    assert cache.lookup("nothing to find here today", "any") is None
+    # Entries holding fewer results than requested do not match either
+    assert cache.lookup("EU AI regulation latest news", "any", num_results=20) is None
+
+    stats = cache.get_cache_stats()
+    assert stats["approximate_hits"] == 1
+    assert stats["hits"] == 2
+
+    # Entries reloaded from storage are indexed again
+    reopened = SearchResultCache(cache_file=temp_cache_file, similarity=0.8)
+    assert reopened.lookup("EU AI regulation latest news", "any").approximate is True
@@ -0,0 +1,141 @@
+"""Tests for per-provider circuit breakers."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from multi_search_api import SmartSearchTool
+from multi_search_api.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreakers
+from multi_search_api.exceptions import RateLimitError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the breakers."""
+    now = [1000.0]
+    monkeypatch.setattr("multi_search_api.circuit.time.monotonic", lambda: now[0])
+    return now
+
+
+def test_rate_limit_opens_for_retry_after(clock):
+    """Test that a rate limit pauses the provider for its Retry-After."""
+    breakers = CircuitBreakers()
+    breakers.record_failure("Serper", RateLimitError("429", retry_after=30))
+
+    assert breakers.state("Serper") == OPEN
+    assert not breakers.allow("Serper")
+    assert breakers.retry_in("Serper") == 30
+
+    clock[0] += 30
+    assert breakers.allow("Serper")
+    assert breakers.state("Serper") == HALF_OPEN
+
+
+def test_other_errors_do_not_open(clock):
+    """Test that only rate limits open a closed breaker."""
+    breakers = CircuitBreakers()
+    breakers.record_failure("Serper", ConnectionError("timeout"))
+
+    assert breakers.state("Serper") == CLOSED
+    assert breakers.allow("Serper")
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    """Test that only one request probes a recovering provider."""
+    breakers = CircuitBreakers(cooldown=10)
+    breakers.record_failure("Brave", RateLimitError("429"))
+    clock[0] += 10
+
+    assert breakers.ready("Brave")
+    assert breakers.allow("Brave")
+    assert not breakers.ready("Brave")
+    assert not breakers.allow("Brave")
+
+    breakers.record_success("Brave")
+
+    assert breakers.state("Brave") == CLOSED
+    assert breakers.allow("Brave")
+
+
+def test_failed_probe_reopens_with_backoff(clock):
+    """Test that cooldowns double while the provider keeps failing."""
+    breakers = CircuitBreakers(cooldown=10, max_cooldown=25)
+    breakers.record_failure("Brave", RateLimitError("429"))
+    assert breakers.retry_in("Brave") == 10
+
+    clock[0] += 10
+    assert breakers.allow("Brave")
+    breakers.record_failure("Brave", ConnectionError("timeout"))
+    assert breakers.state("Brave") == OPEN
+    assert breakers.retry_in("Brave") == 20
+
+    clock[0] += 20
+    assert breakers.allow("Brave")
+    breakers.record_failure("Brave", RateLimitError("429"))
+    assert breakers.retry_in("Brave") == 25
+
+    clock[0] += 25
+    assert breakers.allow("Brave")
+    breakers.record_success("Brave")
+    breakers.record_failure("Brave", RateLimitError("429"))
+    assert breakers.retry_in("Brave") == 10
+
+
+def test_unanswered_probe_is_replaced(clock):
+    """Test that a probe that never reports back does not block the provider forever."""
+    breakers = CircuitBreakers(cooldown=10, probe_timeout=5)
+    breakers.record_failure("Brave", RateLimitError("429"))
+    clock[0] += 10
+    assert breakers.allow("Brave")
+
+    clock[0] += 5
+
+    assert breakers.allow("Brave")
+
+
+def test_set_interface():
+    """Test that the breakers work as the set of rate-limited providers."""
+    breakers = CircuitBreakers()
+    breakers.add("Serper")
+    breakers.record_failure("Brave", RateLimitError("429"))
+
+    assert "Serper" in breakers
+    assert set(breakers) == {"Serper", "Brave"}
+    assert len(breakers) == 2
+
+    breakers.discard("Serper")
+    assert "Serper" not in breakers
+    assert breakers.allow("Serper")
+
+    breakers.clear()
+    assert len(breakers) == 0
+
+
+def test_tool_pauses_and_probes_rate_limited_provider(clock, sample_search_results):
+    """Test that a rate-limited provider is skipped, then probed and resumed."""
+    tool = SmartSearchTool(enable_cache=False)
+    limited = MagicMock()
+    limited.__class__.__name__ = "Provider1"
+    limited.is_available.return_value = True
+    limited.search.side_effect = [RateLimitError("429", retry_after=60), sample_search_results]
+    fallback = MagicMock()
+    fallback.__class__.__name__ = "Provider2"
+    fallback.is_available.return_value = True
+    fallback.search.return_value = sample_search_results
+    tool.providers = [limited, fallback]
+
+    assert tool.search("first")["provider"] == "Provider2"
+    assert tool.search("second")["provider"] == "Provider2"
+    assert limited.search.call_count == 1
+    status = tool.get_status()
+    assert status["rate_limited_providers"] == ["Provider1"]
+    assert status["circuit_breakers"]["providers"]["Provider1"]["state"] == OPEN
+    assert status["circuit_breakers"]["providers"]["Provider1"]["retry_in"] == 60
+
+    clock[0] += 60
+    assert tool.search("third")["provider"] == "Provider1"
+
+    status = tool.get_status()
+    assert status["rate_limited_providers"] == []
+    transitions = [(t["from"], t["to"]) for t in status["circuit_breakers"]["transitions"]]
+    assert transitions == [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)]
@@ -0,0 +1,133 @@
+"""Tests for token-bucket request pacing."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from multi_search_api import SmartSearchTool
+from multi_search_api.pacing import RateScheduler
+from multi_search_api.providers import BraveProvider, DuckDuckGoProvider
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the scheduler."""
+    now = [1000.0]
+    monkeypatch.setattr("multi_search_api.pacing.time.monotonic", lambda: now[0])
+    return now
+
+
+def test_reserve_queues_requests_one_interval_apart(clock):
+    """Test that booked requests are spaced by the interval."""
+    scheduler = RateScheduler()
+    scheduler.register("Brave", 1.0)
+
+    assert scheduler.delay("Brave") == 0
+    assert scheduler.reserve("Brave") == 0
+    assert scheduler.delay("Brave") == pytest.approx(1.0)
+    assert scheduler.reserve("Brave") == pytest.approx(1.0)
+    assert scheduler.reserve("Brave") == pytest.approx(2.0)
+
+    clock[0] += 2.5
+
+    assert scheduler.delay("Brave") == pytest.approx(0.5)
+
+
+def test_delay_does_not_book(clock):
+    """Test that asking when a provider may go does not use up its request."""
+    scheduler = RateScheduler()
+    scheduler.register("Brave", 1.0)
+
+    for _ in range(3):
+        assert scheduler.delay("Brave") == 0
+
+    assert scheduler.reserve("Brave") == 0
+
+
+def test_burst_and_unregistered(clock):
+    """Test burst capacity, and that unknown providers are never delayed."""
+    scheduler = RateScheduler()
+    scheduler.register("Serper", 0.5, burst=2)
+
+    assert scheduler.reserve("Serper") == 0
+    assert scheduler.reserve("Serper") == 0
+    assert scheduler.reserve("Serper") == pytest.approx(0.5)
+    assert scheduler.reserve("Unknown") == 0
+
+
+def test_interval_can_change(clock):
+    """Test that a callable interval, like a backoff, is read on every request."""
+    provider = DuckDuckGoProvider(min_delay=1.0)
+    scheduler = RateScheduler()
+    provider.attach_scheduler(scheduler)
+    scheduler.reserve("DuckDuckGoProvider")
+    assert scheduler.delay("DuckDuckGoProvider") == pytest.approx(1.0)
+
+    provider.consecutive_failures = 2
+
+    assert scheduler.delay("DuckDuckGoProvider") == pytest.approx(4.0)
+
+
+def test_concurrent_reservations_do_not_race(clock):
+    """Test that threads booking at once each get their own slot."""
+    scheduler = RateScheduler()
+    scheduler.register("Brave", 1.0)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        waits = list(executor.map(lambda _: scheduler.reserve("Brave"), range(20)))
+
+    assert sorted(waits) == pytest.approx([float(i) for i in range(20)])
+
+
+def test_tool_shares_scheduler_with_providers():
+    """Test that the tool's providers declare their rates to one scheduler."""
+    tool = SmartSearchTool(enable_cache=False, brave_api_key="test_key")
+
+    brave = next(p for p in tool.providers if isinstance(p, BraveProvider))
+
+    assert brave.scheduler is tool.rate_scheduler
+    assert tool.get_status()["pacing"]["BraveProvider"]["interval"] == 1.0
+
+
+def paced_tool(sample_search_results, second_results):
+    tool = SmartSearchTool(enable_cache=False)
+    first = MagicMock()
+    first.__class__.__name__ = "Provider1"
+    first.is_available.return_value = True
+    first.search.return_value = sample_search_results
+    second = MagicMock()
+    second.__class__.__name__ = "Provider2"
+    second.is_available.return_value = True
+    second.search.return_value = second_results
+    tool.providers = [first, second]
+    tool.rate_scheduler.register("Provider1", 0.3)
+    tool.rate_scheduler.reserve("Provider1")
+    return tool, first, second
+
+
+def test_tool_skips_to_ready_provider(monkeypatch, sample_search_results):
+    """Test that a paced provider is passed over for one that can go now."""
+    sleeps = []
+    monkeypatch.setattr("multi_search_api.core.time.sleep", sleeps.append)
+    tool, first, _ = paced_tool(sample_search_results, sample_search_results[:1])
+
+    result = tool.search("test query")
+
+    assert result["provider"] == "Provider2"
+    first.search.assert_not_called()
+    assert sleeps == []
+
+
+def test_tool_waits_only_when_no_provider_is_ready(monkeypatch, sample_search_results):
+    """Test that the tool waits for a paced provider once the ready ones came up empty."""
+    sleeps = []
+    monkeypatch.setattr("multi_search_api.core.time.sleep", sleeps.append)
+    tool, first, second = paced_tool(sample_search_results, [])
+
+    result = tool.search("test query")
+
+    assert result["provider"] == "Provider1"
+    second.search.assert_called_once()
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= 0.3
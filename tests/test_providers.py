@@ -1,11 +1,18 @@
 """Tests for search providers."""
 
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
+import requests
 import responses
 
+from multi_search_api import SmartSearchTool
 from multi_search_api.exceptions import RateLimitError
 from multi_search_api.providers import (
     BraveProvider,
@@ -13,6 +20,24 @@ from multi_search_api.providers import (
     SearXNGProvider,
     SerperProvider,
 )
+from multi_search_api.routing import AdaptiveRouter
+
+
+@pytest.fixture
+def async_routes(monkeypatch):
+    """Serve httpx.AsyncClient requests from a dict of URL -> httpx.Response."""
+    routes: dict[str, httpx.Response] = {}
+    real_client = httpx.AsyncClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return routes[str(request.url.copy_with(query=None))]
+
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    return routes
 
 
 class TestSerperProvider:
@@ -58,6 +83,76 @@ class TestSerperProvider:
         with pytest.raises(RateLimitError):
             provider.search("test query")
 
+    @responses.activate
+    def test_rate_limit_error_carries_retry_after(self):
+        """Test that the Retry-After header is passed on, in seconds or as a date."""
+        provider = SerperProvider(api_key="test_key")
+        in_ten_minutes = datetime.now(timezone.utc) + timedelta(minutes=10)
+        retry_date = format_datetime(in_ten_minutes, usegmt=True)
+
+        responses.add(
+            responses.POST,
+            "https://google.serper.dev/search",
+            json={},
+            status=429,
+            headers={"Retry-After": "120"},
+        )
+        responses.add(
+            responses.POST,
+            "https://google.serper.dev/search",
+            json={},
+            status=429,
+            headers={"Retry-After": retry_date},
+        )
+        responses.add(responses.POST, "https://google.serper.dev/search", json={}, status=429)
+
+        with pytest.raises(RateLimitError) as seconds:
+            provider.search("test query")
+        with pytest.raises(RateLimitError) as date:
+            provider.search("test query")
+        with pytest.raises(RateLimitError) as missing:
+            provider.search("test query")
+
+        assert seconds.value.retry_after == 120
+        assert 590 < date.value.retry_after <= 600
+        assert missing.value.retry_after is None
+
+    @responses.activate
+    def test_timeout_budget_caps_http_timeout(self, mock_serper_response):
+        """Test that a search's remaining budget becomes the HTTP timeout."""
+        provider = SerperProvider(api_key="test_key")
+        responses.add(
+            responses.POST,
+            "https://google.serper.dev/search",
+            json=mock_serper_response,
+            status=200,
+        )
+
+        provider.search("test query", timeout=2.5)
+        provider.search("test query", timeout=30)
+
+        assert responses.calls[0].request.req_kwargs["timeout"] == 2.5
+        assert responses.calls[1].request.req_kwargs["timeout"] == 10
+
+    @responses.activate
+    def test_timeout_at_deadline_is_not_an_empty_answer(self):
+        """Test that a request cut short by the search's deadline is not recorded as empty."""
+        responses.add(
+            responses.POST,
+            "https://google.serper.dev/search",
+            body=requests.exceptions.ReadTimeout("read timed out"),
+        )
+        tool = SmartSearchTool(enable_cache=False, adaptive_routing=AdaptiveRouter())
+        tool.providers = [SerperProvider(api_key="test_key")]
+
+        result = tool.search("test query", timeout=2.5)
+
+        assert result["deadline_exceeded"] is True
+        assert tool.router.get_stats() == {}
+        assert tool.circuit_breakers.get_stats()["providers"] == {}
+        # Without a deadline the provider's own timeout expired: a failed request
+        assert SerperProvider(api_key="test_key").search("test query") == []
+
     @responses.activate
     def test_payment_required_error(self):
         """Test payment required error handling."""
@@ -68,6 +163,21 @@ class TestSerperProvider:
         with pytest.raises(RateLimitError):
             provider.search("test query")
 
+    def test_async_search(self, async_routes, mock_serper_response):
+        """Test the async search path against the same responses."""
+        provider = SerperProvider(api_key="test_key")
+        async_routes["https://google.serper.dev/search"] = httpx.Response(
+            200, json=mock_serper_response
+        )
+
+        results = asyncio.run(provider.asearch("test query"))
+
+        assert [r["title"] for r in results] == ["Serper Result 1", "Serper Result 2"]
+
+        async_routes["https://google.serper.dev/search"] = httpx.Response(429, json={})
+        with pytest.raises(RateLimitError):
+            asyncio.run(provider.asearch("test query"))
+
 
 class TestBraveProvider:
     """Tests for Brave provider."""
@@ -116,6 +226,27 @@ class TestBraveProvider:
         with pytest.raises(RateLimitError):
             provider.search("test query")
 
+    def test_async_search_paces_without_blocking(self, async_routes, mock_brave_response):
+        """Test that concurrent async searches are spaced 1s apart on the event loop."""
+        provider = BraveProvider(api_key="test_key")
+        async_routes["https://api.search.brave.com/res/v1/web/search"] = httpx.Response(
+            200, json=mock_brave_response
+        )
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        async def run():
+            with patch("multi_search_api.providers.brave.asyncio.sleep", fake_sleep):
+                return await asyncio.gather(provider.asearch("a"), provider.asearch("b"))
+
+        first, second = asyncio.run(run())
+
+        assert len(first) == len(second) == 2
+        assert len(sleeps) == 1
+        assert sleeps[0] == pytest.approx(1.0, abs=0.1)
+
 
 class TestSearXNGProvider:
     """Tests for SearXNG provider."""
@@ -219,6 +350,21 @@ class TestSearXNGProvider:
         # Instance should now be rate-limited
         assert provider._is_instance_rate_limited("https://instance1.com") is True
 
+    @responses.activate
+    def test_all_instances_unavailable_carries_retry_after(self):
+        """Test that the error says when the first instance is available again."""
+        provider = SearXNGProvider()
+        provider.instances = ["https://instance1.com"]
+        provider.instance_url = "https://instance1.com"
+
+        responses.add(responses.GET, "https://instance1.com/search", json={}, status=429)
+
+        with pytest.raises(RateLimitError) as error:
+            provider.search("test query")
+
+        cooldown = SearXNGProvider.RATE_LIMIT_COOLDOWN
+        assert cooldown - 5 < error.value.retry_after <= cooldown
+
     @responses.activate
     def test_fallback_on_429(self, mock_searxng_response):
         """Test fallback to next instance on 429."""
@@ -247,6 +393,58 @@ class TestSearXNGProvider:
         assert provider._is_instance_rate_limited("https://instance1.com") is True
         assert provider._is_instance_rate_limited("https://instance2.com") is False
 
+    @responses.activate
+    def test_no_instance_tried_without_time_left(self):
+        """Test that an exhausted budget stops the instance attempts."""
+        provider = SearXNGProvider()
+        provider.instances = ["https://instance1.com"]
+        provider.instance_url = "https://instance1.com"
+
+        with pytest.raises(TimeoutError):
+            provider.search("test query", timeout=0)
+        assert not any("instance1.com" in call.request.url for call in responses.calls)
+
+    @responses.activate
+    def test_timeout_cut_short_by_budget_does_not_fail_instance(self):
+        """Test that a request timing out at the search's deadline leaves the instance alone."""
+        router = AdaptiveRouter(exploration=0)
+        provider = SearXNGProvider()
+        provider.instances = ["https://instance1.com", "https://instance2.com"]
+        provider.instance_url = "https://instance1.com"
+        provider.router = router
+        responses.add(
+            responses.GET,
+            "https://instance1.com/search",
+            body=requests.exceptions.ReadTimeout("read timed out"),
+        )
+
+        with pytest.raises(TimeoutError):
+            provider.search("test query", timeout=0.5)
+
+        assert provider._is_instance_failed("https://instance1.com") is False
+        assert router.get_stats() == {}
+        assert not any("instance2.com" in call.request.url for call in responses.calls)
+
+    @responses.activate
+    def test_router_picks_fastest_instance(self, mock_searxng_response):
+        """Test that an adaptive router sends the first attempt to the best instance."""
+        router = AdaptiveRouter(exploration=0)
+        for _ in range(5):
+            router.record("SearXNGProvider@https://instance1.com", 4.0, success=True)
+            router.record("SearXNGProvider@https://instance2.com", 0.4, success=True)
+        provider = SearXNGProvider()
+        provider.instances = ["https://instance1.com", "https://instance2.com"]
+        provider.instance_url = "https://instance1.com"
+        provider.router = router
+        responses.add(
+            responses.GET, "https://instance2.com/search", json=mock_searxng_response, status=200
+        )
+
+        results = provider.search("test query")
+
+        assert len(results) == 2
+        assert router.get_stats()["SearXNGProvider@https://instance2.com"]["samples"] == 6
+
     def test_failed_instance_tracking(self):
         """Test that failed instances are tracked with shorter cooldown."""
         provider = SearXNGProvider()
@@ -348,6 +546,21 @@ class TestSearXNGProvider:
         # Instance1 should be marked as failed
         assert provider._is_instance_failed("https://instance1.com") is True
 
+    def test_async_fallback_on_429(self, async_routes, mock_searxng_response):
+        """Test instance fallback on the async search path."""
+        provider = SearXNGProvider()
+        provider.instances = ["https://instance1.com", "https://instance2.com"]
+        provider.instance_url = "https://instance1.com"
+        async_routes["https://instance1.com/search"] = httpx.Response(429, json={})
+        async_routes["https://instance2.com/search"] = httpx.Response(
+            200, json=mock_searxng_response
+        )
+
+        results = asyncio.run(provider.asearch("test query"))
+
+        assert len(results) == 2
+        assert provider._is_instance_rate_limited("https://instance1.com") is True
+
 
 class TestDuckDuckGoProvider:
     """Tests for DuckDuckGo provider."""
@@ -416,6 +629,17 @@ class TestDuckDuckGoProvider:
         assert results[0]["source"] == "duckduckgo"
         assert provider.consecutive_failures == 0
 
+    def test_pacing_beyond_budget_is_not_waited_for(self):
+        """Test that a backoff longer than the search budget raises right away."""
+        provider = DuckDuckGoProvider(min_delay=5.0)
+        provider.scheduler.reserve("DuckDuckGoProvider")
+
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            provider.search("test query", timeout=0.5)
+
+        assert time.monotonic() - started < 0.5
+
     @patch("multi_search_api.providers.duckduckgo.DDGS")
     def test_rate_limit_error(self, mock_ddgs_class):
         """Test rate limit error handling."""
@@ -432,3 +656,32 @@ class TestDuckDuckGoProvider:
             provider.search("test query")
 
         assert provider.consecutive_failures == 1
+
+    @patch("multi_search_api.providers.duckduckgo.DDGS")
+    def test_async_search_runs_ddgs_in_thread(self, mock_ddgs_class):
+        """Test that the blocking DDGS call leaves the event loop free."""
+        mock_ddgs_instance = MagicMock()
+        mock_ddgs_class.return_value.__enter__.return_value = mock_ddgs_instance
+
+        def slow_text(*args, **kwargs):
+            time.sleep(0.2)
+            return [{"title": "DDG Result", "body": "Snippet", "href": "https://example.com"}]
+
+        mock_ddgs_instance.text.side_effect = slow_text
+        provider = DuckDuckGoProvider(min_delay=0)
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        async def run():
+            results, _ = await asyncio.gather(provider.asearch("test query"), ticker())
+            return results
+
+        results = asyncio.run(run())
+
+        assert results[0]["source"] == "duckduckgo"
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.2
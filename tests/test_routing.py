@@ -0,0 +1,124 @@
+"""Tests for adaptive provider routing."""
+
+from multi_search_api import SmartSearchTool
+from multi_search_api.routing import AdaptiveRouter
+
+
+def record_many(router, route, count=5, latency=0.5, success=True, empty=False):
+    for _ in range(count):
+        router.record(route, latency, success=success, empty=empty)
+
+
+def test_slow_and_empty_routes_are_demoted():
+    """Test ordering by expected time to a useful answer."""
+    router = AdaptiveRouter(exploration=0)
+    record_many(router, "Slow", latency=3.0)
+    record_many(router, "Fast", latency=0.3)
+    record_many(router, "Empty", latency=0.5, empty=True)
+
+    assert router.order(["Slow", "Fast", "Empty", "Unknown"]) == [
+        "Fast",
+        "Unknown",
+        "Empty",
+        "Slow",
+    ]
+    assert router.get_stats()["Fast"]["latency"] == 0.3
+
+
+def test_failing_route_is_skipped_until_explored():
+    """Test that failing routes are skipped, except on exploration."""
+    router = AdaptiveRouter(exploration=0, min_samples=5)
+    record_many(router, "Failing", count=15, success=False)
+    record_many(router, "Working")
+
+    assert router.order(["Failing", "Working"]) == ["Working"]
+    assert router.order(["Failing"]) == ["Failing"]
+
+    router.exploration = 1.0
+    assert router.order(["Working", "Failing"]) == ["Failing", "Working"]
+
+
+def test_route_recovers_as_averages_move():
+    """Test that new observations pull a demoted route back up."""
+    router = AdaptiveRouter(exploration=0, alpha=0.5)
+    record_many(router, "A", latency=2.0)
+    record_many(router, "B", latency=1.0)
+    assert router.order(["A", "B"]) == ["B", "A"]
+
+    record_many(router, "A", latency=0.1)
+
+    assert router.order(["A", "B"]) == ["A", "B"]
+
+
+def test_never_above_constraint():
+    """Test that constraints override statistics."""
+    router = AdaptiveRouter(
+        exploration=0, never_above=[("GoogleScraperProvider", "SerperProvider")]
+    )
+    record_many(router, "GoogleScraperProvider", latency=0.1)
+    record_many(router, "SerperProvider", latency=1.0)
+    record_many(router, "BraveProvider", latency=2.0)
+
+    assert router.order(["SerperProvider", "BraveProvider", "GoogleScraperProvider"]) == [
+        "SerperProvider",
+        "GoogleScraperProvider",
+        "BraveProvider",
+    ]
+
+
+def test_statistics_persist_across_restarts(tmp_path):
+    """Test that a new router starts from the saved statistics."""
+    state_file = tmp_path / "provider_stats.json"
+    router = AdaptiveRouter(state_file=state_file, exploration=0)
+    record_many(router, "Slow", latency=4.0)
+    record_many(router, "Fast", latency=0.4)
+    router.save()
+
+    restarted = AdaptiveRouter(state_file=state_file, exploration=0)
+
+    assert restarted.order(["Slow", "Fast"]) == ["Fast", "Slow"]
+    assert restarted.get_stats()["Slow"]["samples"] == 5
+
+
+def test_corrupt_state_file_is_ignored(tmp_path):
+    """Test that an unreadable state file does not prevent startup."""
+    state_file = tmp_path / "provider_stats.json"
+    state_file.write_text("{not json")
+
+    router = AdaptiveRouter(state_file=state_file)
+
+    assert router.get_stats() == {}
+
+
+def test_smart_search_tool_routes_adaptively(sample_search_results, make_provider):
+    """Test that the tool tries the best provider first and records outcomes."""
+    router = AdaptiveRouter(exploration=0)
+    record_many(router, "Provider1", latency=5.0)
+    tool = SmartSearchTool(enable_cache=False, adaptive_routing=router)
+    first = make_provider("Provider1", sample_search_results)
+    second = make_provider("Provider2", sample_search_results[:1])
+    tool.providers = [first, second]
+
+    result = tool.search("test query")
+
+    assert result["provider"] == "Provider2"
+    first.search.assert_not_called()
+    status = tool.get_status()["routing"]
+    assert status["order"] == ["Provider2", "Provider1"]
+    assert status["routes"]["Provider2"]["samples"] == 1
+
+
+def test_smart_search_tool_records_failures(sample_search_results, make_provider):
+    """Test that errors and empty answers lower a provider's rates."""
+    router = AdaptiveRouter(exploration=0)
+    tool = SmartSearchTool(enable_cache=False, adaptive_routing=router)
+    failing = make_provider("Provider1", side_effect=Exception("Connection error"))
+    empty = make_provider("Provider2", [])
+    tool.providers = [failing, empty, make_provider("Provider3", sample_search_results)]
+
+    tool.search("test query")
+
+    stats = router.get_stats()
+    assert stats["Provider1"]["success_rate"] == 0.8
+    assert stats["Provider2"]["empty_rate"] == 0.2
+    assert stats["Provider3"]["success_rate"] == 1.0
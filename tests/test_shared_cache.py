@@ -0,0 +1,213 @@
+"""Tests for the two-tier cache with a shared Redis-protocol backend."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from multi_search_api import SmartSearchTool
+from multi_search_api.cache import (
+    CompactCodec,
+    LocalRESPServer,
+    RedisStorage,
+    RESPClient,
+    SearchResultCache,
+)
+
+
+@pytest.fixture
+def resp_server():
+    """In-process stand-in for a Redis server."""
+    server = LocalRESPServer().start()
+    yield server
+    server.stop()
+
+
+def wait_for(condition, timeout=2.0):
+    """Poll until condition() is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def two_tier_cache(url: str, **kwargs) -> SearchResultCache:
+    return SearchResultCache(storage=RedisStorage(url), preload=False, max_entries=100, **kwargs)
+
+
+def test_resp_client_against_local_server(resp_server):
+    """Test the protocol client with the commands the storage relies on."""
+    client = RESPClient(resp_server.url)
+
+    assert client.execute("PING") == "PONG"
+    assert client.execute("SET", "a", b"\x00binary\r\n", "PX", 60_000) == "OK"
+    assert client.execute("GET", "a") == b"\x00binary\r\n"
+    assert client.execute("MGET", "a", "missing") == [b"\x00binary\r\n", None]
+    assert client.execute("SET", "short", "x", "PX", 1) == "OK"
+    time.sleep(0.01)
+    assert client.execute("GET", "short") is None
+    assert client.execute("DEL", "a") == 1
+    client.close()
+
+
+def test_redis_storage_roundtrip(resp_server, sample_search_results):
+    """Test storing, scanning and deleting entries with server-side expiry."""
+    storage = RedisStorage(resp_server.url, codec=CompactCodec())
+    entry = {"expires_at": time.time() + 60, "query": "q", "results": sample_search_results}
+    storage.put_many([("a", entry), ("b", entry), ("expired", {**entry, "expires_at": 0})])
+
+    assert storage.count() == 2
+    assert storage.get("a")["query"] == "q"
+    assert sorted(storage.load()) == ["a", "b"]
+
+    storage.delete(["a"])
+    assert storage.get("a") is None
+    storage.close()
+
+
+def test_read_through_and_write_through(resp_server, sample_search_results):
+    """Test that one worker's writes are served to another from the shared tier."""
+    worker_a = two_tier_cache(resp_server.url)
+    worker_b = two_tier_cache(resp_server.url)
+    # Let worker B's subscriber connect, so the write's notice reaches it
+    assert wait_for(lambda: worker_b.storage._subscriber._sock is not None)
+    time.sleep(0.05)
+
+    worker_a.cache_results("shared query", "any", sample_search_results)
+
+    assert worker_b.get_cached_results("shared query", "any") == sample_search_results
+    assert worker_b.get_cached_results("shared query", "any") == sample_search_results
+
+    stats = worker_b.get_cache_stats()
+    assert stats["l2_hits"] == 1
+    assert stats["l1_hits"] == 1
+    assert stats["l1_misses"] == 1
+    assert stats["l2_misses"] == 0
+    worker_a.close()
+    worker_b.close()
+
+
+def test_l1_invalidated_by_remote_writes(resp_server, sample_search_results):
+    """Test that a write by one worker evicts the stale L1 copy of another."""
+    worker_a = two_tier_cache(resp_server.url)
+    worker_b = two_tier_cache(resp_server.url)
+    worker_a.cache_results("query", "any", sample_search_results)
+    assert worker_b.get_cached_results("query", "any") is not None
+    # Let worker B's subscriber connect before the next write
+    assert wait_for(lambda: worker_b.storage._subscriber._sock is not None)
+    time.sleep(0.05)
+
+    worker_a.cache_results("query", "any", sample_search_results[:1])
+
+    assert wait_for(lambda: worker_b.get_cache_stats()["invalidations"] == 1)
+    assert worker_b.get_cached_results("query", "any") == sample_search_results[:1]
+    # A worker's own writes do not invalidate its L1
+    assert worker_a.get_cache_stats()["invalidations"] == 0
+    worker_a.close()
+    worker_b.close()
+
+
+def test_close_stops_subscriber_quietly(resp_server, monkeypatch):
+    """Test that closing under a subscriber read ends its thread without errors."""
+    errors = []
+    monkeypatch.setattr(threading, "excepthook", errors.append)
+    storage = RedisStorage(resp_server.url)
+    notified = threading.Event()
+    running = set(threading.enumerate())
+    storage.subscribe(lambda keys, version: notified.set())
+    (subscriber,) = {
+        thread
+        for thread in set(threading.enumerate()) - running
+        if thread.name == "search-cache-invalidation"
+    }
+    publisher = RESPClient(resp_server.url)
+    # Publish until a notice arrives, so the subscriber is in its read loop
+    assert wait_for(
+        lambda: publisher.execute("PUBLISH", storage.channel, "other 1.0 key") and notified.is_set()
+    )
+    read_reply = storage._subscriber.read_reply
+
+    def close_then_read():
+        # close() clears the connection between the closed check and the read
+        storage.close()
+        return read_reply()
+
+    storage._subscriber.read_reply = close_then_read
+    publisher.execute("PUBLISH", storage.channel, "other 1.0 key")
+    subscriber.join(timeout=2.0)
+
+    assert not subscriber.is_alive()
+    assert errors == []
+    publisher.close()
+
+
+def test_stale_invalidation_is_ignored(resp_server, sample_search_results):
+    """Test that a notice older than the L1 copy does not evict it."""
+    worker_a = two_tier_cache(resp_server.url)
+    worker_b = two_tier_cache(resp_server.url)
+    worker_a.cache_results("query", "any", sample_search_results)
+    assert worker_b.get_cached_results("query", "any") is not None
+    key, entry = next(iter(worker_b.cache_data.items()))
+
+    # The notice for the write worker B already read arrives late
+    worker_b.storage._notify(["other", repr(entry["created_at"]), key])
+    assert key in worker_b.cache_data
+    # A notice for a newer version evicts it
+    worker_b.storage._notify(["other", repr(entry["created_at"] + 1), key])
+    assert key not in worker_b.cache_data
+    assert worker_b.get_cache_stats()["invalidations"] == 1
+    worker_a.close()
+    worker_b.close()
+
+
+def test_unreachable_server_degrades_to_misses(sample_search_results):
+    """Test that a down cache server turns into cache misses, not errors."""
+    cache = two_tier_cache("redis://127.0.0.1:1/0")
+
+    cache.cache_results("query", "any", sample_search_results)
+    cache.cache_data.clear()
+
+    assert cache.get_cached_results("query", "any") is None
+    cache.close()
+
+
+def test_smart_search_tool_accepts_cache(resp_server, sample_search_results):
+    """Test passing a cache backend to SmartSearchTool."""
+    cache = two_tier_cache(resp_server.url)
+    tool = SmartSearchTool(cache=cache)
+
+    mock_provider = MagicMock()
+    mock_provider.__class__.__name__ = "Provider1"
+    mock_provider.is_available.return_value = True
+    mock_provider.search.return_value = sample_search_results
+    tool.providers = [mock_provider]
+
+    tool.search("test query")
+    other_worker = SmartSearchTool(cache=two_tier_cache(resp_server.url))
+    result = other_worker.search("test query")
+
+    assert tool.cache is cache
+    assert result["cache_hit"] is True
+    assert other_worker.get_status()["cache"]["l2_hits"] == 1
+    mock_provider.search.assert_called_once()
+
+
+def test_lookup_many_reads_shared_tier_in_bulk(resp_server, sample_search_results):
+    """Test that a bulk lookup fetches all L1 misses with one MGET."""
+    worker_a = two_tier_cache(resp_server.url)
+    worker_b = two_tier_cache(resp_server.url)
+    worker_a.cache_results("first", "any", sample_search_results)
+    worker_a.cache_results("second", "any", sample_search_results[:1])
+    worker_b.storage.get = MagicMock(side_effect=AssertionError("single read"))
+
+    lookups = worker_b.lookup_many(["first", "missing", "second", "First"], "any")
+
+    assert [lookup and len(lookup.results) for lookup in lookups] == [3, None, 1, 3]
+    stats = worker_b.get_cache_stats()
+    assert stats["l2_hits"] == 2
+    assert stats["l1_hits"] == 1
+    worker_a.close()
+    worker_b.close()
@@ -1,11 +1,21 @@
 """Tests for SmartSearchTool core functionality."""
 
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from unittest.mock import MagicMock
 
+import pytest
 from freezegun import freeze_time
 
 from multi_search_api import SmartSearchTool
+from multi_search_api.batch import ProviderLimit
+from multi_search_api.cache import TTLPolicy
 from multi_search_api.exceptions import RateLimitError
+from multi_search_api.fusion import fuse_results
+from multi_search_api.hedging import HedgingPolicy
+from multi_search_api.routing import AdaptiveRouter
 
 
 class TestSmartSearchTool:
@@ -259,3 +269,723 @@ class TestSmartSearchTool:
         # Provider2's search SHOULD have been called
         mock_provider2.search.assert_called_once()
         assert result["provider"] == "Provider2"
+
+    def test_negative_cache_skips_provider_walk(self, temp_cache_file):
+        """Test that a query no provider has results for is negatively cached."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+
+        mock_provider = MagicMock()
+        mock_provider.__class__.__name__ = "Provider1"
+        mock_provider.is_available.return_value = True
+        mock_provider.search.return_value = []
+        tool.providers = [mock_provider]
+
+        first = tool.search("nothing to find")
+        second = tool.search("nothing to find")
+
+        assert first["cache_hit"] is False
+        assert first["negative_cache_hit"] is False
+        assert second["cache_hit"] is True
+        assert second["negative_cache_hit"] is True
+        assert second["results"] == []
+        mock_provider.search.assert_called_once()
+        assert tool.get_status()["cache"]["negative_hits"] == 1
+
+    def test_failed_walk_is_not_negatively_cached(self, temp_cache_file, sample_search_results):
+        """Test that a query is not negatively cached when every provider raised."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+
+        mock_provider1 = MagicMock()
+        mock_provider1.__class__.__name__ = "Provider1"
+        mock_provider1.is_available.return_value = True
+        mock_provider1.search.side_effect = RateLimitError("rate limited")
+        mock_provider2 = MagicMock()
+        mock_provider2.__class__.__name__ = "Provider2"
+        mock_provider2.is_available.return_value = True
+        mock_provider2.search.side_effect = ConnectionError("connection refused")
+        tool.providers = [mock_provider1, mock_provider2]
+
+        failed = tool.search("query")
+        mock_provider2.search.side_effect = None
+        mock_provider2.search.return_value = sample_search_results
+        recovered = tool.search("query")
+
+        assert failed["results"] == []
+        assert tool.get_status()["cache"]["negative_hits"] == 0
+        assert recovered["negative_cache_hit"] is False
+        assert recovered["results"] == sample_search_results
+        assert mock_provider2.search.call_count == 2
+
+    def test_negative_cache_expires_after_negative_ttl(self, temp_cache_file):
+        """Test that negative entries use their own, shorter TTL."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+
+        mock_provider = MagicMock()
+        mock_provider.__class__.__name__ = "Provider1"
+        mock_provider.is_available.return_value = True
+        mock_provider.search.return_value = []
+        tool.providers = [mock_provider]
+
+        with freeze_time("2025-01-01 12:00:00"):
+            tool.search("nothing to find")
+        with freeze_time("2025-01-01 12:30:00"):
+            result = tool.search("nothing to find")
+
+        assert result["negative_cache_hit"] is False
+        assert mock_provider.search.call_count == 2
+
+    def test_stale_results_served_and_refreshed(self, temp_cache_file, sample_search_results):
+        """Test stale-while-revalidate: stale results are returned and refreshed."""
+        policy = TTLPolicy(
+            default_ttl=timedelta(hours=1), stale_while_revalidate=timedelta(hours=6)
+        )
+        tool = SmartSearchTool(
+            enable_cache=True, cache_file=temp_cache_file, cache_ttl_policy=policy
+        )
+
+        mock_provider = MagicMock()
+        mock_provider.__class__.__name__ = "Provider1"
+        mock_provider.is_available.return_value = True
+        mock_provider.search.return_value = sample_search_results[:1]
+        tool.providers = [mock_provider]
+
+        with freeze_time("2025-01-01 12:00:00"):
+            tool.cache.cache_results("test query", "any", sample_search_results)
+        with freeze_time("2025-01-01 14:00:00"):
+            result = tool.search("test query")
+
+            assert result["cache_hit"] is True
+            assert result["stale"] is True
+            assert len(result["results"]) == 3
+
+            for _ in range(100):
+                if not tool._revalidating:
+                    break
+                time.sleep(0.01)
+            refreshed = tool.search("test query")
+
+        mock_provider.search.assert_called_once()
+        assert refreshed["stale"] is False
+        assert len(refreshed["results"]) == 1
+
+    def test_cache_fetch_results_serves_larger_requests(
+        self, temp_cache_file, sample_search_results
+    ):
+        """Test fetching a larger count upstream so later, larger requests hit the cache."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file, cache_fetch_results=3)
+
+        mock_provider = MagicMock()
+        mock_provider.__class__.__name__ = "Provider1"
+        mock_provider.is_available.return_value = True
+        mock_provider.search.return_value = sample_search_results
+        tool.providers = [mock_provider]
+
+        small = tool.search("test query", num_results=1)
+        large = tool.search("test query", num_results=3)
+
+        assert mock_provider.search.call_args.kwargs["num_results"] == 3
+        assert len(small["results"]) == 1
+        assert large["cache_hit"] is True
+        assert len(large["results"]) == 3
+        mock_provider.search.assert_called_once()
+
+    def test_status_reports_cache_analytics(self, temp_cache_file, sample_search_results):
+        """Test that get_status() attributes cache hits to the provider that fetched them."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+
+        mock_provider = MagicMock()
+        mock_provider.__class__.__name__ = "Provider1"
+        mock_provider.is_available.return_value = True
+        mock_provider.search.return_value = sample_search_results
+        tool.providers = [mock_provider]
+
+        tool.search("test query")
+        tool.search("test query")
+
+        origin = tool.get_status()["cache"]["by_origin"]["Provider1"]
+        assert origin["entries"] == 1
+        assert origin["hits"] == 1
+        assert origin["avg_fetch_seconds"] is not None
+
+
+class TestAsyncSearch:
+    """Tests for SmartSearchTool.asearch()."""
+
+    def test_asearch_falls_back_and_caches(
+        self, temp_cache_file, sample_search_results, make_provider
+    ):
+        """Test provider fallback and caching on the async path."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+        limited = make_provider("Provider1", side_effect=RateLimitError("429"))
+        working = make_provider("Provider2", results=sample_search_results)
+        tool.providers = [limited, working]
+
+        first = asyncio.run(tool.asearch("test query"))
+        second = asyncio.run(tool.asearch("test query"))
+
+        assert first["provider"] == "Provider2"
+        assert first["results"] == sample_search_results
+        assert "Provider1" in tool.rate_limited_providers
+        assert second["cache_hit"] is True
+        working.asearch.assert_awaited_once()
+        working.search.assert_not_called()
+
+    def test_asearch_does_not_block_event_loop(
+        self, smart_search_tool, sample_search_results, make_provider
+    ):
+        """Test that concurrent searches overlap instead of running one after another."""
+        smart_search_tool.providers = [
+            make_provider("Provider1", results=sample_search_results, delay=0.2)
+        ]
+
+        async def run():
+            return await asyncio.gather(
+                *(smart_search_tool.asearch(f"query {i}") for i in range(5))
+            )
+
+        started = time.monotonic()
+        responses = asyncio.run(run())
+
+        assert time.monotonic() - started < 0.6
+        assert all(r["provider"] == "Provider1" for r in responses)
+
+    def test_asearch_refreshes_stale_results_in_task(
+        self, temp_cache_file, sample_search_results, make_provider
+    ):
+        """Test stale-while-revalidate on the async path."""
+        policy = TTLPolicy(
+            default_ttl=timedelta(hours=1), stale_while_revalidate=timedelta(hours=6)
+        )
+        tool = SmartSearchTool(
+            enable_cache=True, cache_file=temp_cache_file, cache_ttl_policy=policy
+        )
+        provider = make_provider("Provider1", results=sample_search_results[:1])
+        tool.providers = [provider]
+
+        async def run():
+            stale = await tool.asearch("test query")
+            await asyncio.gather(*tool._background_tasks)
+            return stale, await tool.asearch("test query")
+
+        with freeze_time("2025-01-01 12:00:00"):
+            tool.cache.cache_results("test query", "any", sample_search_results)
+        with freeze_time("2025-01-01 14:00:00"):
+            stale, refreshed = asyncio.run(run())
+
+        assert stale["stale"] is True
+        assert len(stale["results"]) == 3
+        assert refreshed["stale"] is False
+        assert len(refreshed["results"]) == 1
+        provider.asearch.assert_awaited_once()
+
+    def test_search_recent_content_uses_async_search(
+        self, smart_search_tool, sample_search_results, make_provider
+    ):
+        """Test that search_recent_content awaits the async search path."""
+        provider = make_provider("Provider1", results=sample_search_results)
+        smart_search_tool.providers = [provider]
+
+        results = asyncio.run(smart_search_tool.search_recent_content("test query"))
+
+        assert len(results) == 3
+        assert provider.asearch.await_args.kwargs["time_range"] == "recent"
+
+
+class TestHedging:
+    """Tests for hedged requests across the provider chain."""
+
+    def test_slow_provider_is_hedged(self, temp_cache_file, sample_search_results, make_provider):
+        """Test that the next provider is started when the first one is slow."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file, hedging=0.05)
+        slow = make_provider("Provider1", results=sample_search_results[:1], delay=0.5)
+        fast = make_provider("Provider2", results=sample_search_results)
+        tool.providers = [slow, fast]
+
+        started = time.monotonic()
+        result = tool.search("test query")
+
+        assert time.monotonic() - started < 0.4
+        assert result["provider"] == "Provider2"
+        assert result["results"] == sample_search_results
+        assert tool.get_status()["hedging"]["hedged_searches"] == 1
+        assert tool.get_status()["hedging"]["wins"] == {"Provider2": 1}
+        assert tool.cache.get_cached_results("test query", "any") == sample_search_results
+
+    def test_fast_provider_is_not_hedged(self, sample_search_results, make_provider):
+        """Test that a provider answering within the delay is the only one called."""
+        tool = SmartSearchTool(enable_cache=False, hedging=1.0)
+        first = make_provider("Provider1", results=sample_search_results)
+        second = make_provider("Provider2", results=sample_search_results)
+        tool.providers = [first, second]
+
+        result = tool.search("test query")
+
+        assert result["provider"] == "Provider1"
+        second.search.assert_not_called()
+        assert tool.get_status()["hedging"]["hedged_searches"] == 0
+
+    def test_failure_starts_next_provider_immediately(self, sample_search_results, make_provider):
+        """Test that errors and empty answers fall through without waiting for the delay."""
+        tool = SmartSearchTool(enable_cache=False, hedging=5.0)
+        tool.providers = [
+            make_provider("Provider1", side_effect=RateLimitError("429")),
+            make_provider("Provider2", results=[]),
+            make_provider("Provider3", results=sample_search_results),
+        ]
+
+        started = time.monotonic()
+        result = tool.search("test query")
+
+        assert time.monotonic() - started < 1.0
+        assert result["provider"] == "Provider3"
+        assert "Provider1" in tool.rate_limited_providers
+
+    def test_async_hedge_cancels_loser(
+        self, smart_search_tool, sample_search_results, make_provider
+    ):
+        """Test that the async path cancels the slower provider once one wins."""
+        smart_search_tool.hedging = HedgingPolicy(delay=0.05)
+        slow = make_provider("Provider1", results=sample_search_results, delay=5.0)
+        fast = make_provider("Provider2", results=sample_search_results[:2])
+        smart_search_tool.providers = [slow, fast]
+
+        result = asyncio.run(smart_search_tool.asearch("test query"))
+
+        assert result["provider"] == "Provider2"
+        assert len(result["results"]) == 2
+        assert slow.cancelled is True
+
+    def test_delay_derived_from_observed_latency(self):
+        """Test that the delay follows each provider's observed p90 latency."""
+        policy = HedgingPolicy(min_samples=5, default_delay=2.0, max_delay=3.0)
+        for seconds in (0.1, 0.2, 0.2, 0.3, 0.3, 0.4, 0.4, 0.5, 0.6, 0.9):
+            policy.record_latency("Fast", seconds)
+            policy.record_latency("Slow", seconds * 10)
+
+        assert policy.delay_for("Fast") == 0.6
+        assert policy.delay_for("Slow") == 3.0
+        assert policy.delay_for("Unknown") == 2.0
+        assert policy.get_stats()["delays"] == {"Fast": 0.6, "Slow": 3.0}
+
+
+class TestFanOut:
+    """Tests for fan-out searches with result fusion."""
+
+    @staticmethod
+    def result(link, source="test"):
+        return {"title": link, "snippet": f"About {link}", "link": link, "source": source}
+
+    def test_fuse_results_deduplicates_and_ranks(self):
+        """Test URL deduplication, reciprocal rank fusion and provenance."""
+        fused = fuse_results(
+            {
+                "Provider1": [self.result("https://a.example"), self.result("https://b.example")],
+                "Provider2": [
+                    self.result("https://www.b.example/?utm_source=x", source="other"),
+                    self.result("https://c.example"),
+                    self.result("https://b.example"),
+                ],
+            }
+        )
+
+        assert [r["link"] for r in fused] == [
+            "https://www.b.example/?utm_source=x",
+            "https://a.example",
+            "https://c.example",
+        ]
+        assert fused[0]["ranks"] == {"Provider1": 2, "Provider2": 1}
+        assert fused[0]["source"] == "other"
+        assert fused[1]["ranks"] == {"Provider1": 1}
+        assert fused[0]["fusion_score"] == round(1 / 62 + 1 / 61, 6)
+
+    def test_fan_out_drops_late_provider_and_caches(self, temp_cache_file, make_provider):
+        """Test that a provider missing the deadline is dropped and the merge is cached."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+        first = make_provider("Provider1", results=[self.result("https://a.example")])
+        second = make_provider(
+            "Provider2",
+            results=[self.result("https://b.example"), self.result("https://a.example")],
+        )
+        late = make_provider("Provider3", results=[self.result("https://c.example")], delay=1.0)
+        tool.providers = [first, second, late]
+
+        started = time.monotonic()
+        result = tool.search_fan_out("test query", deadline=0.2)
+        cached = tool.search_fan_out("test query", deadline=0.2)
+
+        assert time.monotonic() - started < 0.8
+        assert result["provider"] == "fan_out"
+        assert [r["link"] for r in result["results"]] == ["https://a.example", "https://b.example"]
+        assert result["providers"] == ["Provider1", "Provider2"]
+        assert result["timed_out"] == ["Provider3"]
+        assert cached["cache_hit"] is True
+        assert cached["results"] == result["results"]
+        assert cached["providers"] == ["Provider1", "Provider2"]
+        first.search.assert_called_once()
+        # Plain searches do not share the fan-out cache entry
+        assert tool.search("test query")["provider"] == "Provider1"
+
+    def test_cached_fan_out_ranks_are_read_only(self, smart_search_tool_with_cache, make_provider):
+        """Test that callers cannot corrupt the nested ranks of cached fan-out results."""
+        tool = smart_search_tool_with_cache
+        tool.providers = [
+            make_provider("Provider1", results=[self.result("https://a.example")]),
+            make_provider("Provider2", results=[self.result("https://a.example")]),
+        ]
+
+        fresh = tool.search_fan_out("test query")
+        fresh["results"][0]["ranks"]["Provider1"] = 99
+        cached = tool.search_fan_out("test query")
+
+        assert cached["results"][0]["ranks"] == {"Provider1": 1, "Provider2": 1}
+        with pytest.raises(TypeError):
+            cached["results"][0]["ranks"]["Provider1"] = 99
+        mutable = cached["results"].copy()
+        mutable[0]["ranks"]["Provider1"] = 99
+
+    def test_fan_out_respects_max_providers(self, smart_search_tool, make_provider):
+        """Test that only the first max_providers usable providers are queried."""
+        providers = [
+            make_provider(f"Provider{i}", results=[self.result(f"https://{i}.example")])
+            for i in range(3)
+        ]
+        smart_search_tool.providers = providers
+
+        result = smart_search_tool.search_fan_out("test query", max_providers=2)
+
+        assert result["providers"] == ["Provider0", "Provider1"]
+        providers[2].search.assert_not_called()
+
+    def test_async_fan_out_cancels_late_provider(self, temp_cache_file, make_provider):
+        """Test that the async fan-out cancels providers that miss the deadline."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+        fast = make_provider("Provider1", results=[self.result("https://a.example")])
+        failing = make_provider("Provider2", side_effect=RateLimitError("429"))
+        late = make_provider("Provider3", results=[self.result("https://c.example")], delay=5.0)
+        tool.providers = [fast, failing, late]
+
+        result = asyncio.run(tool.asearch_fan_out("test query", deadline=0.1))
+
+        assert [r["link"] for r in result["results"]] == ["https://a.example"]
+        assert result["timed_out"] == ["Provider3"]
+        assert late.cancelled is True
+        assert "Provider2" in tool.rate_limited_providers
+
+
+class TestSearchMany:
+    """Tests for batch searches."""
+
+    def test_deduplicates_and_checks_cache_first(
+        self, temp_cache_file, sample_search_results, make_provider
+    ):
+        """Test that cached queries are answered first and duplicates are searched once."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+        provider = make_provider("Provider1", results=sample_search_results)
+        tool.providers = [provider]
+        tool.cache.cache_results("cached query", "any", sample_search_results[:1])
+
+        responses = list(
+            tool.search_many(["new query", "cached query", "New  Query!", "new query"])
+        )
+
+        assert [(r["query"], r["status"]) for r in responses] == [
+            ("cached query", "cached"),
+            ("new query", "found"),
+            ("New  Query!", "found"),
+        ]
+        assert responses[0]["cache_hit"] is True
+        assert responses[1]["results"] == sample_search_results
+        provider.search.assert_called_once()
+
+    def test_spreads_queries_over_providers(
+        self, smart_search_tool, sample_search_results, make_provider
+    ):
+        """Test that busy providers overflow to the next provider with capacity."""
+        first = make_provider("Provider1", results=sample_search_results, delay=0.1)
+        second = make_provider("Provider2", results=sample_search_results, delay=0.1)
+        smart_search_tool.providers = [first, second]
+        limits = {"Provider1": ProviderLimit(concurrency=2), "Provider2": ProviderLimit(2)}
+
+        started = time.monotonic()
+        responses = list(
+            smart_search_tool.search_many([f"query {i}" for i in range(8)], provider_limits=limits)
+        )
+
+        assert time.monotonic() - started < 0.35
+        assert len(responses) == 8
+        assert first.search.call_count == 4
+        assert second.search.call_count == 4
+
+    def test_rate_limit_paces_requests(
+        self, smart_search_tool, sample_search_results, make_provider
+    ):
+        """Test that a provider's rate budget spaces out its requests."""
+        provider = make_provider("Provider1", results=sample_search_results)
+        smart_search_tool.providers = [provider]
+        limits = {"Provider1": ProviderLimit(concurrency=4, rate=10)}
+
+        started = time.monotonic()
+        responses = list(smart_search_tool.search_many(["a", "b", "c"], provider_limits=limits))
+
+        assert time.monotonic() - started >= 0.2
+        assert [r["status"] for r in responses] == ["found"] * 3
+
+    def test_falls_back_and_reports_status(
+        self, temp_cache_file, sample_search_results, make_provider
+    ):
+        """Test per-query fallback and the no_results and failed statuses."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+        empty = make_provider("Provider1", results=[])
+        working = make_provider("Provider2", results=sample_search_results)
+        tool.providers = [empty, working]
+
+        found = list(tool.search_many(["query"]))
+        working.search.side_effect = Exception("Connection error")
+        not_found = list(tool.search_many(["other query"]))
+        empty.search.side_effect = Exception("Timeout")
+        failed = list(tool.search_many(["third query"]))
+
+        assert found[0]["status"] == "found"
+        assert found[0]["provider"] == "Provider2"
+        assert not_found[0]["status"] == "no_results"
+        assert failed[0]["status"] == "failed"
+        assert failed[0]["error"] == "Connection error"
+        assert tool.cache.get_cached_results("query", "any") == sample_search_results
+
+    def test_asearch_many(self, smart_search_tool, sample_search_results, make_provider):
+        """Test the async batch search."""
+        first = make_provider("Provider1", side_effect=RateLimitError("429"))
+        second = make_provider("Provider2", results=sample_search_results, delay=0.05)
+        smart_search_tool.providers = [first, second]
+
+        async def run():
+            return [r async for r in smart_search_tool.asearch_many(["a", "b", "c", "a"])]
+
+        responses = asyncio.run(run())
+
+        assert sorted(r["query"] for r in responses) == ["a", "b", "c"]
+        assert all(r["provider"] == "Provider2" for r in responses)
+        assert "Provider1" in smart_search_tool.rate_limited_providers
+        second.search.assert_not_called()
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent identical searches."""
+
+    def test_concurrent_identical_searches_share_one_walk(
+        self, temp_cache_file, sample_search_results, make_provider
+    ):
+        """Test that threads searching the same query at once call providers once."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+        provider = make_provider("Provider1", results=sample_search_results, delay=0.2)
+        tool.providers = [provider]
+        queries = ["Trending topic", "trending topic", "trending  topic?", "trending topic"]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(tool.search, queries))
+
+        provider.search.assert_called_once()
+        assert all(r["results"] == sample_search_results for r in responses)
+        assert all(r["provider"] == "Provider1" for r in responses)
+        assert tool.get_status()["single_flight"] == {
+            "searches": 1,
+            "coalesced": 3,
+            "in_progress": 0,
+        }
+
+    def test_async_identical_searches_share_one_walk(
+        self, smart_search_tool, sample_search_results, make_provider
+    ):
+        """Test coalescing on the async path, where caching is disabled."""
+        provider = make_provider("Provider1", results=sample_search_results, delay=0.1)
+        smart_search_tool.providers = [provider]
+
+        async def run():
+            return await asyncio.gather(*(smart_search_tool.asearch("query") for _ in range(5)))
+
+        responses = asyncio.run(run())
+
+        provider.asearch.assert_awaited_once()
+        assert all(r["results"] == sample_search_results for r in responses)
+        assert smart_search_tool.get_status()["single_flight"]["coalesced"] == 4
+
+    def test_searches_for_more_results_are_not_coalesced(self, smart_search_tool, make_provider):
+        """Test that a search asking for more results does not get a shorter walk's answer."""
+        results = [TestFanOut.result(f"https://{i}.example") for i in range(30)]
+        provider = make_provider("Provider1")
+        provider.search.side_effect = lambda query, **kwargs: (
+            time.sleep(0.2) or results[: kwargs["num_results"]]
+        )
+        smart_search_tool.providers = [provider]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            few = executor.submit(smart_search_tool.search, "query", num_results=3)
+            time.sleep(0.05)
+            many = smart_search_tool.search("query", num_results=30)
+
+        assert len(few.result()["results"]) == 3
+        assert len(many["results"]) == 30
+        assert smart_search_tool.get_status()["single_flight"]["coalesced"] == 0
+
+    def test_waiter_with_more_time_is_not_given_a_truncated_walk(
+        self, smart_search_tool, sample_search_results, make_provider
+    ):
+        """Test that a caller without a deadline searches itself when the leader ran out of time."""
+        slow = make_provider("Provider1", results=[], delay=0.2)
+        found = make_provider("Provider2", results=sample_search_results)
+        smart_search_tool.providers = [slow, found]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hurried = executor.submit(smart_search_tool.search, "query", timeout=0.1)
+            time.sleep(0.05)
+            patient = smart_search_tool.search("query")
+
+        assert hurried.result()["deadline_exceeded"] is True
+        assert patient["deadline_exceeded"] is False
+        assert patient["results"] == sample_search_results
+
+    def test_single_flight_can_be_disabled(self, sample_search_results, make_provider):
+        """Test that each search calls the providers when coalescing is off."""
+        tool = SmartSearchTool(enable_cache=False, single_flight=False)
+        provider = make_provider("Provider1", results=sample_search_results, delay=0.1)
+        tool.providers = [provider]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(tool.search, ["query"] * 3))
+
+        assert provider.search.call_count == 3
+        assert tool.get_status()["single_flight"]["searches"] == 0
+
+
+class TestDeadline:
+    """Tests for the timeout budget of a search."""
+
+    def test_providers_get_the_time_left(
+        self, smart_search_tool, sample_search_results, make_provider
+    ):
+        """Test that each provider is given the remaining budget as its timeout."""
+        empty = make_provider("Provider1", results=[], delay=0.1)
+        found = make_provider("Provider2", results=sample_search_results)
+        smart_search_tool.providers = [empty, found]
+
+        result = smart_search_tool.search("test query", timeout=2.0)
+
+        assert result["provider"] == "Provider2"
+        assert result["deadline_exceeded"] is False
+        first_budget = empty.search.call_args.kwargs["timeout"]
+        second_budget = found.search.call_args.kwargs["timeout"]
+        assert 1.9 < first_budget <= 2.0
+        assert second_budget <= first_budget - 0.1
+
+    def test_deadline_stops_the_walk(self, temp_cache_file, sample_search_results, make_provider):
+        """Test that no provider is started after the deadline and nothing is cached."""
+        tool = SmartSearchTool(enable_cache=True, cache_file=temp_cache_file)
+        slow = make_provider("Provider1", results=[], delay=0.2)
+        later = make_provider("Provider2", results=sample_search_results)
+        tool.providers = [slow, later]
+
+        result = tool.search("test query", timeout=0.1)
+
+        assert result["results"] == []
+        assert result["deadline_exceeded"] is True
+        later.search.assert_not_called()
+        assert tool.search("test query")["provider"] == "Provider2"
+
+    def test_paced_provider_beyond_deadline_is_not_waited_for(
+        self, smart_search_tool, sample_search_results, make_provider
+    ):
+        """Test that a rate-limit wait longer than the budget ends the search."""
+        paced = make_provider("Provider1", results=sample_search_results)
+        empty = make_provider("Provider2", results=[])
+        smart_search_tool.providers = [paced, empty]
+        smart_search_tool.rate_scheduler.register("Provider1", 5.0)
+        smart_search_tool.rate_scheduler.reserve("Provider1")
+
+        started = time.monotonic()
+        result = smart_search_tool.search("test query", timeout=1.0)
+
+        assert time.monotonic() - started < 0.5
+        assert result["deadline_exceeded"] is True
+        paced.search.assert_not_called()
+        empty.search.assert_called_once()
+
+    def test_cached_responses_report_deadline(
+        self, smart_search_tool_with_cache, sample_search_results, make_provider
+    ):
+        """Test that cached responses carry deadline_exceeded like fresh ones."""
+        tool = smart_search_tool_with_cache
+        tool.providers = [make_provider("Provider1", results=sample_search_results)]
+        tool.search("test query", timeout=1.0)
+        tool.search_fan_out("test query")
+
+        cached = tool.search("test query", timeout=1.0)
+        async_cached = asyncio.run(tool.asearch("test query"))
+        fan_out_cached = tool.search_fan_out("test query")
+
+        assert cached["cache_hit"] is True
+        assert cached["deadline_exceeded"] is False
+        assert async_cached["deadline_exceeded"] is False
+        assert fan_out_cached["provider"] == "cached"
+        assert fan_out_cached["deadline_exceeded"] is False
+
+    def test_provider_out_of_time_is_not_a_failure(
+        self, temp_cache_file, sample_search_results, make_provider
+    ):
+        """Test that a provider raising TimeoutError under a deadline is not counted against it."""
+        tool = SmartSearchTool(
+            enable_cache=True, cache_file=temp_cache_file, adaptive_routing=AdaptiveRouter()
+        )
+        paced = make_provider("Provider1", side_effect=TimeoutError("no slot in time"))
+        tool.providers = [paced]
+
+        result = tool.search("test query", timeout=1.0)
+
+        assert result["deadline_exceeded"] is True
+        assert tool.router.get_stats() == {}
+        assert tool.circuit_breakers.get_stats()["providers"] == {}
+        # Nothing was cached, so the next search asks the provider again
+        paced.search.side_effect = None
+        paced.search.return_value = sample_search_results
+        assert tool.search("test query")["provider"] == "Provider1"
+
+    def test_async_provider_is_cancelled_at_deadline(self, smart_search_tool, make_provider):
+        """Test that asearch() returns at the deadline, cancelling the slow provider."""
+        slow = make_provider("Provider1", results=[{"link": "x"}], delay=1.0)
+        smart_search_tool.providers = [slow]
+
+        started = time.monotonic()
+        result = asyncio.run(smart_search_tool.asearch("test query", timeout=0.1))
+
+        assert time.monotonic() - started < 0.5
+        assert result["deadline_exceeded"] is True
+        assert result["results"] == []
+        assert slow.cancelled
+
+    def test_hedged_search_respects_deadline(self, sample_search_results, make_provider):
+        """Test that hedged walks also end at the deadline."""
+        tool = SmartSearchTool(enable_cache=False, hedging=0.05)
+        tool.providers = [
+            make_provider("Provider1", results=sample_search_results, delay=0.5),
+            make_provider("Provider2", results=sample_search_results, delay=0.5),
+        ]
+
+        started = time.monotonic()
+        result = tool.search("test query", timeout=0.15)
+
+        assert time.monotonic() - started < 0.4
+        assert result["deadline_exceeded"] is True
+
+    def test_waiting_for_identical_search_respects_deadline(
+        self, smart_search_tool, sample_search_results, make_provider
+    ):
+        """Test that a coalesced search gives up at its own deadline."""
+        provider = make_provider("Provider1", results=sample_search_results, delay=0.4)
+        smart_search_tool.providers = [provider]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(smart_search_tool.search, "query")
+            time.sleep(0.05)
+            follower = smart_search_tool.search("query", timeout=0.1)
+
+        assert follower["deadline_exceeded"] is True
+        assert leader.result()["results"] == sample_search_results
@@ -0,0 +1,301 @@
+"""Tests for cache storage backends."""
+
+import json
+import time
+
+import pytest
+from freezegun import freeze_time
+
+from multi_search_api import SearchResultCache
+from multi_search_api.cache import (
+    CompactCodec,
+    IndexedFileStorage,
+    JSONFileStorage,
+    SQLiteStorage,
+    WriteBehindStorage,
+    migrate_storage,
+    open_storage,
+)
+from multi_search_api.fusion import fuse_results
+
+
+def test_open_storage_selects_backend_by_suffix(tmp_path):
+    """Test that the cache file suffix selects the storage backend."""
+    assert isinstance(open_storage(tmp_path / "cache.db"), SQLiteStorage)
+    assert isinstance(open_storage(tmp_path / "cache.sqlite3"), SQLiteStorage)
+    assert isinstance(open_storage(tmp_path / "cache.jsonl"), IndexedFileStorage)
+    assert isinstance(open_storage(tmp_path / "cache.json"), JSONFileStorage)
+
+
+def test_sqlite_cache_roundtrip(tmp_path, sample_search_results):
+    """Test caching and reading results through the SQLite backend."""
+    cache = SearchResultCache(cache_file=str(tmp_path / "cache.db"))
+    cache.cache_results("test query", "any", sample_search_results)
+
+    reopened = SearchResultCache(cache_file=str(tmp_path / "cache.db"))
+
+    assert len(reopened.cache_data) == 1
+    cached = reopened.get_cached_results("test query", "any")
+    assert cached is not None
+    assert cached[0]["title"] == "Test Result 1"
+
+
+def test_sqlite_read_through_between_instances(tmp_path, sample_search_results):
+    """Test that entries written by another worker are visible without reloading."""
+    db = str(tmp_path / "cache.db")
+    worker_a = SearchResultCache(cache_file=db)
+    worker_b = SearchResultCache(cache_file=db)
+
+    worker_a.cache_results("shared query", "any", sample_search_results)
+
+    assert "shared query" not in str(worker_b.cache_data)
+    assert worker_b.get_cached_results("shared query", "any") is not None
+
+
+def test_sqlite_purge_and_compact(tmp_path, sample_search_results):
+    """Test that expired rows are purged from the database."""
+    cache = SearchResultCache(cache_file=str(tmp_path / "cache.db"))
+
+    with freeze_time("2025-01-01 12:00:00"):
+        cache.cache_results("old", "any", sample_search_results)
+    with freeze_time("2025-01-02 06:00:00"):
+        cache.cache_results("new", "any", sample_search_results)
+    with freeze_time("2025-01-02 18:00:00"):
+        assert cache.storage.count() == 2
+
+        cache.compact()
+
+        assert cache.storage.count() == 1
+        assert cache.get_cached_results("new", "any") is not None
+
+
+def test_migrate_legacy_json_to_sqlite(tmp_path, sample_search_results):
+    """Test migrating a JSON cache written by an older version into SQLite."""
+    legacy_file = tmp_path / "search_results.json"
+    with freeze_time("2025-01-01 12:00:00"):
+        cache_key = SearchResultCache(cache_file=str(tmp_path / "tmp.json"))._generate_cache_key(
+            "legacy query", "any"
+        )
+        legacy = {
+            cache_key: {
+                "timestamp": "2025-01-01T12:00:00",
+                "query": "legacy query",
+                "provider": "any",
+                "results": sample_search_results,
+                "result_count": len(sample_search_results),
+            }
+        }
+        legacy_file.write_text(json.dumps(legacy))
+
+        target = SQLiteStorage(tmp_path / "cache.db")
+        copied = migrate_storage(JSONFileStorage(legacy_file), target)
+
+        assert copied == 1
+        cache = SearchResultCache(storage=target)
+        assert cache.get_cached_results("legacy query", "any") is not None
+
+
+def test_indexed_storage_reads_bodies_on_demand(tmp_path, sample_search_results):
+    """Test that a lazily opened indexed cache serves entries without preloading."""
+    cache_file = str(tmp_path / "cache.jsonl")
+    writer = SearchResultCache(cache_file=cache_file)
+    for i in range(5):
+        writer.cache_results(f"query{i}", "any", sample_search_results)
+    writer.close()
+
+    lazy = SearchResultCache(cache_file=cache_file, preload=False)
+
+    assert isinstance(lazy.storage, IndexedFileStorage)
+    assert len(lazy.cache_data) == 0
+    assert lazy.get_cache_stats()["total_entries"] == 5
+
+    cached = lazy.get_cached_results("query3", "any")
+    assert cached is not None
+    assert cached[0]["title"] == "Test Result 1"
+    assert len(lazy.cache_data) == 1
+
+
+def test_lazy_json_cache_keeps_existing_entries(tmp_path, sample_search_results):
+    """Test that a lazily opened JSON cache reads the file and does not overwrite it."""
+    path = tmp_path / "cache.json"
+    cache_file = str(path)
+    writer = SearchResultCache(cache_file=cache_file)
+    writer.cache_results("query1", "any", sample_search_results)
+    writer.cache_results("query2", "any", sample_search_results)
+    writer.close()
+
+    lazy = SearchResultCache(cache_file=cache_file, preload=False)
+    assert lazy.get_cached_results("query1", "any") == sample_search_results
+    lazy.cache_results("query3", "any", sample_search_results)
+
+    assert len(json.loads(path.read_text())) == 3
+    reopened = SearchResultCache(cache_file=cache_file)
+    assert reopened.get_cached_results("query2", "any") == sample_search_results
+
+
+def test_indexed_storage_overwrite_delete_and_compact(tmp_path, sample_search_results):
+    """Test that superseded and deleted records are dropped by compaction."""
+    storage = IndexedFileStorage(tmp_path / "cache.jsonl")
+    entry = {"expires_at": 2e9, "results": sample_search_results}
+    storage.put("a", entry)
+    storage.put("a", {**entry, "results": sample_search_results[:1]})
+    storage.put("b", entry)
+    storage.delete(["b"])
+    size_before = storage.size_bytes()
+
+    storage.compact()
+
+    assert storage.count() == 1
+    assert storage.size_bytes() < size_before
+    assert len(storage.get("a")["results"]) == 1
+    storage.close()
+
+    reopened = IndexedFileStorage(tmp_path / "cache.jsonl")
+    assert reopened.get("b") is None
+    assert len(reopened.get("a")["results"]) == 1
+
+
+def test_write_behind_batches_writes(tmp_path, sample_search_results):
+    """Test that write-behind mode persists a burst of writes in one flush."""
+    cache_file = tmp_path / "cache.json"
+    cache = SearchResultCache(
+        cache_file=str(cache_file), write_behind=True, flush_interval=60, flush_threshold=1000
+    )
+
+    for i in range(10):
+        cache.cache_results(f"query{i}", "any", sample_search_results)
+
+    # Nothing hits the disk until the flush
+    assert not cache_file.exists()
+    assert cache.get_cached_results("query3", "any") is not None
+
+    cache.flush()
+
+    assert cache.storage.flush_count == 1
+    assert len(json.loads(cache_file.read_text())) == 10
+    assert not (tmp_path / "cache.json.tmp").exists()
+    cache.close()
+
+
+def test_write_behind_flushes_on_threshold_and_close(tmp_path, sample_search_results):
+    """Test that the flusher runs once enough entries are dirty, and on close."""
+    cache_file = tmp_path / "cache.json"
+    storage = WriteBehindStorage(JSONFileStorage(cache_file), flush_interval=60, flush_threshold=3)
+    entry = {"expires_at": 2e9, "results": sample_search_results}
+
+    storage.put_many([("a", entry), ("b", entry), ("c", entry)])
+    for _ in range(100):
+        if storage.flush_count:
+            break
+        time.sleep(0.01)
+    assert storage.flush_count == 1
+
+    storage.put("d", entry)
+    storage.delete(["a"])
+    storage.close()
+
+    assert sorted(json.loads(cache_file.read_text())) == ["b", "c", "d"]
+
+
+def test_compact_codec_roundtrip(sample_search_results):
+    """Test that the compact codec preserves entries and is smaller than JSON."""
+    entry = {
+        "created_at": 1.0,
+        "fresh_until": 2.0,
+        "expires_at": 3.0,
+        "query": "test query",
+        "provider": "any",
+        "results": sample_search_results + [{"title": "odd", "extra": 1}],
+        "result_count": 4,
+        "requested_results": 10,
+    }
+    codec = CompactCodec()
+
+    payload = codec.encode(entry)
+    decoded = codec.decode(payload)
+
+    assert len(payload) < len(json.dumps(entry))
+    assert decoded["requested_results"] == 10
+    assert decoded["result_count"] == 4
+    assert decoded["results"][0] == (
+        "Test Result 1",
+        sample_search_results[0]["snippet"],
+        "https://example.com/1",
+        "test",
+    )
+    assert decoded["results"][3] == {"title": "odd", "extra": 1}
+    # Records written by the JSON codec decode too
+    assert codec.decode(json.dumps(entry).encode())["query"] == "test query"
+
+
+@pytest.mark.parametrize("suffix", [".db", ".jsonl", ".json"])
+def test_compact_cache_roundtrip(tmp_path, sample_search_results, suffix):
+    """Test compact mode on every backend: packed in memory, dicts on a hit."""
+    cache_file = str(tmp_path / f"cache{suffix}")
+    cache = SearchResultCache(cache_file=cache_file, codec="compact")
+    cache.cache_results("test query", "any", sample_search_results)
+    cache.close()
+
+    reopened = SearchResultCache(cache_file=cache_file, codec="compact")
+    entry = next(iter(reopened.cache_data.values()))
+
+    assert isinstance(entry["results"][0], tuple)
+    assert reopened.get_cached_results("test query", "any") == sample_search_results
+    assert reopened.get_cache_stats()["codec"] == "compact"
+
+
+def test_compact_cache_hit_with_extra_fields(tmp_path, sample_search_results):
+    """Test that results kept as dicts by the compact codec are returned on a hit."""
+    results = sample_search_results + [{**sample_search_results[0], "date": "2024-01-01"}]
+    cache_file = str(tmp_path / "cache.db")
+    cache = SearchResultCache(cache_file=cache_file, codec="compact")
+    cache.cache_results("test query", "any", results)
+
+    assert cache.get_cached_results("test query", "any") == results
+    cache.close()
+    reopened = SearchResultCache(cache_file=cache_file, codec="compact")
+    assert reopened.get_cached_results("test query", "any") == results
+
+
+def test_compact_cache_hit_with_fused_results(tmp_path, sample_search_results):
+    """Test compact mode with fan-out results carrying ranks and fusion scores."""
+    fused = fuse_results({"Provider1": sample_search_results, "Provider2": sample_search_results})
+    cache = SearchResultCache(cache_file=str(tmp_path / "cache.db"), codec="compact")
+    cache.cache_results("test query", "fan_out", fused)
+
+    cached = cache.get_cached_results("test query", "fan_out")
+
+    assert cached == fused
+    assert cached[0]["ranks"] == {"Provider1": 1, "Provider2": 1}
+
+
+def test_switching_codec_reads_existing_entries(tmp_path, sample_search_results):
+    """Test that a JSON-encoded cache can be reopened in compact mode and back."""
+    cache_file = str(tmp_path / "cache.db")
+    SearchResultCache(cache_file=cache_file).cache_results("old", "any", sample_search_results)
+
+    compact = SearchResultCache(cache_file=cache_file, codec="compact")
+    compact.cache_results("new", "any", sample_search_results)
+
+    plain = SearchResultCache(cache_file=cache_file)
+    assert plain.get_cached_results("old", "any") == sample_search_results
+    assert plain.get_cached_results("new", "any") == sample_search_results
+
+
+def test_sqlite_stores_shared_results_once(tmp_path, sample_search_results):
+    """Test that SQLite stores each distinct result once and sweeps unreferenced ones."""
+    storage = SQLiteStorage(tmp_path / "cache.db")
+    entry = {"expires_at": 2e9, "results": sample_search_results}
+    storage.put("a", entry)
+    storage.put("b", {**entry, "results": sample_search_results[:2]})
+
+    assert storage.distinct_urls() == 3
+    assert storage.get("b")["results"] == sample_search_results[:2]
+    loaded = storage.load()
+    assert loaded["a"]["results"][0] is loaded["b"]["results"][0]
+
+    storage.delete(["a"])
+    storage.compact()
+
+    assert storage.distinct_urls() == 2
+    assert storage.get("b")["results"] == sample_search_results[:2]